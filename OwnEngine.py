@@ -1,216 +1,266 @@
-try:
-    from treys import Card, Evaluator, Deck
-    TREYS_AVAILABLE = True
-except ImportError:
-    print("ERROR: treys library not installed!")
-    print("Install with: pip install treys")
-    TREYS_AVAILABLE = False
-
+import importlib.util
 import random
+import time
+
+import numpy as np
+
+from equity import auto_equity, EQUITY_BUDGET
+from equity_cache import EquityCache
+from ranges import as_weights, live_weights
+from cards import card_from_string, cards_to_string
+from hand_eval import rank_class, CLASS_NAMES
+from hand_table import default_table
+from preflop_table import default_preflop_table, hand_class, class_name, MAX_OPPONENTS
+
+# Only the reference calculate_equity uses treys, imported when it runs
+TREYS_AVAILABLE = importlib.util.find_spec('treys') is not None
+
+# Postflop equity above which we raise big / raise / call; sampling stops
+# once the estimate is clear of all three
+BIG_RAISE_EQUITY, RAISE_EQUITY, CALL_EQUITY = 0.70, 0.60, 0.40
+EQUITY_THRESHOLDS = (CALL_EQUITY, RAISE_EQUITY, BIG_RAISE_EQUITY)
 
-def normalize_card(card):
+# Preflop raise sizes by strength = equity x players at the table (1.0 = a
+# fair share of the pot), strongest tier first, for multiway pots and
+# opponent ranges. The hands listed are the classes whose heads-up strength
+# in preflop_equity.npy falls in each tier, for scale; every cut-off sits in
+# a gap between classes wider than the table's sampling noise.
+PREFLOP_TIERS = [
+    (1.62, 0.75, "Premium pocket pair!"),   # AA, KK
+    (1.47, 0.5, "Premium pair!"),           # QQ-TT
+    (1.30, 0.3, "Strong hand!"),            # 99-77, AK, AQs, AJs
+    (1.19, 0.15, "Good high cards!"),       # 66-55, ATs-A5s, AQo-A8o, KQs-K9s, KQo-KTo, QJs
+]
+
+def heads_up_rule(index):
     """
-    Convert card to treys format:
-    - Your game: 'KD', '10H', 'AS'
-    - treys wants: 'Kd', 'Th', 'As'
+    (bet size, label) the hand-written heads-up rules raise a hand class
+    with, None to call
     """
-    if len(card) < 2:
-        return card
-    
-    rank = card[:-1]
-    if rank == '10':
-        rank = 'T'
-    suit = card[-1].lower()
-    
-    return rank + suit
+    row, column = divmod(index, 13)
+    high, low = max(row, column) + 2, min(row, column) + 2  # 2..14, ace high
+    is_pair, is_suited = row == column, row > column
 
-def analyze_game_state(game_state):
+    if is_pair and high >= 13:  # AA, KK
+        return (0.75, "Premium pocket pair!")
+    if is_pair and high >= 10:  # QQ, JJ, TT
+        return (0.5, "Premium pair!")
+    if high == 14 and low >= 13:  # AK
+        return (0.5, "Premium high cards!")
+    if high >= 13 and low >= 12:  # AQ, KQ
+        return (0.3, "Premium high cards!")
+    if is_pair and high >= 7:  # 77-99
+        return (0.25, "Good pair!")
+    if high == 14 and low >= 10:  # AJ, AT
+        return (0.2, "Ace-high!")
+    if is_suited and high >= 12 and low >= 10:  # Suited broadway
+        return (0.15, "Suited connectors!")
+    return None
+
+# Heads-up against a random hand the engine keeps playing its original
+# rules, looked up by class instead of re-parsed per decision
+HEADS_UP_RULES = [heads_up_rule(index) for index in range(169)]
+
+# Spot played on every street by PokerEngine.warm()
+WARM_HOLE = [card_from_string(card) for card in ('AS', 'KD')]
+WARM_BOARD = [card_from_string(card) for card in ('QH', '7C', '2S', '3D', '9H')]
+
+class PokerEngine:
     """
-    Analyze poker game state and return action with bet size
-    
-    Returns:
-        tuple: (action, bet_percentage)
-        - action: "FOLD", "CHECK", "CALL", "RAISE"
-        - bet_percentage: 0.0 to 1.0 (percentage of total money)
+    Decision engine session, created once at startup and reused for every
+    decision.
+
+    Owns the hand rank and preflop tables, the equity cache and the random
+    generator. warm() pages in the rank table, builds the per-street
+    enumerations exact equity gathers its hands from and calibrates the
+    exact/sampled choice, so the first decision of a session costs what the
+    rest do. analyze() takes the same game_state as analyze_game_state.
     """
-    if not TREYS_AVAILABLE:
-        return ("CHECK", 0.0)
-    
-    hole_cards = game_state.get('hole_cards', [])
-    community_cards = game_state.get('community_cards', [])
-    
-    # print(f"\nAnalyzing: Hole={hole_cards}, Board={community_cards}")
-    
-    try:
-        hole_normalized = [normalize_card(card) for card in hole_cards]
-        board_normalized = [normalize_card(card) for card in community_cards]
-        
-        hole = [Card.new(card) for card in hole_normalized]
-        board = [Card.new(card) for card in board_normalized]
-        
-        print(f"Normalized: Hole={hole_normalized}, Board={board_normalized}")
-    except Exception as e:
-        print(f"Error converting cards: {e}")
-        return ("CHECK", 0.0)
-    
-    evaluator = Evaluator()
-    
-    # PRE-FLOP (no community cards)
-    if len(community_cards) == 0:
-        return preflop_strategy(hole_cards)
-    
-    # POST-FLOP (3+ community cards)
-    elif len(community_cards) >= 3:
-        hand_rank = evaluator.evaluate(board, hole)
-        hand_class = evaluator.get_rank_class(hand_rank)
-        hand_class_name = evaluator.class_to_string(hand_class)
+
+    def __init__(self, cache=None, seed=None, warm=True):
+        self.table = default_table()
+        self.preflop = default_preflop_table()
+        self.cache = cache if cache is not None else EquityCache()
+        self.rng = np.random.default_rng(seed)
+        if warm:
+            self.warm()
+
+    def warm(self):
+        """Run one equity calculation per street outside the cache, touching every table the decisions use"""
+        self.table.table.max()  # Fault in every page of the memory-mapped table
+        for board_size in (3, 4, 5):
+            auto_equity(WARM_HOLE, WARM_BOARD[:board_size], thresholds=EQUITY_THRESHOLDS, rng=self.rng)
+        self.preflop.equity(*WARM_HOLE)
+
+    def equity(self, hole, board, opponents, thresholds, opponent_range=None, budget=EQUITY_BUDGET):
+        """
+        (equity, error, method) of a spot through the equity cache. Ranges
+        given in notation are part of the cache key; weight vectors skip the
+        cache. A range the known cards leave no combo of is dropped for a
+        random hand.
+        """
+        weights = as_weights(opponent_range) if opponent_range is not None else None
+        if weights is not None and live_weights(weights, hole + board).sum() <= 0:
+            print("Opponent range has no combos left, assuming a random hand")
+            weights = opponent_range = None
+        compute = lambda: auto_equity(hole, board, budget, opponents, thresholds, weights, self.rng)
+        if opponent_range is not None and not isinstance(opponent_range, str):
+            return compute()
+        return self.cache.lookup(hole, board, opponents, compute, opponent_range, thresholds)
+
+    def analyze(self, game_state, deadline=None):
+        """
+        Action and bet size for a game_state: hole_cards and community_cards
+        (card indices, see cards), optionally opponents (random hands still
+        in the pot, default 1) or range (the one opponent's holdings as
+        notation like "22+,A2s+,KTo+" or 1326 combo weights, see ranges).
+        `deadline` is the time.perf_counter() the decision is due by; equity
+        gets at most the time left (EQUITY_BUDGET without one).
+
+        Returns:
+            tuple: (action, bet_percentage)
+            - action: "FOLD", "CHECK", "CALL", "RAISE"
+            - bet_percentage: 0.0 to 1.0 (percentage of total money)
+        """
+        hole = list(game_state.get('hole_cards', []))
+        board = list(game_state.get('community_cards', []))
+        opponents = min(max(game_state.get('opponents', 1), 1), MAX_OPPONENTS)  # The preflop table's 1..9
+        opponent_range = game_state.get('range')
+        if opponent_range is not None:
+            opponents = 1
+        budget = EQUITY_BUDGET
+        if deadline is not None:
+            budget = min(budget, max(deadline - time.perf_counter(), 0.0))
+    
+        print(f"Hole={cards_to_string(hole)}, Board={cards_to_string(board)}")
+        if len(hole) != 2:
+            return ("CHECK", 0.0)
+    
+        # PRE-FLOP (no community cards)
+        if len(board) == 0:
+            return self.preflop_strategy(hole, opponents, opponent_range, budget)
+    
+        # POST-FLOP (3+ community cards)
+        elif len(board) >= 3:
+            hand_rank = self.table.evaluate_hand(hole + board)
+            hand_class = rank_class(hand_rank)
+            hand_class_name = CLASS_NAMES[hand_class]
         
-        print(f"Hand rank: {hand_rank}/7462")
-        print(f"Hand class: {hand_class_name}")
+            print(f"Hand rank: {hand_rank}/7462")
+            print(f"Hand class: {hand_class_name}")
         
-        # Calculate pot odds and equity if not all cards shown
-        if len(community_cards) < 5:
-            equity = calculate_equity(hole, board)
-            print(f"Estimated equity: {equity:.2%}")
+            # Calculate pot odds and equity if not all cards shown
+            if len(board) < 5:
+                equity, error, method = self.equity(hole, board, opponents, EQUITY_THRESHOLDS, opponent_range, budget)
+                print(f"Estimated equity: {equity:.2%} +- {error:.2%} vs {opponents if opponent_range is None else 'range'} ({method})")
             
-            if equity > 0.70:
-                bet_size = min(0.8, equity)  # Big raise
-                return ("RAISE", bet_size)
-            elif equity > 0.60:
-                bet_size = min(0.5, equity * 0.8)  # Medium raise
-                return ("RAISE", bet_size)
-            elif equity > 0.40:
-                return ("CALL", 0.0)
-            else:
-                return ("FOLD", 0.0)
+                if equity > BIG_RAISE_EQUITY:
+                    bet_size = min(0.8, equity)  # Big raise
+                    return ("RAISE", bet_size)
+                elif equity > RAISE_EQUITY:
+                    bet_size = min(0.5, equity * 0.8)  # Medium raise
+                    return ("RAISE", bet_size)
+                elif equity > CALL_EQUITY:
+                    return ("CALL", 0.0)
+                else:
+                    return ("FOLD", 0.0)
         
-        # River (all 5 community cards)
-        else:
-            print(f"River decision - hand_class={hand_class}")
+            # River (all 5 community cards)
+            else:
+                print(f"River decision - hand_class={hand_class}")
             
-            if hand_class <= 2:  # Straight Flush, Four of a Kind
-                print("  -> Monster hand!")
-                # All-in or near all-in
-                bet_size = 0.8 + (hand_rank <= 10) * 0.2  # 0.8-1.0
-                return ("RAISE", bet_size)
+                if hand_class <= 2:  # Straight Flush, Four of a Kind
+                    print("  -> Monster hand!")
+                    # All-in or near all-in
+                    bet_size = 0.8 + (hand_rank <= 10) * 0.2  # 0.8-1.0
+                    return ("RAISE", bet_size)
             
-            elif hand_class <= 4:  # Full House, Flush
-                print("  -> Strong hand!")
-                # Big bet (50-75% of stack)
-                bet_size = 0.5 + (2000 - min(hand_rank, 2000)) / 2000 * 0.25
-                return ("RAISE", bet_size)
+                elif hand_class <= 4:  # Full House, Flush
+                    print("  -> Strong hand!")
+                    # Big bet (50-75% of stack)
+                    bet_size = 0.5 + (2000 - min(hand_rank, 2000)) / 2000 * 0.25
+                    return ("RAISE", bet_size)
             
-            elif hand_class == 5:  # Straight
-                print("  -> Good hand!")
-                # Medium bet (30-50% of stack)
-                bet_size = 0.3 + (3000 - min(hand_rank, 3000)) / 3000 * 0.2
-                return ("RAISE", bet_size)
+                elif hand_class == 5:  # Straight
+                    print("  -> Good hand!")
+                    # Medium bet (30-50% of stack)
+                    bet_size = 0.3 + (3000 - min(hand_rank, 3000)) / 3000 * 0.2
+                    return ("RAISE", bet_size)
             
-            elif hand_rank <= 2000:  # Strong trips or two pair
-                print("  -> Decent hand!")
-                # Small-medium bet (20-40% of stack)
-                bet_size = 0.2 + (2000 - hand_rank) / 2000 * 0.2
-                return ("RAISE", bet_size)
+                elif hand_rank <= 2000:  # Strong trips or two pair
+                    print("  -> Decent hand!")
+                    # Small-medium bet (20-40% of stack)
+                    bet_size = 0.2 + (2000 - hand_rank) / 2000 * 0.2
+                    return ("RAISE", bet_size)
             
-            elif hand_rank <= 4000:  # Decent hands
-                print("  -> Marginal hand!")
-                return ("CALL", 0.0)
+                elif hand_rank <= 4000:  # Decent hands
+                    print("  -> Marginal hand!")
+                    return ("CALL", 0.0)
             
-            else:  # Weak hands
-                print("  -> Weak hand!")
-                return ("FOLD", 0.0)
+                else:  # Weak hands
+                    print("  -> Weak hand!")
+                    return ("FOLD", 0.0)
     
-    return ("CHECK", 0.0)
+        return ("CHECK", 0.0)
 
+    def preflop_strategy(self, hole, opponents=1, opponent_range=None, budget=EQUITY_BUDGET):
+        """
+        Preflop strategy with bet sizing. Heads-up against a random hand it
+        is the class's entry in HEADS_UP_RULES; otherwise PREFLOP_TIERS of
+        the precomputed equity of the hand's class against `opponents`
+        random hands (see preflop_table), or of the sampled equity against
+        one opponent's range
 
-def preflop_strategy(hole_cards):
-    """
-    Simple preflop strategy with bet sizing
-    
-    Returns:
-        tuple: (action, bet_percentage)
-    """
-    if len(hole_cards) != 2:
-        return ("CHECK", 0.0)
-    
-    card1, card2 = hole_cards[0], hole_cards[1]
-    
-    # Handle rank (support both '10' and single character ranks)
-    if len(card1) == 3:
-        rank1 = card1[:2]
-        suit1 = card1[2]
-    else:
-        rank1 = card1[0]
-        suit1 = card1[1]
-    
-    if len(card2) == 3:
-        rank2 = card2[:2]
-        suit2 = card2[2]
-    else:
-        rank2 = card2[0]
-        suit2 = card2[1]
-    
-    rank_values = {'A': 14, 'K': 13, 'Q': 12, 'J': 11, 'T': 10, '10': 10}
-    for i in range(2, 10):
-        rank_values[str(i)] = i
-    
-    val1 = rank_values.get(rank1, 0)
-    val2 = rank_values.get(rank2, 0)
-    
-    is_pair = (rank1 == rank2)
-    is_suited = (suit1 == suit2)
-    high_card = max(val1, val2)
-    low_card = min(val1, val2)
-    
-    print(f"Preflop: pair={is_pair}, suited={is_suited}, high={high_card}, low={low_card}")
-    
-    # Premium hands - Big raise (50-80% of stack)
-    if is_pair and high_card >= 13:  # AA, KK
-        print("  -> Premium pocket pair!")
-        return ("RAISE", 0.75)
-    
-    if is_pair and high_card >= 10:  # QQ, JJ, TT
-        print("  -> Premium pair!")
-        return ("RAISE", 0.5)
-    
-    if high_card == 14 and low_card >= 13:  # AK
-        print("  -> Premium high cards!")
-        return ("RAISE", 0.5)
-    
-    if high_card >= 13 and low_card >= 12:  # AQ, KQ
-        print("  -> Premium high cards!")
-        return ("RAISE", 0.3)
-    
-    # Good hands - Small raise (20-40% of stack)
-    if is_pair and high_card >= 7:  # 77-99
-        print("  -> Good pair!")
-        return ("RAISE", 0.25)
-    
-    if high_card == 14 and low_card >= 10:  # AJ, AT
-        print("  -> Ace-high!")
-        return ("RAISE", 0.2)
-    
-    if is_suited and high_card >= 12 and low_card >= 10:  # Suited broadway
-        print("  -> Suited connectors!")
-        return ("RAISE", 0.15)
-    
-    return("CALL",0)
-    # # Marginal hands - Call or check
-    # if is_pair and high_card >= 5:  # 55, 66
-    #     print("  -> Small pair!")
-    #     return ("CALL", 0.0)
-    
-    # if high_card >= 11:  # Face card
-    #     print("  -> Face card!")
-    #     return ("CALL", 0.0)
-    
-    # # Weak hands - Fold
-    # print("  -> Weak hand!")
-    # return ("FOLD", 0.0)
+        Returns:
+            tuple: (action, bet_percentage)
+        """
+        if len(hole) != 2:
+            return ("CHECK", 0.0)
+
+        card1, card2 = hole
+        index = hand_class(card1, card2)
+        opponents = min(max(opponents, 1), MAX_OPPONENTS)
+        if opponent_range is None:
+            equity = self.preflop.equity(card1, card2, opponents)
+        else:
+            thresholds = sorted(threshold / (opponents + 1) for threshold, _, _ in PREFLOP_TIERS)
+            equity, _, _ = self.equity([card1, card2], [], opponents, thresholds, opponent_range, budget)
+        strength = equity * (opponents + 1)
+
+        print(f"Preflop: {class_name(index)} equity={equity:.2%} vs {opponents}, strength={strength:.2f}")
+
+        if opponents == 1 and opponent_range is None:
+            rule = HEADS_UP_RULES[index]
+        else:
+            rule = next(((bet_size, label) for threshold, bet_size, label in PREFLOP_TIERS if strength >= threshold), None)
+        if rule is None:
+            return ("CALL", 0.0)
+        bet_size, label = rule
+        print(f"  -> {label}")
+        return ("RAISE", bet_size)
+
+_default = None
+
+def default_engine():
+    """Process-wide PokerEngine, created and warmed on first use"""
+    global _default
+    if _default is None:
+        _default = PokerEngine()
+    return _default
+
+def analyze_game_state(game_state):
+    """Analyze poker game state and return (action, bet_percentage), see PokerEngine.analyze"""
+    return default_engine().analyze(game_state)
+
+def preflop_strategy(hole, opponents=1, opponent_range=None):
+    """Preflop (action, bet_percentage) of two card indices, see PokerEngine.preflop_strategy"""
+    return default_engine().preflop_strategy(hole, opponents, opponent_range)
 
 
 def calculate_equity(hole, board):
-    """Calculate equity via Monte Carlo"""
+    """Calculate equity via Monte Carlo (reference loop on treys Card ints, see equity.monte_carlo_equity)"""
+    from treys import Evaluator, Deck
+
     evaluator = Evaluator()
     deck = Deck()
     
@@ -312,7 +362,11 @@ if __name__ == "__main__":
         print(f"TEST {i+1}: {test['name']}")
         print('-'*60)
         
-        action, bet_size = analyze_game_state(test['state'])
+        # Test hands are written as detector strings, the engine takes card indices
+        state = dict(test['state'],
+                     hole_cards=[card_from_string(card) for card in test['state']['hole_cards']],
+                     community_cards=[card_from_string(card) for card in test['state']['community_cards']])
+        action, bet_size = analyze_game_state(state)
         
         print(f"\n>>> Action: {action}")
         if bet_size > 0:
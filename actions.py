@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+
+from config import FOLD, CHECK, RAISE, CLICK_MONITOR
+
+# ============================================================================
+# ACTION EXECUTORS
+# ============================================================================
+
+class ClickExecutor:
+    """
+    Performs the engine's recommendation by clicking the table's buttons.
+    `offset` shifts every button of the layout in config, for a table that
+    is not at the layout's position on the monitor.
+    """
+
+    def __init__(self, monitor_index=CLICK_MONITOR, offset=(0, 0)):
+        import pyautogui
+        from screeninfo import get_monitors
+
+        self.pyautogui = pyautogui
+        self.second_monitor = get_monitors()[monitor_index]
+        self.offset = np.asarray(offset)
+
+    def make_move(self, recom):
+        pyautogui = self.pyautogui
+        second_monitor = self.second_monitor
+        dx, dy = self.offset
+
+        if recom[0] == "FOLD":
+            x,y = FOLD + self.offset
+            
+            absolute_x = second_monitor.x + x
+            absolute_y = second_monitor.y + y
+            pyautogui.click(absolute_x, absolute_y)
+        elif recom[0] == "CHECK" or recom[0] == "CALL":
+            x,y = CHECK + self.offset
+            absolute_x = second_monitor.x + x
+            absolute_y = second_monitor.y + y
+
+            pyautogui.click(absolute_x, absolute_y)
+        else: # Raise
+            # per = 0.5
+            x, y = RAISE + self.offset
+            absolute_x = second_monitor.x + x
+            absolute_y = second_monitor.y + y
+            pyautogui.click(absolute_x, absolute_y)
+
+            time.sleep(0.5)
+            
+            # Calculate the second click for the raise amount
+            raise_y = (1 - recom[1]) * (715 - 254) + 254  # Linear scaling of the raise amount
+            pyautogui.click(second_monitor.x+1540+dx, raise_y+dy)
+            time.sleep(0.5)
+            pyautogui.click(absolute_x, absolute_y)
+
+class NullExecutor:
+    """
+    Stub executor for replay and benchmarks: records moves instead of clicking.
+    `delay` simulates the time a real click sequence blocks for.
+    """
+
+    def __init__(self, delay=0.0):
+        self.moves = []
+        self.delay = delay
+
+    def make_move(self, recom):
+        self.moves.append(recom)
+        if self.delay:
+            time.sleep(self.delay)
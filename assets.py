@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_PATH = os.path.join(ASSET_DIR, 'assets.bin')
+ASSET_VERSION = 1  # Bump when the template preprocessing changes
+
+# Sources compiled into the bundle, relative to ASSET_DIR
+TEMPLATE_DIRS = ['ranks', 'suits', 's_ranks', 's_suits']
+TURN_TEMPLATE = 'palo.png'
+
+MAGIC = b'PKA1'
+ALIGN = 64
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def source_paths(root=ASSET_DIR):
+    """Relative paths of every template PNG and the turn indicator, sorted"""
+    paths = [os.path.join(folder, name) for folder in TEMPLATE_DIRS if os.path.isdir(os.path.join(root, folder))
+             for name in os.listdir(os.path.join(root, folder)) if name.endswith('.png')]
+    if os.path.exists(os.path.join(root, TURN_TEMPLATE)):
+        paths.append(TURN_TEMPLATE)
+    return sorted(paths)
+
+def source_hash(root=ASSET_DIR):
+    """SHA-256 of the preprocessing version and every source's path and bytes, None without sources"""
+    paths = source_paths(root)
+    if not paths:
+        return None
+    digest = hashlib.sha256(str(ASSET_VERSION).encode())
+    for path in paths:
+        digest.update(path.replace(os.sep, '/').encode())
+        with open(os.path.join(root, path), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def compile_assets(root=ASSET_DIR):
+    """
+    {set name: {name: grayscale template}} decoded from the PNGs under
+    `root`, exactly as detection used to load them at startup, plus the
+    turn indicator as set 'turn', name 'palo'
+    """
+    from card_detection import load_tilted_templates, load_straight_templates
+    from pipeline import load_turn_template
+
+    ranks_left, ranks_right, suits_left, suits_right = load_tilted_templates(root)
+    comm_ranks, comm_suits = load_straight_templates(root)
+    return {
+        'ranks_left': ranks_left,
+        'ranks_right': ranks_right,
+        'suits_left': suits_left,
+        'suits_right': suits_right,
+        'comm_ranks': comm_ranks,
+        'comm_suits': comm_suits,
+        'turn': {'palo': load_turn_template(bundle=False, root=root)},
+    }
+
+# ============================================================================
+# BUNDLE FILE
+# ============================================================================
+
+def save_bundle(assets, digest, path=ASSETS_PATH):
+    """
+    Write `assets` as one file: MAGIC, the JSON index length (uint32), the
+    index (version, source hash and the offset and shape of every image),
+    then the raw uint8 pixels. Written atomically through a per-process
+    temp file, like hand_table.save_table.
+    """
+    entries, chunks, offset = [], [], 0
+    for set_name, images in assets.items():
+        for name, image in images.items():
+            image = np.ascontiguousarray(image, dtype=np.uint8)
+            entries.append([set_name, name, offset, *image.shape])
+            chunks.append(image.tobytes())
+            offset += image.size
+    header = json.dumps({'version': ASSET_VERSION, 'hash': digest, 'entries': entries}).encode()
+    header += b' ' * (-(len(MAGIC) + 4 + len(header)) % ALIGN)
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(MAGIC + np.uint32(len(header)).tobytes() + header)
+        f.writelines(chunks)
+    try:
+        os.replace(temp, path)
+    except PermissionError:
+        # Windows: another process has the bundle mapped; it rebuilds on its next start
+        os.remove(temp)
+
+def read_header(path):
+    """(JSON index, pixel offset) of a bundle, read without mapping the file"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an asset bundle")
+        header_size = int(np.frombuffer(f.read(4), dtype=np.uint32)[0])
+        header = json.loads(f.read(header_size))
+    return header, len(MAGIC) + 4 + header_size
+
+class AssetBundle:
+    """
+    Detection templates and the turn indicator from the compiled bundle.
+
+    The file is memory-mapped once; every image is a read-only view into it,
+    so opening costs one mmap and a JSON parse instead of decoding ~50 PNGs.
+    `templates` has the TemplateBank sets, `turn_template` is palo.png in
+    grayscale.
+    """
+
+    def __init__(self, path=ASSETS_PATH):
+        header, start = read_header(path)
+        pixels = np.asarray(np.memmap(path, dtype=np.uint8, mode='r', offset=start))
+
+        self.version = header['version']
+        self.hash = header['hash']
+        self.templates = {}
+        for set_name, name, offset, h, w in header['entries']:
+            self.templates.setdefault(set_name, {})[name] = pixels[offset:offset + h * w].reshape(h, w)
+        self.turn_template = self.templates.pop('turn')['palo']
+
+def load_assets(path=ASSETS_PATH, root=ASSET_DIR):
+    """
+    Open the bundle, compiling it from the PNGs first when it is missing or
+    its hash no longer matches them. Without PNGs the bundle is used as is.
+    The stale check reads only the header, so no mapping of the old file is
+    open while a rebuilt one replaces it (which Windows refuses).
+    """
+    digest = source_hash(root)
+    if os.path.exists(path):
+        header, _ = read_header(path)
+        if digest is None or (header['hash'] == digest and header['version'] == ASSET_VERSION):
+            return AssetBundle(path)
+    save_bundle(compile_assets(root), digest, path)
+    return AssetBundle(path)
+
+_default = None
+
+def default_assets():
+    """Process-wide AssetBundle, compiled if needed and opened on first use"""
+    global _default
+    if _default is None:
+        _default = load_assets()
+    return _default
+
+if __name__ == "__main__":
+    # Recompile the bundle: python assets.py
+    save_bundle(compile_assets(), source_hash(), ASSETS_PATH)
+    print(f"Wrote {ASSETS_PATH}")
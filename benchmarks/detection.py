@@ -0,0 +1,118 @@
+"""
+Per-frame card detection time: per-call template matching, TemplateBank
+and the batched FFTClassifier, then FFTClassifier with 1..N slot workers.
+
+Run from the repository root:
+    python -m benchmarks.detection [--workers N]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from config import (
+    SELF_CARD1_RANK_START, SELF_CARD1_RANK_END, SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END,
+    SELF_CARD2_RANK_START, SELF_CARD2_RANK_END, SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END,
+    COMM_CARD_START_POSITION, COMM_CARD_END_POSITION,
+)
+from cards import card_from_names
+from fft_classifier import FFTClassifier
+from card_detection import (
+    TemplateBank, match_template_tilted, match_template_straight,
+    detect_self_cards, detect_community_cards,
+    detect_card_rectangles, extract_rank_and_suit_regions,
+)
+
+FRAMES = ['test_img_1.png', 'test_img_2.png']
+
+def best_match(match, img_gray, start, end, templates):
+    best_name, best_score = None, -1.0
+    for name, template in templates.items():
+        score = match(img_gray, start, end, template)
+        if score > best_score:
+            best_score = score
+            best_name = name
+    return best_name
+
+def detect_per_call(img_gray, bank):
+    """The original detection pass: resize/blur/threshold inside every match"""
+    t = bank.templates
+    rank1 = best_match(match_template_tilted, img_gray, SELF_CARD1_RANK_START, SELF_CARD1_RANK_END, t['ranks_left'])
+    suit1 = best_match(match_template_tilted, img_gray, SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END, t['suits_left'])
+    rank2 = best_match(match_template_tilted, img_gray, SELF_CARD2_RANK_START, SELF_CARD2_RANK_END, t['ranks_right'])
+    suit2 = best_match(match_template_tilted, img_gray, SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END, t['suits_right'])
+
+    community = []
+    for card_box in detect_card_rectangles(img_gray, COMM_CARD_START_POSITION, COMM_CARD_END_POSITION):
+        rank_start, rank_end, suit_start, suit_end = extract_rank_and_suit_regions(card_box, img_gray)
+        rank = best_match(match_template_straight, img_gray, rank_start, rank_end, t['comm_ranks'])
+        suit = best_match(match_template_straight, img_gray, suit_start, suit_end, t['comm_suits'])
+        community.append(card_from_names(rank, suit))
+
+    return (card_from_names(rank1, suit1), card_from_names(rank2, suit2)), community
+
+def detect(img_gray, recognizer, pool=None):
+    return (detect_self_cards(img_gray, recognizer, pool=pool),
+            detect_community_cards(img_gray, recognizer, pool=pool))
+
+def time_per_frame(detect, frames, recognizer, repeats, *args):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for img_gray in frames:
+            detect(img_gray, recognizer, *args)
+    return (time.perf_counter() - start) / (repeats * len(frames))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='largest slot worker count to sweep')
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args(argv)
+    repeats = args.repeats
+
+    start = time.perf_counter()
+    bank = TemplateBank.load()
+    build_time = time.perf_counter() - start
+    fft = FFTClassifier(bank)
+
+    frames = [cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2GRAY) for path in FRAMES]
+
+    # Community geometries are built lazily, warm them before timing
+    for img_gray in frames:
+        expected = detect_per_call(img_gray, bank)
+        for name, recognizer in [('bank', bank), ('fft', fft)]:
+            got = detect(img_gray, recognizer)
+            if got != expected:
+                print(f"MISMATCH: per-call={expected} {name}={got}")
+                return 1
+
+    before = time_per_frame(detect_per_call, frames, bank, repeats)
+    banked = time_per_frame(detect, frames, bank, repeats)
+    batched = time_per_frame(detect, frames, fft, repeats)
+
+    print("="*70)
+    print(f"Bank build:        {build_time * 1000:8.2f} ms (once)")
+    print(f"Per-call matching: {before * 1000:8.2f} ms/frame")
+    print(f"TemplateBank:      {banked * 1000:8.2f} ms/frame ({before / banked:.2f}x)")
+    print(f"FFTClassifier:     {batched * 1000:8.2f} ms/frame ({before / batched:.2f}x)")
+    print("-"*70)
+    print(f"Slot workers (FFTClassifier, {os.cpu_count()} CPUs):")
+
+    for workers in range(1, max(1, args.workers) + 1):
+        pool = ThreadPoolExecutor(workers) if workers > 1 else None
+        for img_gray in frames:
+            if detect(img_gray, fft, pool) != detect(img_gray, fft):
+                print(f"MISMATCH with {workers} workers")
+                return 1
+        elapsed = time_per_frame(detect, frames, fft, repeats, pool)
+        print(f"  {workers:2d} workers:       {elapsed * 1000:8.2f} ms/frame ({batched / elapsed:.2f}x)")
+        if pool is not None:
+            pool.shutdown()
+    print("="*70)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Cold vs warm decision latency of the PokerEngine session.
+
+Every run starts a fresh interpreter, so imports, table loads and the
+per-street enumerations are paid again. Two kinds of session are compared:
+
+    cold   PokerEngine(warm=False): tables and enumerations built by the
+           first decision that needs them
+    warm   PokerEngine(): warmed at construction
+
+Each session decides one spot per street. Startup is reported separately:
+the import plus the construction, which is where a warmed session pays. The
+session then decides the same streets `--repeats` more times. Each repeat
+gets a fresh equity cache, so no result comes from the cache. This gives
+the steady per-call latency the first decision is compared against.
+
+Run from the repository root:
+    python -m benchmarks.engine [--runs N] [--repeats N]
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import time
+
+import numpy as np
+
+SPOTS = [
+    ('preflop', ['AS', 'KD'], []),
+    ('flop', ['AS', 'KD'], ['QH', '7C', '2S']),
+    ('turn', ['8S', '9D'], ['QH', '7C', '2S', 'TD']),
+    ('river', ['AH', 'JH'], ['QH', '7H', '2S', 'TD', '4C']),
+]
+
+def session(warm, repeats):
+    """Startup and per-street first/steady decision times (seconds) of one fresh session"""
+    start = time.perf_counter()
+    from OwnEngine import PokerEngine
+    from equity_cache import EquityCache
+    from cards import card_from_string
+    engine = PokerEngine(warm=warm)
+    startup = time.perf_counter() - start
+
+    states = [{'hole_cards': [card_from_string(card) for card in hole],
+               'community_cards': [card_from_string(card) for card in board]} for _, hole, board in SPOTS]
+    first, steady = [], [[] for _ in SPOTS]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for state in states:
+            start = time.perf_counter()
+            engine.analyze(state)
+            first.append(time.perf_counter() - start)
+        for _ in range(repeats):
+            engine.cache = EquityCache()
+            for i, state in enumerate(states):
+                start = time.perf_counter()
+                engine.analyze(state)
+                steady[i].append(time.perf_counter() - start)
+    return startup, first, [float(np.median(times)) for times in steady]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="fresh processes per mode (medians are reported)")
+    parser.add_argument('--repeats', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for mode in ('cold', 'warm'):
+        runs = []
+        for _ in range(args.runs):
+            with context.Pool(1) as pool:
+                runs.append(pool.apply(session, (mode == 'warm', args.repeats)))
+        results[mode] = (np.median([startup for startup, _, _ in runs]),
+                         np.median([first for _, first, _ in runs], axis=0),
+                         np.median([steady for _, _, steady in runs], axis=0))
+
+    print("="*70)
+    print(f"Medians over {args.runs} fresh processes, steady = median of {args.repeats} uncached repeats")
+    print(f"{'':<14} {'cold ms':>10} {'warm ms':>10} {'steady ms':>10}")
+    print("-"*70)
+    print(f"{'startup':<14} {results['cold'][0] * 1000:>10.1f} {results['warm'][0] * 1000:>10.1f}")
+    for i, (name, _, _) in enumerate(SPOTS):
+        print(f"{'first ' + name:<14} {results['cold'][1][i] * 1000:>10.2f} {results['warm'][1][i] * 1000:>10.2f} "
+              f"{results['warm'][2][i] * 1000:>10.2f}")
+    cold_total = results['cold'][0] + results['cold'][1].sum()
+    warm_total = results['warm'][0] + results['warm'][1].sum()
+    print("-"*70)
+    print(f"{'total':<14} {cold_total * 1000:>10.1f} {warm_total * 1000:>10.1f}")
+    print("="*70)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Equity engine speed and noise: OwnEngine.calculate_equity (500 treys
+simulations in a Python loop) against the batched equity.monte_carlo_equity,
+exact enumeration and the automatic exact/sampled choice.
+
+For each spot, every configuration is run `--repeats` times and reports the
+mean time per call, hands (simulations or enumerated combinations) per
+second, the mean and spread of its equity estimates (the spread is the Monte
+Carlo noise the decision thresholds see) and the mean distance from the exact
+equity.
+
+A second table scales the batched engine over opponent counts: every
+opponent's hand comes from the same deck draw and is evaluated in the same
+batch, so the time per call should grow about linearly with players.
+
+A third replays a session through the EquityCache: `--hands` random hands,
+each flop and turn decided `--samples` times (one per sample while the turn
+lasts), then the same hands again with their suits relabelled. Reports the
+hit rate of each pass and the time per decision with and without the cache.
+
+Another compares fixed and adaptive sampling on `--spots` random flops:
+time per call and how often the estimate lands on the same side of the
+engine's decision thresholds as the exact equity.
+
+The last times equity against opponent ranges: notation expansion with and
+without the range cache, then auto_equity on the flop and turn spots.
+
+Run from the repository root:
+    python -m benchmarks.equity [--repeats N] [--simulations N ...] [--opponents N ...]
+                                [--hands N] [--samples N] [--spots N]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from equity_cache import EquityCache
+from ranges import parse_range, range_weights
+from equity import (
+    SIMULATIONS, EQUITY_BUDGET, monte_carlo_equity, exact_equity, exact_combinations, auto_equity, choose_method,
+    adaptive_equity, CONFIDENCE_Z,
+)
+from cards import card_from_string, card_to_string
+from OwnEngine import TREYS_AVAILABLE, EQUITY_THRESHOLDS, calculate_equity
+
+SPOTS = [
+    ('flop', ['AS', 'KD'], ['QH', '7C', '2S']),
+    ('flop draw', ['AH', 'KH'], ['QH', '7H', '2S']),
+    ('turn', ['8D', '8C'], ['8H', 'KC', 'KS', '2D']),
+]
+
+def measure(fn, repeats):
+    """(seconds per call, estimates) over `repeats` calls"""
+    estimates = []
+    start = time.perf_counter()
+    for _ in range(repeats):
+        estimates.append(fn())
+    return (time.perf_counter() - start) / repeats, np.array(estimates)
+
+def opponent_scaling(args):
+    """monte_carlo_equity at SIMULATIONS deals per opponent count, for each spot"""
+    print(f"{'spot':<10} {'opponents':>9} {'ms/call':>9} {'sims/s':>11} {'hands/s':>11} {'x 1 opp':>8} {'equity':>8}")
+    for name, hole_cards, community_cards in [('preflop', ['AS', 'KD'], [])] + SPOTS:
+        print("-"*88)
+        hole = [card_from_string(card) for card in hole_cards]
+        board = [card_from_string(card) for card in community_cards]
+        baseline = None
+        for opponents in args.opponents:
+            elapsed, estimates = measure(lambda: monte_carlo_equity(hole, board, SIMULATIONS, opponents=opponents),
+                                         args.repeats)
+            baseline = baseline or elapsed
+            print(f"{name:<10} {opponents:>9} {elapsed * 1000:>9.2f} {SIMULATIONS / elapsed:>11,.0f} "
+                  f"{(opponents + 1) * SIMULATIONS / elapsed:>11,.0f} {elapsed / baseline:>8.2f} {estimates.mean():>8.2%}")
+    print("="*88)
+
+def session(hands, samples, rng):
+    """(hole, board) decisions of random hands: flop and turn, `samples` times each"""
+    decisions = []
+    for _ in range(hands):
+        cards = [int(card) for card in rng.choice(52, 6, replace=False)]
+        for street in (3, 4):
+            decisions += [(cards[:2], cards[2:2 + street])] * samples
+    return decisions
+
+def relabel(decisions, rng):
+    """The same decisions with each hand's suits permuted (suit-isomorphic spots)"""
+    out = []
+    for hole, board in decisions:
+        suits = rng.permutation(4)
+        out.append(([card & ~3 | int(suits[card & 3]) for card in hole],
+                    [card & ~3 | int(suits[card & 3]) for card in board]))
+    return out
+
+def cache_replay(args):
+    """Time per decision with and without the EquityCache over a replayed session"""
+    rng = np.random.default_rng(args.seed)
+    decisions = session(args.hands, args.samples, rng)
+    isomorphic = relabel(decisions, rng)
+
+    start = time.perf_counter()
+    for hole, board in decisions:
+        auto_equity(hole, board, args.budget, thresholds=EQUITY_THRESHOLDS)
+    uncached = (time.perf_counter() - start) / len(decisions)
+
+    cache = EquityCache()
+    print(f"{len(decisions)} decisions ({args.hands} hands, flop + turn, {args.samples} samples each), "
+          f"uncached {uncached * 1000:.2f} ms/decision")
+    print("-"*88)
+    for name, spots in [('replay', decisions), ('suits relabelled', isomorphic)]:
+        hits = cache.stats()['hits']
+        start = time.perf_counter()
+        for hole, board in spots:
+            cache.lookup(hole, board, 1, lambda: auto_equity(hole, board, args.budget, thresholds=EQUITY_THRESHOLDS),
+                         thresholds=EQUITY_THRESHOLDS)
+        elapsed = (time.perf_counter() - start) / len(spots)
+        print(f"{name:<18} hit rate {(cache.stats()['hits'] - hits) / len(spots):>6.1%}   "
+              f"{elapsed * 1000:>7.3f} ms/decision   {uncached / elapsed:>7.1f}x")
+    print("="*88)
+
+def fixed_equity(hole, board):
+    """monte_carlo_equity with the binomial half-width of its CONFIDENCE_Z interval"""
+    equity = monte_carlo_equity(hole, board)
+    return equity, CONFIDENCE_Z * np.sqrt(equity * (1 - equity) / SIMULATIONS)
+
+def adaptive_decisions(args):
+    """Fixed SIMULATIONS vs adaptive sampling: time per call and threshold-side agreement with exact equity"""
+    rng = np.random.default_rng(args.seed)
+    side = lambda equity: int(np.searchsorted(EQUITY_THRESHOLDS, equity))
+    spots = [[int(card) for card in rng.choice(52, 5, replace=False)] for _ in range(args.spots)]
+    exact = [side(exact_equity(cards[:2], cards[2:])) for cards in spots]
+
+    engines = [
+        (f'fixed ({SIMULATIONS})', lambda hole, board: fixed_equity(hole, board)),
+        (f'adaptive ({args.budget * 1000:.0f} ms)',
+         lambda hole, board: adaptive_equity(hole, board, EQUITY_THRESHOLDS, args.budget * 1000)),
+    ]
+    print(f"{args.spots} random flops, decision thresholds {EQUITY_THRESHOLDS}")
+    print(f"{'sampling':<20} {'ms mean':>8} {'ms p95':>8} {'max ms':>8} {'error':>7} {'same side as exact':>19}")
+    print("-"*88)
+    for name, fn in engines:
+        times, errors, agree = [], [], 0
+        for cards, expected in zip(spots, exact):
+            start = time.perf_counter()
+            equity, error = fn(cards[:2], cards[2:])
+            times.append(time.perf_counter() - start)
+            errors.append(error)
+            agree += side(equity) == expected
+        times = np.array(times) * 1000
+        print(f"{name:<20} {times.mean():>8.2f} {np.percentile(times, 95):>8.2f} {times.max():>8.2f} "
+              f"{np.mean(errors):>7.2%} {agree / args.spots:>19.1%}")
+    print("="*88)
+
+RANGES = ['AA', 'QQ+,AK', '22+,A2s+,KTo+', '22+,A2+,K2+,Q2+,J2+,T2+,92+,82+,72+,62+,52+,42+,32']
+
+def range_equity(args):
+    """Range expansion (parsed vs cached) and auto_equity against each range"""
+    spots = [(name, [card_from_string(card) for card in hole], [card_from_string(card) for card in board])
+             for name, hole, board in SPOTS if name != 'flop draw']
+    print(f"{'range':<24} {'combos':>6} {'parse ms':>9} {'cached us':>10} "
+          + ' '.join(f"{name + ' ms':>16}" for name, _, _ in spots))
+    print("-"*88)
+    for notation in RANGES:
+        parse, _ = measure(lambda: parse_range(notation), args.repeats)
+        range_weights(notation)
+        cached, _ = measure(lambda: range_weights(notation), args.repeats)
+        weights = range_weights(notation)
+        cells = []
+        for name, hole, board in spots:
+            elapsed, _ = measure(lambda: auto_equity(hole, board, args.budget, thresholds=EQUITY_THRESHOLDS,
+                                                     weights=weights), args.repeats)
+            cells.append(f"{elapsed * 1000:>7.2f} {choose_method(board, args.budget, 1, weights):<8}")
+        label = notation if len(notation) <= 24 else notation[:21] + '...'
+        print(f"{label:<24} {int(weights.sum()):>6} {parse * 1000:>9.3f} {cached * 1e6:>10.2f} "
+              + ' '.join(f"{cell:>16}" for cell in cells))
+    print("="*88)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--simulations', type=int, nargs='+', default=[500, 5000, SIMULATIONS, 50000])
+    parser.add_argument('--budget', type=float, default=EQUITY_BUDGET, help='auto_equity time budget in seconds')
+    parser.add_argument('--opponents', type=int, nargs='+', default=[1, 3, 5, 8])
+    parser.add_argument('--hands', type=int, default=50, help='random hands replayed through the equity cache')
+    parser.add_argument('--samples', type=int, default=3, help='decisions per street while the turn lasts')
+    parser.add_argument('--spots', type=int, default=100, help='random flops for fixed vs adaptive sampling')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print("="*88)
+    print(f"{'spot':<10} {'engine':<26} {'ms/call':>9} {'hands/s':>11} {'equity':>8} {'std':>7} {'error':>7}")
+    for name, hole_cards, community_cards in SPOTS:
+        print("-"*88)
+        hole = [card_from_string(card) for card in hole_cards]
+        board = [card_from_string(card) for card in community_cards]
+        runs = []
+        if TREYS_AVAILABLE:
+            from treys import Card
+            treys_hole = [Card.new(card_to_string(card)) for card in hole]
+            treys_board = [Card.new(card_to_string(card)) for card in board]
+            runs.append(('calculate_equity (500)', 500, lambda: calculate_equity(treys_hole, treys_board)))
+        for simulations in args.simulations:
+            runs.append((f'monte_carlo_equity ({simulations})', simulations,
+                         lambda simulations=simulations: monte_carlo_equity(hole, board, simulations)))
+        combinations = exact_combinations(board)
+        runs.append(('exact_equity', combinations, lambda: exact_equity(hole, board)))
+        auto_hands = combinations if choose_method(board, args.budget) == 'exact' else SIMULATIONS
+        runs.append((f'auto_equity ({choose_method(board, args.budget)})', auto_hands,
+                     lambda: auto_equity(hole, board, args.budget)[0]))
+
+        exact = exact_equity(hole, board)
+        for engine, hands, fn in runs:
+            elapsed, estimates = measure(fn, args.repeats)
+            print(f"{name:<10} {engine:<26} {elapsed * 1000:>9.2f} {hands / elapsed:>11,.0f} "
+                  f"{estimates.mean():>8.2%} {estimates.std():>7.2%} {np.abs(estimates - exact).mean():>7.2%}")
+    print("="*88)
+    opponent_scaling(args)
+    cache_replay(args)
+    adaptive_decisions(args)
+    range_equity(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Accuracy and speed of the GlyphIndex against the template matchers.
+
+Every labelled rank/suit slot of the test screenshots is classified as-is
+and under seeded perturbations: the slot window shifted by a few pixels,
+brightness/contrast changes and sensor noise. Reports per-recognizer slot
+accuracy, time per slot and detection time per frame.
+
+Run from the repository root:
+    python -m benchmarks.glyphs [--variants N] [--shift PX] [--seed S]
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from card_detection import (
+    TemplateBank, SELF_CARD_SLOTS,
+    detect_self_cards, detect_community_cards,
+    detect_card_rectangles, extract_rank_and_suit_regions,
+)
+from config import COMM_CARD_START_POSITION, COMM_CARD_END_POSITION
+from fft_classifier import FFTClassifier
+from glyph_index import GlyphIndex
+
+# Hand-checked cards of the test screenshots: (self cards, community cards)
+LABELS = {
+    'test_img_1.png': (('8C', '8H'), ['AC', 'QH', '9C', '3D', 'KS']),
+    'test_img_2.png': (('2C', '10D'), []),
+}
+
+def split_card(card):
+    return card[:-1], card[-1]
+
+def labelled_slots(img_gray, self_cards, community):
+    """[(classify method name, set_name, start, end, expected rank or suit initial)]"""
+    slots = []
+    for (set_name, start, end), card in zip(SELF_CARD_SLOTS, [c for c in self_cards for _ in range(2)]):
+        rank, suit = split_card(card)
+        slots.append(('classify_tilted', set_name, start, end, rank if set_name.startswith('ranks') else suit))
+
+    card_boxes = detect_card_rectangles(img_gray, COMM_CARD_START_POSITION, COMM_CARD_END_POSITION)
+    for card_box, card in zip(card_boxes, community):
+        rank, suit = split_card(card)
+        rank_start, rank_end, suit_start, suit_end = extract_rank_and_suit_regions(card_box, img_gray)
+        slots.append(('classify_straight', 'comm_ranks', rank_start, rank_end, rank))
+        slots.append(('classify_straight', 'comm_suits', suit_start, suit_end, suit))
+    return slots
+
+def perturb(img_gray, rng):
+    """Contrast/brightness change plus Gaussian noise"""
+    alpha, beta = rng.uniform(0.85, 1.15), rng.uniform(-15, 15)
+    noisy = img_gray.astype(np.float32) * alpha + beta + rng.normal(0, 4, img_gray.shape)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+def cases(frames, variants, shift, rng):
+    """(img_gray, method, set_name, start, end, expected) for every slot and perturbation"""
+    out = []
+    for img_gray, slots in frames:
+        for variant in range(variants + 1):
+            image = perturb(img_gray, rng) if variant else img_gray
+            for method, set_name, start, end, expected in slots:
+                offset = rng.integers(-shift, shift + 1, 2) if shift else np.zeros(2, dtype=int)
+                out.append((image, method, set_name, start + offset, end + offset, expected))
+    return out
+
+def matches(name, expected):
+    return name is not None and (name == expected or (len(expected) == 1 and name[0] == expected))
+
+def evaluate(recognizer, cases):
+    """(accuracy, seconds per slot) over the cases"""
+    correct = 0
+    start = time.perf_counter()
+    for img_gray, method, set_name, slot_start, slot_end, expected in cases:
+        name, _ = getattr(recognizer, method)(img_gray, slot_start, slot_end, set_name)
+        correct += matches(name, expected)
+    return correct / len(cases), (time.perf_counter() - start) / len(cases)
+
+def time_per_frame(recognizer, frames, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for img_gray, _ in frames:
+            detect_self_cards(img_gray, recognizer)
+            detect_community_cards(img_gray, recognizer)
+    return (time.perf_counter() - start) / (repeats * len(frames))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--variants', type=int, default=20, help='perturbed copies of each screenshot')
+    parser.add_argument('--shift', type=int, default=3, help='largest slot window shift in pixels')
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    bank = TemplateBank.load()
+    start = time.perf_counter()
+    glyphs = GlyphIndex(bank)
+    index_time = time.perf_counter() - start
+    recognizers = [('TemplateBank', bank), ('FFTClassifier', FFTClassifier(bank)), ('GlyphIndex', glyphs)]
+
+    frames = []
+    for path, (self_cards, community) in LABELS.items():
+        img_gray = cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2GRAY)
+        frames.append((img_gray, labelled_slots(img_gray, self_cards, community)))
+
+    clean = cases(frames, 0, 0, np.random.default_rng(args.seed))
+    noisy = cases(frames, args.variants, args.shift, np.random.default_rng(args.seed))
+
+    print("="*70)
+    print(f"GlyphIndex build: {index_time * 1000:.2f} ms (once), "
+          f"{sum(len(names) for names, _ in glyphs.index.values())} signatures of {glyphs.grid * glyphs.grid} bits")
+    print(f"{len(clean)} labelled slots, {len(noisy)} perturbed (shift <= {args.shift}px)")
+    print("-"*70)
+    print(f"{'recognizer':<14} {'clean':>7} {'perturbed':>10} {'us/slot':>9} {'ms/frame':>9}")
+    for name, recognizer in recognizers:
+        clean_accuracy, _ = evaluate(recognizer, clean)
+        accuracy, per_slot = evaluate(recognizer, noisy)
+        per_frame = time_per_frame(recognizer, frames, args.repeats)
+        print(f"{name:<14} {clean_accuracy:>7.1%} {accuracy:>10.1%} {per_slot * 1e6:>9.0f} {per_frame * 1000:>9.2f}")
+    print("="*70)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
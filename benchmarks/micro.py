@@ -0,0 +1,183 @@
+"""
+Engine micro-benchmarks on a fixed seeded corpus, checked against a stored
+baseline.
+
+Cases (each over its own corpus of random states from `--seed`):
+
+    card_from_names   detector template names -> card index (replaces normalize_card)
+    preflop_strategy  preflop decision vs 1-3 opponents from the preflop table
+    equity_flop       auto_equity on the flop, stopping at the decision thresholds
+    equity_turn       auto_equity on the turn (exact enumeration)
+    river_analyze     analyze_game_state on the river (hand rank and class)
+
+Every case runs one untimed pass, then `--rounds` timed passes over its
+corpus with the garbage collector off. Cheap cases are timed in blocks of
+calls. Reports ops/sec and per-call p50/p95/p99 and writes them to
+`--output` as JSON. With a baseline file (saved by --save-baseline) each
+case's p50 is compared against it, and the run fails (exit status 1) when
+one is slower by more than `--tolerance`. Baselines are per machine; save
+one on the box that runs the check.
+
+Imports only the engine (no OpenCV, capture or display), so it runs on a
+plain headless Linux box.
+
+Run from the repository root:
+    python -m benchmarks.micro [--rounds N] [--seed S] [--tolerance F] [--output PATH]
+                               [--baseline PATH] [--save-baseline]
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from cards import card_from_names
+from equity import auto_equity
+from equity_cache import EquityCache
+from OwnEngine import PokerEngine, EQUITY_THRESHOLDS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'micro_baseline.json')
+RESULTS_PATH = 'micro_results.json'
+TOLERANCE = 0.25  # Allowed p50 slowdown against the baseline before the run fails
+
+RANK_NAMES = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUIT_NAMES = ['Club', 'Diamond', 'Heart', 'Spade']
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+def deal_states(rng, count, board_size):
+    """`count` random (hole, board) card index pairs with `board_size` board cards"""
+    states = []
+    for _ in range(count):
+        cards = [int(card) for card in rng.choice(52, 2 + board_size, replace=False)]
+        states.append((cards[:2], cards[2:]))
+    return states
+
+def build_cases(seed):
+    """[(name, function of one corpus item, corpus, calls per timing block)]"""
+    rng = np.random.default_rng(seed)
+    engine = PokerEngine(cache=EquityCache(maxsize=0), seed=seed)
+    names = [(RANK_NAMES[rng.integers(13)], SUIT_NAMES[rng.integers(4)]) for _ in range(5000)]
+    preflop = [(hole, int(rng.integers(1, 4))) for hole, _ in deal_states(rng, 1000, 0)]
+    flops = deal_states(rng, 200, 3)
+    turns = deal_states(rng, 200, 4)
+    rivers = [{'hole_cards': hole, 'community_cards': board} for hole, board in deal_states(rng, 1000, 5)]
+
+    equity = lambda state: auto_equity(*state, thresholds=EQUITY_THRESHOLDS, rng=engine.rng)
+    return [
+        ('card_from_names', lambda names: card_from_names(*names), names, 50),
+        ('preflop_strategy', lambda item: engine.preflop_strategy(*item), preflop, 10),
+        ('equity_flop', equity, flops, 1),
+        ('equity_turn', equity, turns, 1),
+        ('river_analyze', engine.analyze, rivers, 20),
+    ]
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(function, corpus, block, rounds):
+    """Per-call seconds of every timed block over `rounds` passes of the corpus (after one warm-up pass)"""
+    blocks = [corpus[start:start + block] for start in range(0, len(corpus), block)]
+    samples = []
+    # The engine prints its reasoning; keep it out of the measurement
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for item in corpus:
+            function(item)
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                for items in blocks:
+                    start = time.perf_counter()
+                    for item in items:
+                        function(item)
+                    samples.append((time.perf_counter() - start) / len(items))
+        finally:
+            gc.enable()
+    return np.array(samples)
+
+def summarize(samples, block):
+    """ops/sec and p50/p95/p99 microseconds of a case"""
+    p50, p95, p99 = np.percentile(samples * 1e6, [50, 95, 99])
+    return {
+        'calls': int(len(samples) * block),
+        'ops_per_sec': float(1 / samples.mean()),
+        'p50_us': float(p50),
+        'p95_us': float(p95),
+        'p99_us': float(p99),
+    }
+
+def compare(results, baseline, tolerance):
+    """[(case, current p50 / baseline p50, regressed)] for every case in both"""
+    rows = []
+    for name, stats in results['cases'].items():
+        if name in baseline['cases']:
+            ratio = stats['p50_us'] / baseline['cases'][name]['p50_us']
+            rows.append((name, ratio, ratio > 1 + tolerance))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help=f'allowed p50 slowdown as a fraction (default {TOLERANCE})')
+    parser.add_argument('--output', default=RESULTS_PATH)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    args = parser.parse_args(argv)
+
+    results = {
+        'time': time.time(),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'numpy': np.__version__, 'cpus': os.cpu_count()},
+        'seed': args.seed,
+        'rounds': args.rounds,
+        'cases': {},
+    }
+    for name, function, corpus, block in build_cases(args.seed):
+        results['cases'][name] = summarize(measure(function, corpus, block, args.rounds), block)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    ratios = {name: (ratio, regressed) for name, ratio, regressed in compare(results, baseline, args.tolerance)} \
+        if baseline is not None else {}
+
+    print("="*78)
+    print(f"Engine micro-benchmarks, seed {args.seed}, {args.rounds} rounds -> {args.output}")
+    print(f"{'case':<18} {'calls':>7} {'ops/s':>11} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'vs base':>8}")
+    print("-"*78)
+    for name, stats in results['cases'].items():
+        ratio = f"{ratios[name][0]:.2f}x" + (" !" if ratios[name][1] else "") if name in ratios else "-"
+        print(f"{name:<18} {stats['calls']:>7} {stats['ops_per_sec']:>11,.0f} {stats['p50_us']:>9.2f} "
+              f"{stats['p95_us']:>9.1f} {stats['p99_us']:>9.1f} {ratio:>8}")
+    print("-"*78)
+    regressions = [name for name, (_, regressed) in ratios.items() if regressed]
+    if args.save_baseline:
+        print(f"Saved baseline: {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline} (save one with --save-baseline)")
+    elif regressions:
+        print(f"REGRESSED past +{args.tolerance:.0%} p50: {', '.join(regressions)}")
+    else:
+        print(f"Within +{args.tolerance:.0%} of the baseline p50")
+    print("="*78)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Scaling of the process-pool equity backend over worker counts.
+
+Each worker count gets a fresh EquityPool (startup reported separately, one
+warm-up call) and then runs `--repeats` deep simulations of each spot.
+Reports time per call, deals per second, speedup and parallel efficiency
+against one worker, and checks that every worker count returns the same
+equity for the same seed.
+
+Run from the repository root:
+    python -m benchmarks.parallel [--workers N ...] [--simulations N] [--repeats N] [--seed S]
+"""
+import argparse
+import os
+import sys
+import time
+
+from equity_pool import EquityPool, SHARD
+from cards import card_from_string
+
+SPOTS = [
+    ('preflop x3', ['AS', 'KD'], [], 3),
+    ('flop', ['AS', 'KD'], ['QH', '7C', '2S'], 1),
+]
+
+def default_workers():
+    """1, 2, 4, ... up to the CPU count, plus the CPU count itself"""
+    cpus = os.cpu_count() or 1
+    workers = [1 << i for i in range(cpus.bit_length()) if 1 << i < cpus]
+    return workers + [cpus]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers())
+    parser.add_argument('--simulations', type=int, default=1000000)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print("="*78)
+    print(f"{os.cpu_count()} CPUs, {args.simulations:,} deals per call in shards of {SHARD:,}")
+    print(f"{'spot':<11} {'workers':>7} {'startup ms':>10} {'ms/call':>9} {'deals/s':>12} "
+          f"{'speedup':>8} {'eff':>5} {'equity':>9}")
+    results = {}
+    for workers in args.workers:
+        start = time.perf_counter()
+        pool = EquityPool(workers)
+        pool.equity([0, 1], [], SHARD * workers)  # Start and warm every worker
+        startup = time.perf_counter() - start
+        for name, hole_cards, community_cards, opponents in SPOTS:
+            hole = [card_from_string(card) for card in hole_cards]
+            board = [card_from_string(card) for card in community_cards]
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                equity = pool.equity(hole, board, args.simulations, args.seed, opponents)
+            elapsed = (time.perf_counter() - start) / args.repeats
+            results.setdefault(name, []).append((workers, startup, elapsed, equity))
+        pool.close()
+
+    reproducible = True
+    for name, rows in results.items():
+        print("-"*78)
+        baseline = rows[0][2]
+        for workers, startup, elapsed, equity in rows:
+            print(f"{name:<11} {workers:>7} {startup * 1000:>10.0f} {elapsed * 1000:>9.1f} "
+                  f"{args.simulations / elapsed:>12,.0f} {baseline / elapsed:>8.2f} "
+                  f"{baseline / elapsed / workers:>5.0%} {equity:>9.5f}")
+        reproducible &= len({equity for _, _, _, equity in rows}) == 1
+    print("-"*78)
+    print(f"Same equity for every worker count: {'yes' if reproducible else 'NO'}")
+    print("="*78)
+    return 0 if reproducible else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
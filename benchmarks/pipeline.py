@@ -0,0 +1,127 @@
+"""
+End-to-end throughput of the turn -> cards -> engine pipeline on replayed
+frames, with clicks stubbed out.
+
+Run from the repository root:
+    python -m benchmarks.pipeline [frames...] [--cycles N] [--no-cache] [--recognizer NAME] [--timings [PATH]]
+    python -m benchmarks.pipeline [frames...] --threaded SECONDS [--frame-interval S] [--no-cache]
+
+`frames` are PNG screenshots, directories of them or a recorded .npz
+(see capture.record_frames); defaults to test_img_1.png and test_img_2.png.
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from actions import NullExecutor
+from config import FRAME_INTERVAL, RECOGNIZER
+from capture import ReplayFrameSource
+from pipeline import Pipeline, RECOGNIZERS
+from roi_cache import RecognitionCache
+from staged import StagedLoop
+from timing import StageTimer
+
+DEFAULT_FRAMES = ['test_img_1.png', 'test_img_2.png']
+
+def percentiles(samples):
+    """p50/p95/p99 of a list of seconds, in milliseconds"""
+    values = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return dict(zip(['p50', 'p95', 'p99'], values))
+
+def run(source, pipeline, executor, cycles):
+    """Drive the pipeline over `cycles` frames as fast as possible, returning per-frame latencies"""
+    latencies = []
+    # The engine prints its reasoning; keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(cycles):
+            start = time.perf_counter()
+            _, img_gray = source.grab()
+            state = pipeline.analyze(img_gray, source.origin)
+            if state is not None:
+                with pipeline.timer.stage('make_move'):
+                    executor.make_move(state['recommendation'])
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+def run_threaded(source, pipeline, executor, seconds, frame_interval):
+    """Run the staged loop for `seconds`, capturing once per `frame_interval`"""
+    loop = StagedLoop(source, pipeline, executor, action_interval=0.0, frame_interval=frame_interval)
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop.start()
+        time.sleep(seconds)
+        loop.stop()
+    if loop.error is not None:
+        raise loop.error
+    return loop.stats()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('frames', nargs='*', default=DEFAULT_FRAMES)
+    parser.add_argument('--cycles', type=int, default=200)
+    parser.add_argument('--no-cache', action='store_true', help='re-classify every region on every frame')
+    parser.add_argument('--recognizer', choices=sorted(RECOGNIZERS), default=RECOGNIZER)
+    parser.add_argument('--timings', nargs='?', const='', default=None, metavar='PATH',
+                        help='per-stage p50/p95/p99, optionally appended to a JSONL file')
+    parser.add_argument('--threaded', type=float, default=None, metavar='SECONDS',
+                        help='run the staged capture/detect/engine threads instead of the serial loop')
+    parser.add_argument('--click-delay', type=float, default=0.0,
+                        help='seconds each stubbed move blocks for, like the real click sequence')
+    parser.add_argument('--frame-interval', type=float, default=FRAME_INTERVAL,
+                        help='seconds between captures in --threaded mode (0 = as fast as possible)')
+    args = parser.parse_args(argv)
+
+    frames = args.frames[0] if len(args.frames) == 1 else args.frames
+    cache = RecognitionCache(maxsize=0) if args.no_cache else RecognitionCache()
+    pipeline = Pipeline(recognition_cache=cache, recognizer=args.recognizer)
+    source = ReplayFrameSource(frames)
+    executor = NullExecutor()
+
+    run(source, pipeline, executor, len(source.frames))  # warm-up
+    executor = NullExecutor(delay=args.click_delay)
+
+    if args.threaded is not None:
+        timer = StageTimer()
+        pipeline.timer = source.timer = timer
+        stats = run_threaded(source, pipeline, executor, args.threaded, args.frame_interval)
+        summary = timer.summary()
+        print("="*70)
+        print(f"Staged loop:   {args.threaded:.1f} s (cache {'off' if args.no_cache else 'on'})")
+        print(f"Captured:      {stats['captured'] / args.threaded:8.1f} frames/sec")
+        print(f"Analysed:      {stats['analysed'] / args.threaded:8.1f} frames/sec ({stats['dropped']} stale frames dropped)")
+        print(f"Decisions:     {stats['decisions'] / args.threaded:8.1f} /sec")
+        if 'frame_to_decision' in summary:
+            s = summary['frame_to_decision']
+            print(f"Frame->move:   p50 {s['p50']:.2f} ms  p95 {s['p95']:.2f} ms  p99 {s['p99']:.2f} ms")
+        print("="*70)
+        pipeline.close()
+        return 0
+
+    if args.timings is not None:
+        timer = StageTimer(path=args.timings or None, flush_interval=0.0)
+        pipeline.timer = source.timer = timer
+    latencies = run(source, pipeline, executor, args.cycles)
+    total = sum(latencies)
+    p = percentiles(latencies)
+
+    print("="*70)
+    print(f"Frames:        {args.cycles} ({len(source.frames)} distinct, cache {'off' if args.no_cache else 'on'})")
+    print(f"Throughput:    {args.cycles / total:8.1f} frames/sec")
+    print(f"Latency:       p50 {p['p50']:.2f} ms  p95 {p['p95']:.2f} ms  p99 {p['p99']:.2f} ms")
+    print(f"Capture:       {source.mean_time() * 1000:8.2f} ms mean (replay convert only)")
+    print(f"Moves made:    {len(executor.moves)}")
+    if args.timings is not None:
+        print("-"*70)
+        print("Stage p50/p95/p99:")
+        for line in pipeline.timer.lines():
+            print(f"  {line}")
+        pipeline.timer.maybe_flush()
+    print("="*70)
+    pipeline.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
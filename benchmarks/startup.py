@@ -0,0 +1,108 @@
+"""
+Time from process start to the first decision, with templates from the
+compiled asset bundle or decoded from the PNGs.
+
+Every run starts a fresh interpreter that imports the pipeline, loads the
+templates and turn indicator, builds the Pipeline (template variants,
+recognizer, warmed engine), replays one frame and decides it. The parent
+process times each stage from just before it launched the child:
+
+    interpreter  Python startup until the child's code runs
+    imports      pipeline and capture modules (numpy, cv2, engine)
+    assets       template bank sets and turn indicator (bundle or PNGs)
+    pipeline     Pipeline construction
+    frame        decoding the replayed screenshot (replay only, not in total)
+    decision     first Pipeline.analyze on the frame
+
+Run from the repository root:
+    python -m benchmarks.startup [frame] [--runs N]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+STAGES = ['interpreter', 'imports', 'assets', 'pipeline', 'frame', 'decision']
+
+def child(mode, frame):
+    """Run the startup in this process and print the wall-clock time each stage ended, as JSON"""
+    stamps = {'interpreter': time.time()}
+
+    import contextlib
+    import io
+    from pipeline import Pipeline, load_turn_template
+    from card_detection import TemplateBank
+    from capture import ReplayFrameSource
+    stamps['imports'] = time.time()
+
+    bundle = mode == 'bundle'
+    bank = TemplateBank.load(bundle=bundle)
+    turn_template = load_turn_template(bundle=bundle)
+    stamps['assets'] = time.time()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = Pipeline(bank=bank, turn_template=turn_template)
+    stamps['pipeline'] = time.time()
+
+    source = ReplayFrameSource(frame)
+    _, img_gray = source.grab()
+    stamps['frame'] = time.time()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        state = pipeline.analyze(img_gray, source.origin)
+    stamps['decision'] = time.time()
+    stamps['recommendation'] = str(state.get('recommendation'))
+    print(json.dumps(stamps))
+
+def launch(mode, frame):
+    """Stage durations (seconds) and recommendation of one fresh process"""
+    start = time.time()
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', mode, frame],
+                            check=True, capture_output=True, text=True).stdout
+    stamps = json.loads(output.strip().splitlines()[-1])
+    ends = [stamps[stage] for stage in STAGES]
+    durations = dict(zip(STAGES, [end - begin for begin, end in zip([start] + ends, ends)]))
+    return durations, stamps['recommendation']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('frame', nargs='?', default='test_img_1.png')
+    parser.add_argument('--runs', type=int, default=7, help="fresh processes per mode (medians are reported)")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child is not None:
+        child(args.child, args.frame)
+        return 0
+
+    from assets import load_assets
+    load_assets()  # Compile the bundle now if it is missing or stale, not inside a measured run
+
+    import numpy as np
+    results, recommendations = {}, set()
+    for mode in ('png', 'bundle'):
+        runs = []
+        for _ in range(args.runs):
+            durations, recommendation = launch(mode, args.frame)
+            runs.append(durations)
+            recommendations.add(recommendation)
+        results[mode] = {stage: float(np.median([run[stage] for run in runs])) for stage in STAGES}
+        results[mode]['total'] = float(np.median([sum(run[stage] for stage in STAGES if stage != 'frame')
+                                                  for run in runs]))
+
+    print("="*60)
+    print(f"Start -> first decision, medians over {args.runs} fresh processes ({args.frame})")
+    print(f"{'stage':<14} {'png ms':>10} {'bundle ms':>10}")
+    print("-"*60)
+    for stage in STAGES + ['total']:
+        if stage == 'total':
+            print("-"*60)
+        print(f"{stage:<14} {results['png'][stage] * 1000:>10.1f} {results['bundle'][stage] * 1000:>10.1f}")
+    print("-"*60)
+    print(f"Decisions: {', '.join(sorted(recommendations))}")
+    print("="*60)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
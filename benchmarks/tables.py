@@ -0,0 +1,134 @@
+"""
+How many tables one process sustains at an action-latency target.
+
+Runs a TableScheduler over 1..N replayed tables sharing one Pipeline. Each
+table's turn indicator appears at random moments (every `--gap` seconds
+on average, after its previous move), and its stubbed clicks block as long
+as ClickExecutor's: one click for fold/check/call, two clicks and 1 s of
+sleeps plus the bet slider for a raise (pyautogui pauses 0.1 s per click).
+The latency of a turn is from the indicator appearing to its move
+starting; turns still unanswered at the end count with their wait so far.
+The replayed screenshots never raise, so --click-seconds stands in for a
+raise-heavy mix when sizing for the mouse rather than for detection.
+
+Run from the repository root:
+    python -m benchmarks.tables [frames...] [--max-tables N] [--seconds S] [--gap S] [--click-seconds S]
+                              [--target S] [--cache]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from actions import NullExecutor
+from config import ACTION_LATENCY_TARGET
+from multitable import Table, TableScheduler
+from pipeline import Pipeline
+from roi_cache import RecognitionCache
+from turn_watcher import TurnWatcher, TURN_REGIONS
+from benchmarks.pipeline import DEFAULT_FRAMES, percentiles
+from benchmarks.turn import Scenario, scenario_source
+
+CLICK_SECONDS = 0.1  # One pyautogui click and its PAUSE
+RAISE_SECONDS = 1.3  # Raise button, slider, raise button and the two 0.5 s sleeps between them
+
+class SimulatedTurns(NullExecutor):
+    """
+    Stub executor ending the table's turn: blocks as long as the real
+    clicks (or `click_seconds` per move), then schedules the next turn `gap`
+    seconds later on average
+    """
+
+    def __init__(self, scenario, rng, gap, click_seconds=None):
+        super().__init__()
+        self.scenario = scenario
+        self.rng = rng
+        self.gap = gap
+        self.click_seconds = click_seconds
+        self.latencies = []
+
+    def make_move(self, recom):
+        self.latencies.append(time.perf_counter() - self.scenario.switch_at)
+        self.scenario.switch_at = float('inf')
+        self.moves.append(recom)
+        if self.click_seconds is not None:
+            time.sleep(self.click_seconds)
+        else:
+            time.sleep(RAISE_SECONDS if recom[0] == "RAISE" else CLICK_SECONDS)
+        self.scenario.switch_at = time.perf_counter() + self.rng.uniform(0.5, 1.5) * self.gap
+
+def run(count, frames, pipeline, seconds, gap, rng, click_seconds=None):
+    """(turn latencies in seconds, moves, process CPU share) of `count` tables over `seconds`"""
+    tables = []
+    for index in range(count):
+        scenario = Scenario()
+        watcher = TurnWatcher(scenario_source(scenario, frames, regions=TURN_REGIONS, margin=0), pipeline.palo_gray)
+        tables.append(Table(f"table{index + 1}", scenario_source(scenario, frames),
+                            SimulatedTurns(scenario, rng, gap, click_seconds), watcher))
+
+    scheduler = TableScheduler(tables, pipeline)
+    # The engine prints its reasoning; keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        wall, cpu = time.perf_counter(), time.process_time()
+        for table in tables:
+            table.executor.scenario.switch_at = wall + rng.uniform(0, gap)
+        scheduler.start()
+        time.sleep(seconds)
+        scheduler.stop()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    if scheduler.error is not None:
+        raise scheduler.error
+
+    now = time.perf_counter()
+    latencies, moves = [], 0
+    for table in tables:
+        latencies += table.executor.latencies
+        moves += len(table.executor.moves)
+        if table.executor.scenario.our_turn():
+            latencies.append(now - table.executor.scenario.switch_at)
+    return latencies, moves, cpu / wall
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('frames', nargs='*', default=DEFAULT_FRAMES)
+    parser.add_argument('--max-tables', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=20.0, help='run time per table count')
+    parser.add_argument('--gap', type=float, default=8.0, help='mean seconds from a move to that table\'s next turn')
+    parser.add_argument('--click-seconds', type=float, default=None,
+                        help='seconds every move holds the mouse (default: by action, like ClickExecutor)')
+    parser.add_argument('--target', type=float, default=ACTION_LATENCY_TARGET,
+                        help='p95 turn -> move seconds a table count must stay within')
+    parser.add_argument('--cache', action='store_true',
+                        help='keep the recognition cache (replayed frames repeat, so detection becomes nearly free)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    frames = args.frames[0] if len(args.frames) == 1 else args.frames
+    cache = RecognitionCache() if args.cache else RecognitionCache(maxsize=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = Pipeline(recognition_cache=cache)
+    rng = random.Random(args.seed)
+
+    print("="*70)
+    print(f"Tables on one Pipeline: a turn every {args.gap:.0f}s per table on average, "
+          f"{args.seconds:.0f}s per count, target p95 {args.target * 1000:.0f} ms")
+    print(f"{'tables':>6} {'moves':>6} {'moves/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'CPU':>6}")
+    print("-"*70)
+    sustained = 0
+    for count in range(1, args.max_tables + 1):
+        latencies, moves, cpu = run(count, frames, pipeline, args.seconds, args.gap, rng, args.click_seconds)
+        p = percentiles(latencies) if latencies else {'p50': 0.0, 'p95': 0.0}
+        worst = max(latencies) * 1000 if latencies else 0.0
+        print(f"{count:>6} {moves:>6} {moves / args.seconds:>8.2f} {p['p50']:>8.0f} {p['p95']:>8.0f} "
+              f"{worst:>8.0f} {cpu:>6.0%}")
+        if p['p95'] > args.target * 1000:
+            break
+        sustained = count
+    print("-"*70)
+    print(f"Sustained at p95 <= {args.target * 1000:.0f} ms: {sustained} table(s)")
+    print("="*70)
+    pipeline.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Reaction latency and CPU use of the turn watcher against polling.
+
+Replays a table where the turn indicator is absent, switches to the real
+screenshot at a random moment and measures how long each loop takes to
+reach a decision, plus process CPU time while waiting for the turn:
+
+    serial   integrated.main: analyze every SAMPLE_INTERVAL
+    staged   StagedLoop detecting every frame, one per FRAME_INTERVAL
+    watcher  StagedLoop driven by a TurnWatcher probe every PROBE_INTERVAL
+
+Run from the repository root:
+    python -m benchmarks.turn [frames...] [--trials N] [--idle SECONDS] [--no-cache] [--display-interval S]
+
+The watcher runs headless by default; --display-interval adds the full frame
+grabs integrated.main_pipelined makes for its overlay between turns.
+
+Replayed frames cost nothing to "capture", so the live difference is larger:
+the watcher reads only the indicator strip between turns.
+"""
+import argparse
+import contextlib
+import io
+import random
+import threading
+import time
+
+import numpy as np
+
+from actions import NullExecutor
+from config import SAMPLE_INTERVAL, FRAME_INTERVAL, PALO_POS_START, PALO_POS_END
+from capture import FrameSource, ReplayFrameSource
+from pipeline import Pipeline
+from roi_cache import RecognitionCache
+from staged import StagedLoop
+from turn_watcher import TurnWatcher, TURN_REGIONS
+from benchmarks.pipeline import DEFAULT_FRAMES, percentiles
+
+MODES = ['serial', 'staged', 'watcher']
+
+# ============================================================================
+# SCENARIO
+# ============================================================================
+
+class Scenario:
+    """Shared clock of when it becomes our turn"""
+
+    def __init__(self):
+        self.switch_at = float('inf')
+
+    def our_turn(self):
+        return time.perf_counter() >= self.switch_at
+
+class ScenarioSource(FrameSource):
+    """Replays `waiting` frames until the scenario switches, then `turn` frames"""
+
+    def __init__(self, scenario, waiting, turn):
+        super().__init__(turn.origin)
+        self.scenario = scenario
+        self.waiting = waiting
+        self.turn = turn
+
+    def read(self):
+        return (self.turn if self.scenario.our_turn() else self.waiting).read()
+
+def hide_indicator(source):
+    """Fill the turn indicator region of every replayed frame with its mean colour"""
+    x1, y1 = PALO_POS_START - source.origin
+    x2, y2 = PALO_POS_END - source.origin
+    for frame in source.frames:
+        roi = frame[y1:y2, x1:x2]
+        roi[:] = roi.reshape(-1, roi.shape[2]).mean(axis=0).astype(frame.dtype)
+    return source
+
+def scenario_source(scenario, frames, **kwargs):
+    return ScenarioSource(scenario, hide_indicator(ReplayFrameSource(frames, **kwargs)),
+                          ReplayFrameSource(frames, **kwargs))
+
+# ============================================================================
+# LOOPS
+# ============================================================================
+
+class SerialLoop:
+    """integrated.main without the display: capture every 100 ms, analyze every SAMPLE_INTERVAL"""
+
+    def __init__(self, source, pipeline, executor, on_decision, interval=SAMPLE_INTERVAL):
+        self.source = source
+        self.pipeline = pipeline
+        self.executor = executor
+        self.on_decision = on_decision
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last_sample_time = 0
+        while not self._stop.is_set():
+            current_time = time.time()
+            _, img_gray = self.source.grab()
+            if current_time - last_sample_time >= self.interval:
+                last_sample_time = current_time
+                state = self.pipeline.analyze(img_gray, self.source.origin)
+                if state is not None:
+                    self.on_decision(state)
+                    self.executor.make_move(state['recommendation'])
+            self._stop.wait(0.1)  # cv2.waitKey(100)
+
+def make_loop(mode, frames, pipeline, scenario, on_decision, display_interval=0.0):
+    source = scenario_source(scenario, frames)
+    executor = NullExecutor()
+    if mode == 'serial':
+        return SerialLoop(source, pipeline, executor, on_decision), None
+    watcher = None
+    if mode == 'watcher':
+        watcher = TurnWatcher(scenario_source(scenario, frames, regions=TURN_REGIONS, margin=0), pipeline.palo_gray)
+    loop = StagedLoop(source, pipeline, executor, frame_interval=display_interval if watcher else FRAME_INTERVAL,
+                      on_decision=on_decision, watcher=watcher)
+    return loop, watcher
+
+# ============================================================================
+# MEASUREMENTS
+# ============================================================================
+
+def idle_cpu(mode, frames, pipeline, seconds, display_interval=0.0):
+    """Process CPU seconds per wall second while it is not our turn"""
+    loop, watcher = make_loop(mode, frames, pipeline, Scenario(), lambda state: None, display_interval)
+    loop.start()
+    time.sleep(0.2)  # Let the caches settle
+    wall, cpu = time.perf_counter(), time.process_time()
+    time.sleep(seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    loop.stop()
+    return cpu / wall, watcher.stats() if watcher is not None else None
+
+def reaction(mode, frames, pipeline, rng, display_interval=0.0, timeout=2 * SAMPLE_INTERVAL + 1.0):
+    """Seconds from the indicator appearing to the engine's decision, None on timeout"""
+    scenario = Scenario()
+    decided = threading.Event()
+    decided_at = []
+
+    def on_decision(state):
+        if not decided.is_set():
+            decided_at.append(time.perf_counter())
+            decided.set()
+
+    loop, _ = make_loop(mode, frames, pipeline, scenario, on_decision, display_interval)
+    loop.start()
+    time.sleep(rng.uniform(0.2, 0.2 + SAMPLE_INTERVAL))
+    scenario.switch_at = time.perf_counter()
+    decided.wait(timeout)
+    loop.stop()
+    return decided_at[0] - scenario.switch_at if decided_at else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('frames', nargs='*', default=DEFAULT_FRAMES)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--trials', type=int, default=5, help='indicator appearances per mode')
+    parser.add_argument('--idle', type=float, default=3.0, help='seconds of CPU measurement while waiting')
+    parser.add_argument('--no-cache', action='store_true', help='re-classify every region on every frame')
+    parser.add_argument('--display-interval', type=float, default=0.0,
+                        help='seconds between display frame grabs in watcher mode (0 = headless)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    frames = args.frames[0] if len(args.frames) == 1 else args.frames
+    cache = RecognitionCache(maxsize=0) if args.no_cache else RecognitionCache()
+    pipeline = Pipeline(recognition_cache=cache)
+    rng = random.Random(args.seed)
+
+    print(f"{'mode':<8} {'idle CPU':>9} {'react p50':>10} {'react max':>10}  notes")
+    # The engine prints its reasoning; keep it out of the measurement
+    for mode in args.modes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            cpu, watcher_stats = idle_cpu(mode, frames, pipeline, args.idle, args.display_interval)
+            latencies = [reaction(mode, frames, pipeline, rng, args.display_interval) for _ in range(args.trials)]
+        reached = [latency for latency in latencies if latency is not None]
+        notes = f"{len(latencies) - len(reached)} missed" if len(reached) < len(latencies) else ''
+        if watcher_stats is not None:
+            notes += (f" {watcher_stats['probes'] / (args.idle + 0.2):.0f} probes/s, "
+                      f"{watcher_stats['confirms']} confirming matches while waiting")
+        if reached:
+            p = percentiles(reached)
+            print(f"{mode:<8} {cpu:>8.1%} {p['p50']:>8.0f}ms {np.max(reached) * 1000:>8.0f}ms {notes}")
+        else:
+            print(f"{mode:<8} {cpu:>8.1%} {'-':>10} {'-':>10} {notes}")
+
+    pipeline.close()
+
+if __name__ == "__main__":
+    main()
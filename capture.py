@@ -0,0 +1,180 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from config import (
+    SELF_CARD1_RANK_START, SELF_CARD1_RANK_END, SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END,
+    SELF_CARD2_RANK_START, SELF_CARD2_RANK_END, SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END,
+    COMM_CARD_START_POSITION, COMM_CARD_END_POSITION,
+    PALO_POS_START, PALO_POS_END,
+    CAPTURE_MARGIN, CAPTURE_MONITOR,
+)
+from timing import StageTimer
+
+# Every region read by detection, (start, end) in monitor coordinates
+CAPTURE_REGIONS = [
+    (SELF_CARD1_RANK_START, SELF_CARD1_RANK_END),
+    (SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END),
+    (SELF_CARD2_RANK_START, SELF_CARD2_RANK_END),
+    (SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END),
+    (COMM_CARD_START_POSITION, COMM_CARD_END_POSITION),
+    (PALO_POS_START, PALO_POS_END),
+]
+
+def union_bbox(regions, margin, width, height):
+    """Bounding box (x1, y1, x2, y2) of all regions plus a margin, clipped to the monitor"""
+    x1 = min(start[0] for start, _ in regions) - margin
+    y1 = min(start[1] for start, _ in regions) - margin
+    x2 = max(end[0] for _, end in regions) + margin
+    y2 = max(end[1] for _, end in regions) + margin
+    return max(0, int(x1)), max(0, int(y1)), min(width, int(x2)), min(height, int(y2))
+
+class FrameSource:
+    """
+    Source of captured frames for the detection pipeline.
+
+    grab() returns (img_bgr, img_gray) cropped to the detection regions, in
+    capture-local coordinates; `origin` is the monitor position of their
+    top-left pixel and is passed to every consumer (turn detection, card
+    detection, overlay). Subclasses only implement read(), which returns the
+    raw BGRA crop. Capture-plus-convert time is tracked per grab, and the
+    two steps are reported separately to `timer` when one is set.
+    """
+
+    def __init__(self, origin, timer=None):
+        self.origin = np.asarray(origin)
+        self.timer = timer if timer is not None else StageTimer(enabled=False)
+        self.last_time = 0.0
+        self.total_time = 0.0
+        self.count = 0
+
+    def read(self):
+        raise NotImplementedError
+
+    def grab(self):
+        """Capture the region once and return (img_bgr, img_gray)"""
+        start = time.perf_counter()
+        with self.timer.stage('capture'):
+            img = self.read()
+        with self.timer.stage('convert'):
+            img_bgr = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+            img_gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+
+        self.last_time = time.perf_counter() - start
+        self.total_time += self.last_time
+        self.count += 1
+        return img_bgr, img_gray
+
+    def mean_time(self):
+        return self.total_time / self.count if self.count else 0.0
+
+    def close(self):
+        pass
+
+class RegionCapture(FrameSource):
+    """
+    Live backend: grabs only the union bounding box of the detection regions with mss.
+
+    `offset` is where the table's layout sits on the monitor relative to the
+    region constants; the frame's `origin` stays in layout coordinates, so
+    detection works unchanged on a table anywhere on screen.
+    """
+
+    def __init__(self, monitor_index=CAPTURE_MONITOR, regions=CAPTURE_REGIONS, margin=CAPTURE_MARGIN, timer=None,
+                 offset=(0, 0)):
+        import mss
+
+        self.sct = mss.mss()
+        monitor = self.sct.monitors[monitor_index]
+        offset = np.asarray(offset)
+        shifted = [(start + offset, end + offset) for start, end in regions]
+        x1, y1, x2, y2 = union_bbox(shifted, margin, monitor['width'], monitor['height'])
+        super().__init__((x1 - offset[0], y1 - offset[1]), timer)
+        self.area = {
+            'left': monitor['left'] + x1,
+            'top': monitor['top'] + y1,
+            'width': x2 - x1,
+            'height': y2 - y1,
+        }
+
+    def read(self):
+        return np.array(self.sct.grab(self.area))
+
+    def close(self):
+        self.sct.close()
+
+class ReplayFrameSource(FrameSource):
+    """
+    Offline backend: replays full-monitor screenshots or a recorded stream.
+
+    `path` is a directory of PNGs, a single image, a list of images, or an
+    .npz written by record_frames. Screenshots are cropped to the same box as
+    the live capture, so the pipeline sees identical coordinates. Frames are
+    decoded up front and replayed in order, looping when `loop` is set.
+    """
+
+    def __init__(self, path, regions=CAPTURE_REGIONS, margin=CAPTURE_MARGIN, loop=True, timer=None):
+        if isinstance(path, str) and path.endswith('.npz'):
+            recording = np.load(path)
+            frames = list(recording['frames'])
+            origin = recording['origin']
+        else:
+            images = [load_bgra(p) for p in image_paths(path)]
+            height, width = images[0].shape[:2]
+            x1, y1, x2, y2 = union_bbox(regions, margin, width, height)
+            frames = [np.ascontiguousarray(img[y1:y2, x1:x2]) for img in images]
+            origin = (x1, y1)
+
+        super().__init__(origin, timer)
+        self.frames = frames
+        self.loop = loop
+        self.index = 0
+
+    def read(self):
+        if self.index >= len(self.frames):
+            if not self.loop:
+                raise StopIteration
+            self.index = 0
+        frame = self.frames[self.index]
+        self.index += 1
+        return frame
+
+def image_paths(path):
+    """Sorted PNG paths of a directory, or the given path(s)"""
+    if isinstance(path, (list, tuple)):
+        return list(path)
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith('.png'))
+    return [path]
+
+def load_bgra(path):
+    """Read a screenshot as BGRA, like an mss grab"""
+    img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if img is None:
+        raise Exception(f"{path} not found")
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+    if img.shape[2] == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+    return img
+
+def record_frames(source, path, count, interval=0.0):
+    """Record `count` raw frames from a source into an .npz for ReplayFrameSource"""
+    frames = []
+    for _ in range(count):
+        frames.append(source.read())
+        time.sleep(interval)
+    np.savez_compressed(path, frames=np.stack(frames), origin=source.origin)
+
+if __name__ == "__main__":
+    import sys
+
+    # Record a live session for offline replay: python capture.py session.npz 200
+    out_path = sys.argv[1] if len(sys.argv) > 1 else 'session.npz'
+    n_frames = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    live = RegionCapture()
+    record_frames(live, out_path, n_frames, interval=0.1)
+    live.close()
+    print(f"Recorded {n_frames} frames to {out_path}")
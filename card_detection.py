@@ -0,0 +1,494 @@
+import cv2
+import numpy as np
+import os
+from config import (
+    SELF_CARD1_RANK_START, SELF_CARD1_RANK_END, SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END,
+    SELF_CARD2_RANK_START, SELF_CARD2_RANK_END, SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END,
+    COMM_CARD_START_POSITION, COMM_CARD_END_POSITION,
+)
+from cards import card_from_names
+from roi_cache import GeometryCache
+
+# Template folders are read relative to this file, not the working directory
+TEMPLATE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# ============================================================================
+# TEMPLATE LOADING
+# ============================================================================
+
+def load_tilted_templates(root=TEMPLATE_ROOT):
+    """Load tilted templates for self cards"""
+    ranks_left = {}
+    ranks_right = {}
+    suits_left = {}
+    suits_right = {}
+    
+    rank_names = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+    suit_names = ['Club', 'Diamond', 'Heart', 'Spade']
+    
+    for rank in rank_names:
+        left_path = os.path.join(root, 'ranks', f'{rank}l.png')
+        right_path = os.path.join(root, 'ranks', f'{rank}r.png')
+        
+        if os.path.exists(left_path):
+            img = cv2.imread(left_path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    ranks_left[rank] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    ranks_left[rank][alpha == 0] = 255
+                else:
+                    ranks_left[rank] = cv2.imread(left_path, cv2.IMREAD_GRAYSCALE)
+        
+        if os.path.exists(right_path):
+            img = cv2.imread(right_path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    ranks_right[rank] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    ranks_right[rank][alpha == 0] = 255
+                else:
+                    ranks_right[rank] = cv2.imread(right_path, cv2.IMREAD_GRAYSCALE)
+    
+    for suit in suit_names:
+        left_path = os.path.join(root, 'suits', f'{suit}Left.png')
+        right_path = os.path.join(root, 'suits', f'{suit}Right.png')
+        
+        if os.path.exists(left_path):
+            img = cv2.imread(left_path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    suits_left[suit] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    suits_left[suit][alpha == 0] = 255
+                else:
+                    suits_left[suit] = cv2.imread(left_path, cv2.IMREAD_GRAYSCALE)
+        
+        if os.path.exists(right_path):
+            img = cv2.imread(right_path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    suits_right[suit] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    suits_right[suit][alpha == 0] = 255
+                else:
+                    suits_right[suit] = cv2.imread(right_path, cv2.IMREAD_GRAYSCALE)
+    
+    return ranks_left, ranks_right, suits_left, suits_right
+
+def load_straight_templates(root=TEMPLATE_ROOT):
+    """Load straight templates for community cards"""
+    ranks = {}
+    suits = {}
+    
+    rank_names = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+    suit_names = ['Club', 'Diamond', 'Heart', 'Spade']
+    
+    for rank in rank_names:
+        path = os.path.join(root, 's_ranks', f'{rank}.png')
+        if os.path.exists(path):
+            img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    ranks[rank] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    ranks[rank][alpha == 0] = 255
+                else:
+                    ranks[rank] = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    
+    for suit in suit_names:
+        path = os.path.join(root, 's_suits', f'{suit}.png')
+        if os.path.exists(path):
+            img = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if img is not None:
+                if len(img.shape) == 3 and img.shape[2] == 4:
+                    alpha = img[:, :, 3]
+                    bgr = img[:, :, :3]
+                    suits[suit] = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+                    suits[suit][alpha == 0] = 255
+                else:
+                    suits[suit] = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    
+    return ranks, suits
+
+# ============================================================================
+# TEMPLATE BANK
+# ============================================================================
+
+TILTED_SCALES = [0.80, 0.85, 0.90, 0.95, 1.0, 1.05, 1.1]
+STRAIGHT_SCALES = [0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3]
+VARIANT_CACHE_SIZE = 64  # (set, ROI geometry) variant sets kept; a frame needs at most 4 tilted + 10 straight
+
+# Fixed ROI geometries of the self cards, (template set, start, end)
+SELF_CARD_SLOTS = [
+    ('ranks_left', SELF_CARD1_RANK_START, SELF_CARD1_RANK_END),
+    ('suits_left', SELF_CARD1_SUIT_START, SELF_CARD1_SUIT_END),
+    ('ranks_right', SELF_CARD2_RANK_START, SELF_CARD2_RANK_END),
+    ('suits_right', SELF_CARD2_SUIT_START, SELF_CARD2_SUIT_END),
+]
+
+def scaled_size(template, w, h, scale):
+    """Size of a template rescaled to `scale` of the ROI height, or None if it does not fit"""
+    template_h, template_w = template.shape
+    new_h = int(h * scale)
+    new_w = int((template_w / template_h) * new_h)
+
+    if new_w > w or new_h > h or new_w < 5 or new_h < 5:
+        return None
+    return new_w, new_h
+
+class TemplateBank:
+    """
+    All template variants needed for detection, built once at startup.
+
+    For every ROI geometry (w, h) the bank holds each template already resized
+    to every scale and blurred (tilted) or thresholded (straight), so a
+    detection pass only runs matchTemplate. Self card geometries are fixed and
+    built up front; community card geometries come from contour detection and
+    are built the first time they are seen. The least recently used
+    geometries are dropped past VARIANT_CACHE_SIZE.
+
+    The bank is also the default recognizer for detect_self_cards and
+    detect_community_cards: any object with classify_tilted/classify_straight
+    returning (name, score) can be passed in its place.
+    """
+
+    def __init__(self, ranks_left, ranks_right, suits_left, suits_right, comm_ranks, comm_suits):
+        self.templates = {
+            'ranks_left': ranks_left,
+            'ranks_right': ranks_right,
+            'suits_left': suits_left,
+            'suits_right': suits_right,
+            'comm_ranks': comm_ranks,
+            'comm_suits': comm_suits,
+        }
+        self._variants = GeometryCache(VARIANT_CACHE_SIZE)
+
+        for set_name, start, end in SELF_CARD_SLOTS:
+            w, h = end - start
+            self.tilted(set_name, w, h)
+
+    @classmethod
+    def load(cls, bundle=True):
+        """Build the bank from the compiled asset bundle (see assets), or by decoding every template PNG"""
+        if bundle:
+            from assets import default_assets
+            return cls(**default_assets().templates)
+        ranks_left, ranks_right, suits_left, suits_right = load_tilted_templates()
+        comm_ranks, comm_suits = load_straight_templates()
+        return cls(ranks_left, ranks_right, suits_left, suits_right, comm_ranks, comm_suits)
+
+    def tilted(self, set_name, w, h):
+        """{name: [blurred template per scale]} for a tilted ROI of size w x h"""
+        return self._variants.get(('tilted', set_name, int(w), int(h)), lambda: self._tilted(set_name, w, h))
+
+    def _tilted(self, set_name, w, h):
+        variants = {}
+        for name, template in self.templates[set_name].items():
+            if template is None:
+                continue
+            variants[name] = []
+            for scale in TILTED_SCALES:
+                size = scaled_size(template, w, h, scale)
+                if size is None:
+                    continue
+                resized_template = cv2.resize(template, size)
+                variants[name].append(cv2.GaussianBlur(resized_template, (3, 3), 0))
+        return variants
+
+    def straight(self, set_name, w, h):
+        """{name: [(template, thresholded template) per scale]} for a straight ROI of size w x h"""
+        return self._variants.get(('straight', set_name, int(w), int(h)), lambda: self._straight(set_name, w, h))
+
+    def _straight(self, set_name, w, h):
+        variants = {}
+        for name, template in self.templates[set_name].items():
+            if template is None:
+                continue
+            variants[name] = []
+            for scale in STRAIGHT_SCALES:
+                size = scaled_size(template, w, h, scale)
+                if size is None:
+                    continue
+                resized_template = cv2.resize(template, size)
+                _, template_thresh = cv2.threshold(resized_template, 150, 255, cv2.THRESH_BINARY_INV)
+                variants[name].append((resized_template, template_thresh))
+        return variants
+
+    def classify_tilted(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a tilted ROI"""
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        w, h = x2 - x1, y2 - y1
+        best_name, best_score = None, -1.0
+
+        if w <= 0 or h <= 0:
+            return best_name, best_score
+
+        roi_blur = cv2.GaussianBlur(img_gray[y1:y2, x1:x2], (3, 3), 0)
+        for name, variants in self.tilted(set_name, w, h).items():
+            score = match_tilted_roi(roi_blur, variants)
+            if score > best_score:
+                best_score = score
+                best_name = name
+        return best_name, best_score
+
+    def classify_straight(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a straight ROI"""
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        w, h = x2 - x1, y2 - y1
+        best_name, best_score = None, -1.0
+
+        if w <= 0 or h <= 0:
+            return best_name, best_score
+
+        roi = img_gray[y1:y2, x1:x2]
+        _, roi_thresh = cv2.threshold(roi, 150, 255, cv2.THRESH_BINARY_INV)
+        for name, variants in self.straight(set_name, w, h).items():
+            score = match_straight_roi(roi, roi_thresh, variants)
+            if score > best_score:
+                best_score = score
+                best_name = name
+        return best_name, best_score
+
+# ============================================================================
+# CARD DETECTION
+# ============================================================================
+
+def match_template_tilted(src_gray, start_pos, end_pos, template):
+    """Match template for tilted cards"""
+    x1, y1 = start_pos
+    x2, y2 = end_pos
+    roi = src_gray[y1:y2, x1:x2]
+    w, h = x2 - x1, y2 - y1
+    
+    if w <= 0 or h <= 0:
+        return -1.0
+    
+    best_score = -1.0
+    for scale in [0.80, 0.85, 0.90, 0.95, 1.0, 1.05, 1.1]:
+        template_h, template_w = template.shape
+        new_h = int(h * scale)
+        new_w = int((template_w / template_h) * new_h)
+        
+        if new_w > w or new_h > h or new_w < 5 or new_h < 5:
+            continue
+        
+        try:
+            resized_template = cv2.resize(template, (new_w, new_h))
+            tpl_blur = cv2.GaussianBlur(resized_template, (3, 3), 0)
+            roi_blur = cv2.GaussianBlur(roi, (3, 3), 0)
+            res = cv2.matchTemplate(roi_blur, tpl_blur, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, _ = cv2.minMaxLoc(res)
+            if max_val > best_score:
+                best_score = max_val
+        except:
+            continue
+    
+    return best_score
+
+def match_tilted_roi(roi_blur, variants):
+    """Best score of pre-blurred template variants against a pre-blurred tilted ROI"""
+    best_score = -1.0
+    for tpl_blur in variants:
+        res = cv2.matchTemplate(roi_blur, tpl_blur, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, _ = cv2.minMaxLoc(res)
+        if max_val > best_score:
+            best_score = max_val
+    return best_score
+
+def run_slot_jobs(jobs, pool=None):
+    """Run (function, *args) classification jobs, on the pool when one is given, results in order"""
+    if pool is None:
+        return [job[0](*job[1:]) for job in jobs]
+    futures = [pool.submit(*job) for job in jobs]
+    return [future.result() for future in futures]
+
+def detect_self_cards(img_gray, recognizer, origin=(0, 0), pool=None):
+    """
+    Detect both self cards as card indices (see cards), None where a slot is
+    unreadable. `origin` is the monitor position of img_gray's top-left pixel.
+    With a `pool` the four rank/suit slots are classified concurrently.
+    """
+    origin = np.asarray(origin)
+    classify = recognizer.classify_tilted
+
+    (best_rank1, _), (best_suit1, _), (best_rank2, _), (best_suit2, _) = run_slot_jobs([
+        (classify, img_gray, SELF_CARD1_RANK_START - origin, SELF_CARD1_RANK_END - origin, 'ranks_left'),
+        (classify, img_gray, SELF_CARD1_SUIT_START - origin, SELF_CARD1_SUIT_END - origin, 'suits_left'),
+        (classify, img_gray, SELF_CARD2_RANK_START - origin, SELF_CARD2_RANK_END - origin, 'ranks_right'),
+        (classify, img_gray, SELF_CARD2_SUIT_START - origin, SELF_CARD2_SUIT_END - origin, 'suits_right'),
+    ], pool)
+
+    # Card 1 (LEFT)
+    card1 = card_from_names(best_rank1, best_suit1) if best_rank1 and best_suit1 else None
+
+    # Card 2 (RIGHT)
+    card2 = card_from_names(best_rank2, best_suit2) if best_rank2 and best_suit2 else None
+
+    return card1, card2
+
+def detect_card_rectangles(img_gray, comm_region_start, comm_region_end):
+    """Detect white card rectangles in the community card area"""
+    x1, y1 = comm_region_start
+    x2, y2 = comm_region_end
+    roi = img_gray[y1:y2, x1:x2]
+    _, thresh = cv2.threshold(roi, 200, 255, cv2.THRESH_BINARY)
+    contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    card_boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        aspect_ratio = h / w if w > 0 else 0
+        area = w * h
+        
+        if (w > 60 and h > 80 and area > 5000 and area < 20000 and
+            aspect_ratio > 1.2 and aspect_ratio < 2.0):
+            card_boxes.append({'x': x1 + x, 'y': y1 + y, 'w': w, 'h': h})
+    
+    card_boxes.sort(key=lambda box: box['x'])
+    return card_boxes
+
+def extract_rank_and_suit_regions(card_box, img_gray):
+    """Extract rank and suit regions from detected card - handles 10 card with 2 digits"""
+    x, y, w, h = card_box['x'], card_box['y'], card_box['w'], card_box['h']
+    card_img = img_gray[y:y+h, x:x+w]
+    _, card_thresh = cv2.threshold(card_img, 150, 255, cv2.THRESH_BINARY_INV)
+    contours, _ = cv2.findContours(card_thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    valid_contours = []
+    for cnt in contours:
+        cx, cy, cw, ch = cv2.boundingRect(cnt)
+        if cw * ch > 50:
+            valid_contours.append({'x': cx, 'y': cy, 'w': cw, 'h': ch, 'center_y': cy + ch/2})
+    
+    valid_contours.sort(key=lambda c: c['center_y'])
+    
+    if len(valid_contours) < 2:
+        return (np.array([x + 5, y + 5]), np.array([x + int(w * 0.40), y + int(h * 0.35)]),
+                np.array([x + 5, y + int(h * 0.35)]), np.array([x + int(w * 0.40), y + int(h * 0.65)]))
+    
+    # Group contours that are close together vertically (for "10" rank which has 2 digits)
+    grouped_contours = []
+    current_group = [valid_contours[0]]
+    
+    for i in range(1, len(valid_contours)):
+        prev_y = current_group[-1]['center_y']
+        curr_y = valid_contours[i]['center_y']
+        
+        # If contours are within 20 pixels vertically, they're part of same symbol (e.g., "10")
+        if abs(curr_y - prev_y) < 20:
+            current_group.append(valid_contours[i])
+        else:
+            grouped_contours.append(current_group)
+            current_group = [valid_contours[i]]
+    
+    grouped_contours.append(current_group)
+    
+    # If we still don't have at least 2 groups, fallback
+    if len(grouped_contours) < 2:
+        return (np.array([x + 5, y + 5]), np.array([x + int(w * 0.40), y + int(h * 0.35)]),
+                np.array([x + 5, y + int(h * 0.35)]), np.array([x + int(w * 0.40), y + int(h * 0.65)]))
+    
+    # Merge each group into a single bounding box
+    def merge_group(group):
+        min_x = min(c['x'] for c in group)
+        min_y = min(c['y'] for c in group)
+        max_x = max(c['x'] + c['w'] for c in group)
+        max_y = max(c['y'] + c['h'] for c in group)
+        return {'x': min_x, 'y': min_y, 'w': max_x - min_x, 'h': max_y - min_y}
+    
+    rank_c = merge_group(grouped_contours[0])
+    suit_c = merge_group(grouped_contours[1])
+    
+    padding = 3
+    
+    rank_start = np.array([x + max(0, rank_c['x'] - padding), y + max(0, rank_c['y'] - padding)])
+    rank_end = np.array([x + min(w, rank_c['x'] + rank_c['w'] + padding), y + min(h, rank_c['y'] + rank_c['h'] + padding)])
+    suit_start = np.array([x + max(0, suit_c['x'] - padding), y + max(0, suit_c['y'] - padding)])
+    suit_end = np.array([x + min(w, suit_c['x'] + suit_c['w'] + padding), y + min(h, suit_c['y'] + suit_c['h'] + padding)])
+    
+    return rank_start, rank_end, suit_start, suit_end
+
+def match_template_straight(src_gray, start_pos, end_pos, template):
+    """Match template for straight community cards"""
+    x1, y1 = start_pos
+    x2, y2 = end_pos
+    roi = src_gray[y1:y2, x1:x2]
+    w, h = x2 - x1, y2 - y1
+    
+    if w <= 0 or h <= 0:
+        return -1.0
+    
+    _, roi_thresh = cv2.threshold(roi, 150, 255, cv2.THRESH_BINARY_INV)
+    best_score = -1.0
+    
+    for scale in [0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3]:
+        template_h, template_w = template.shape
+        new_h = int(h * scale)
+        new_w = int((template_w / template_h) * new_h)
+        
+        if new_w > w or new_h > h or new_w < 5 or new_h < 5:
+            continue
+        
+        try:
+            resized_template = cv2.resize(template, (new_w, new_h))
+            _, template_thresh = cv2.threshold(resized_template, 150, 255, cv2.THRESH_BINARY_INV)
+            
+            res1 = cv2.matchTemplate(roi, resized_template, cv2.TM_CCOEFF_NORMED)
+            res2 = cv2.matchTemplate(roi_thresh, template_thresh, cv2.TM_CCOEFF_NORMED)
+            
+            _, max_val1, _, _ = cv2.minMaxLoc(res1)
+            _, max_val2, _, _ = cv2.minMaxLoc(res2)
+            
+            if max(max_val1, max_val2) > best_score:
+                best_score = max(max_val1, max_val2)
+        except:
+            continue
+    
+    return best_score
+
+def match_straight_roi(roi, roi_thresh, variants):
+    """Best score of pre-thresholded template variants against a straight ROI and its threshold"""
+    best_score = -1.0
+    for resized_template, template_thresh in variants:
+        res1 = cv2.matchTemplate(roi, resized_template, cv2.TM_CCOEFF_NORMED)
+        res2 = cv2.matchTemplate(roi_thresh, template_thresh, cv2.TM_CCOEFF_NORMED)
+
+        _, max_val1, _, _ = cv2.minMaxLoc(res1)
+        _, max_val2, _, _ = cv2.minMaxLoc(res2)
+
+        if max(max_val1, max_val2) > best_score:
+            best_score = max(max_val1, max_val2)
+    return best_score
+
+def detect_community_cards(img_gray, recognizer, origin=(0, 0), pool=None):
+    """
+    Detect all community cards as card indices (see cards), `origin` is the
+    monitor position of img_gray's top-left pixel. With a `pool` every
+    card's rank and suit slots are classified concurrently.
+    """
+    origin = np.asarray(origin)
+    card_boxes = detect_card_rectangles(img_gray, COMM_CARD_START_POSITION - origin, COMM_CARD_END_POSITION - origin)
+    classify = recognizer.classify_straight
+
+    jobs = []
+    for card_box in card_boxes:
+        rank_start, rank_end, suit_start, suit_end = extract_rank_and_suit_regions(card_box, img_gray)
+        jobs.append((classify, img_gray, rank_start, rank_end, 'comm_ranks'))
+        jobs.append((classify, img_gray, suit_start, suit_end, 'comm_suits'))
+
+    slots = run_slot_jobs(jobs, pool)
+    results = []
+
+    for (best_rank, _), (best_suit, _) in zip(slots[0::2], slots[1::2]):
+        card = card_from_names(best_rank, best_suit) if best_rank and best_suit else None
+        results.append(card)
+
+    return [c for c in results if c is not None]
@@ -0,0 +1,33 @@
+# ============================================================================
+# CARD ENCODING
+# ============================================================================
+
+# Cards are ints 0..51 with the rank and suit as bitfields: rank << 2 | suit,
+# rank 0 = deuce .. 12 = ace, suit 0..3 = clubs, diamonds, hearts, spades.
+# Detectors emit them, the engine, equity code and caches use them as is;
+# strings only appear in logs and on the overlay.
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+# Rank of every template name the detectors use ('10' for ten)
+RANK_INDEX = {**{rank: i for i, rank in enumerate(RANKS)}, '10': RANKS.index('T')}
+
+def card_from_names(rank, suit):
+    """Card index of a detected rank template name ('10', 'K') and suit template name ('Club', 'Heart')"""
+    return RANK_INDEX[rank] << 2 | SUITS.index(suit[0].lower())
+
+def card_from_string(card):
+    """Card index of 'KD', '10H' (detector format) or 'Kd', 'Th' (treys format)"""
+    return RANK_INDEX[card[:-1].upper()] << 2 | SUITS.index(card[-1].lower())
+
+def card_from_treys(card):
+    """Card index of a treys Card int (rank in bits 8-11, one-hot suit in bits 12-15)"""
+    return ((card >> 8) & 0xF) * 4 + 3 - (((card >> 12) & 0xF).bit_length() - 1)
+
+def card_to_string(card):
+    """Treys-style string ('Th', 'As') of a card index"""
+    return RANKS[card >> 2] + SUITS[card & 3]
+
+def cards_to_string(cards):
+    """Space-separated strings of card indices ('As Kd'), 'None' for no cards"""
+    return ' '.join(card_to_string(card) for card in cards) if cards else 'None'
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SAMPLE_INTERVAL = 2.0  # Sample once per second
+
+
+# ============================================================================
+# REGION DEFINITIONS
+# ============================================================================
+
+# Self card positions (tilted cards)
+SELF_CARD1_RANK_START = np.array([1045, 758])
+SELF_CARD1_RANK_END = np.array([1098, 805])
+SELF_CARD1_SUIT_START = np.array([1065, 810])
+SELF_CARD1_SUIT_END = np.array([1105, 854])
+
+SELF_CARD2_RANK_START = np.array([1132, 735])
+SELF_CARD2_RANK_END = np.array([1200, 790])
+SELF_CARD2_SUIT_START = np.array([1126, 789])
+SELF_CARD2_SUIT_END = np.array([1169, 836])
+
+# Community card region (straight cards)
+COMM_CARD_START_POSITION = np.array([737, 433])
+COMM_CARD_END_POSITION = np.array([1253, 560])
+
+# Determine turn
+PALO_POS_START = np.array([752, 929])
+PALO_POS_END   = np.array([1742, 1014])
+
+# Actions
+FOLD = np.array([913,970])
+CHECK = np.array([1257,970])
+RAISE = np.array([1580,970])
+
+# Capture
+CAPTURE_MARGIN = 40  # Extra pixels around the regions so overlay labels fit
+CAPTURE_MONITOR = 2  # mss monitor index of the table
+CLICK_MONITOR = 1    # screeninfo monitor index the action coordinates are relative to
+
+# Multi-table (see multitable): every table uses the layout above, shifted by
+# its offset on its capture monitor and by its click offset on its click monitor
+TABLES = [
+    {'name': 'table1', 'monitor': CAPTURE_MONITOR, 'offset': (0, 0),
+     'click_monitor': CLICK_MONITOR, 'click_offset': (0, 0)},
+]
+ACTION_LATENCY_TARGET = 1.0  # Seconds from a turn being confirmed to its move starting
+
+# Turn detection
+TURN_THRESHOLD = 0.55
+TURN_WATCHER = True      # Probe the indicator at high frequency instead of polling full frames (see turn_watcher)
+PROBE_INTERVAL = 0.02    # Seconds between turn probes
+PROBE_STEP = (4, 8)      # Sampled pixel grid (rows, cols) of the probe
+PROBE_THRESHOLD = 0.3    # Probe correlation that triggers the confirming template match
+
+# Stage timing (see timing.StageTimer)
+TIMING_ENABLED = False
+TIMING_LOG = 'timings.jsonl'
+TIMING_FLUSH_INTERVAL = 10.0  # Seconds between JSONL/overlay summaries
+
+# Run capture / detection / engine on separate threads (see staged.StagedLoop)
+PIPELINED = True
+FRAME_INTERVAL = 0.05  # Seconds between captures in pipelined mode
+
+# Card detection
+RECOGNIZER = 'fft'  # 'template' (TemplateBank), 'fft' (FFTClassifier) or 'glyph' (GlyphIndex)
+DETECTION_WORKERS = min(4, os.cpu_count() or 1)  # Threads classifying rank/suit slots in parallel (1 = serial)
+
+# Engine
+OPPONENTS = 1  # Opponents still in the hand, passed to the engine in game_state
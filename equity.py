@@ -0,0 +1,275 @@
+import time
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from hand_table import default_table
+from ranges import COMBOS, COMBO_INDEX, live_weights
+
+SIMULATIONS = 20000    # Runouts per equity estimate
+EQUITY_BUDGET = 0.05   # Seconds an equity call may take before sampling replaces enumeration
+BATCH = 2000           # Deals per adaptive Monte Carlo step
+MAX_SIMULATIONS = 100000  # Deals after which adaptive sampling stops regardless
+CONFIDENCE_Z = 2.576   # Normal quantile of the adaptive confidence interval (99%)
+
+_rng = np.random.default_rng()
+
+# ============================================================================
+# BATCHED MONTE CARLO
+# ============================================================================
+
+def remaining_deck(known):
+    """Card indices not in `known`"""
+    return np.setdiff1d(np.arange(52, dtype=np.int8), np.asarray(known, dtype=np.int8))
+
+def shuffle_prefix(decks, count, rng):
+    """
+    First `count` cards of every row of `decks` after a partial Fisher-Yates
+    shuffle run on all rows at once, one column per step.
+    """
+    simulations, size = decks.shape
+    rows = np.arange(simulations)
+    for i in range(count):
+        j = rng.integers(i, size, simulations)
+        drawn = decks[rows, j]
+        decks[rows, j] = decks[:, i]
+        decks[:, i] = drawn
+    return decks[:, :count]
+
+def deal(remaining, count, simulations, rng):
+    """`count` distinct cards from `remaining` for every simulation, as a simulations x count matrix"""
+    return shuffle_prefix(np.tile(remaining, (simulations, 1)), count, rng)
+
+def range_deals(hole, board, weights, simulations, rng):
+    """
+    (opponent holdings, runouts) of random deals where the opponent's two
+    cards are drawn from the live combos of `weights` in proportion to their
+    weight, and the runout from the deck left after them.
+    """
+    known = list(hole) + list(board)
+    live = live_weights(weights, known)
+    if live.sum() <= 0:
+        raise ValueError("Opponent range has no combos left with these cards")
+    holdings = COMBOS[rng.choice(len(COMBOS), simulations, p=live / live.sum())]
+
+    # Each row of the deck loses exactly the two cards of its holding
+    decks = np.tile(remaining_deck(known), (simulations, 1))
+    keep = (decks != holdings[:, :1]) & (decks != holdings[:, 1:])
+    runouts = shuffle_prefix(decks[keep].reshape(simulations, -1), 5 - len(board), rng)
+    return holdings, runouts
+
+def pot_shares(hole, board, simulations, rng, opponents=1, weights=None):
+    """
+    Share of the pot `hole` wins in each of `simulations` random deals on
+    `board` against `opponents` hands: 1 for a win, 1/(k+1) for a pot tied
+    with k opponents, else 0. Every runout and opponent hand is drawn as one
+    integer matrix and all hands are evaluated in a single batch against the
+    precomputed rank table.
+
+    weights: optional opponent range (1326 combo weights, see ranges);
+    opponents are random hands without it, and there must be one with it
+    """
+    cards_needed = 5 - len(board)
+    if weights is None:
+        drawn = deal(remaining_deck(list(hole) + list(board)), cards_needed + 2 * opponents, simulations, rng)
+        runouts = drawn[:, :cards_needed]
+        holdings = [drawn[:, cards_needed + 2 * i:cards_needed + 2 * i + 2] for i in range(opponents)]
+    elif opponents == 1:
+        holding, runouts = range_deals(hole, board, weights, simulations, rng)
+        holdings = [holding]
+    else:
+        raise ValueError("An opponent range is only supported heads-up")
+
+    boards = np.hstack([np.broadcast_to(np.asarray(board, dtype=np.int8), (simulations, len(board))), runouts])
+    ours = np.hstack([np.broadcast_to(np.asarray(hole, dtype=np.int8), (simulations, 2)), boards])
+    theirs = [np.hstack([holding, boards]) for holding in holdings]
+
+    ranks = default_table().evaluate(np.vstack([ours] + theirs)).reshape(opponents + 1, simulations)
+    our_rank, best_opponent = ranks[0], ranks[1:].min(axis=0)
+
+    shares = (our_rank < best_opponent).astype(np.float64)
+    tied = our_rank == best_opponent
+    shares[tied] = 1.0 / (1 + np.count_nonzero(ranks[1:, tied] == our_rank[tied], axis=0))
+    return shares
+
+def monte_carlo_equity(hole, board, simulations=SIMULATIONS, rng=None, opponents=1, weights=None):
+    """
+    Equity of `hole` on `board` against `opponents` random hands or one
+    weighted range, like OwnEngine.calculate_equity but batched (see
+    pot_shares).
+
+    hole, board: card indices (see cards)
+    """
+    rng = rng if rng is not None else _rng
+    return float(pot_shares(hole, board, simulations, rng, opponents, weights).mean())
+
+# ============================================================================
+# EXACT ENUMERATION
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def combination_indices(n, k):
+    """Every k-subset of range(n) as a C(n, k) x k index matrix"""
+    return np.array(list(combinations(range(n), k)), dtype=np.intp).reshape(comb(n, k), k)
+
+@lru_cache(maxsize=None)
+def enumeration(n, cards_needed):
+    """
+    Positions into an n-card remaining deck of every runout and every
+    opponent holding, plus the (runout, holding) row pairs sharing no card.
+    Depends only on n and cards_needed, so it is built once per street.
+    """
+    runouts = combination_indices(n, cards_needed)
+    holdings = combination_indices(n, 2)
+    overlap = (runouts[:, None, :, None] == holdings[None, :, None, :]).any(axis=(2, 3))
+    runout_rows, holding_rows = np.nonzero(~overlap)
+    return runouts, holdings, runout_rows, holding_rows
+
+def exact_combinations(board):
+    """Number of (runout, opponent holding) pairs exact enumeration evaluates"""
+    n = 50 - len(board)
+    cards_needed = 5 - len(board)
+    return comb(n, cards_needed) * comb(n - cards_needed, 2)
+
+@lru_cache(maxsize=None)
+def exact_hands(board_size):
+    """
+    Every 7-card hand exact enumeration evaluates on a board of
+    `board_size` cards, as positions into the spot's cards laid out as
+    hole + board + remaining deck: ours on each runout and the opponent's
+    for each (runout, holding) pair of enumeration(). A spot's hands are
+    then one gather from its 52 cards. Positions are int8, so the flop's
+    million opponent hands take 7 MB.
+    """
+    start = 2 + board_size
+    runouts, holdings, runout_rows, holding_rows = enumeration(50 - board_size, 5 - board_size)
+    ours = np.hstack([np.broadcast_to(np.arange(start), (len(runouts), start)), start + runouts])
+    theirs = np.hstack([start + holdings[holding_rows],
+                        np.broadcast_to(np.arange(2, start), (len(holding_rows), board_size)),
+                        start + runouts[runout_rows]])
+    return ours.astype(np.int8), theirs.astype(np.int8)
+
+def exact_equity(hole, board, weights=None):
+    """
+    Exact equity of `hole` on `board` against one random hand, or one hand
+    from the weighted range `weights` (1326 combo weights, see ranges):
+    every remaining runout against every opponent holding that does not
+    share a card with it. Our hand is evaluated once per runout, the
+    opponent holdings in one batch; holdings outside the range are skipped.
+
+    hole, board: card indices (see cards)
+    """
+    remaining = remaining_deck(list(hole) + list(board))
+    runouts, holdings, runout_rows, holding_rows = enumeration(len(remaining), 5 - len(board))
+    our_hands, their_hands = exact_hands(len(board))
+    cards = np.concatenate([np.asarray(hole, dtype=np.int8), np.asarray(board, dtype=np.int8), remaining])
+    if weights is not None:
+        held = remaining[holdings]
+        pair_weights = weights[COMBO_INDEX[held[:, 0], held[:, 1]]][holding_rows]
+        in_range = pair_weights > 0
+        runout_rows, their_hands, pair_weights = runout_rows[in_range], their_hands[in_range], pair_weights[in_range]
+        if not len(pair_weights):
+            raise ValueError("Opponent range has no combos left with these cards")
+
+    ours = default_table().evaluate(np.take(cards, our_hands))
+    theirs = default_table().evaluate(np.take(cards, their_hands))
+
+    our_rank = ours[runout_rows]
+    if weights is not None:
+        shares = (our_rank < theirs) + 0.5 * (our_rank == theirs)
+        return float(shares @ pair_weights / pair_weights.sum())
+    wins = np.count_nonzero(our_rank < theirs)
+    ties = np.count_nonzero(our_rank == theirs)
+    return float(wins + ties * 0.5) / len(theirs)
+
+# ============================================================================
+# ADAPTIVE MONTE CARLO
+# ============================================================================
+
+def adaptive_equity(hole, board, thresholds=(), deadline_ms=None, opponents=1, rng=None,
+                    batch=BATCH, max_simulations=MAX_SIMULATIONS, z=CONFIDENCE_Z, weights=None):
+    """
+    Monte Carlo equity sampled in batches until it is precise enough to decide.
+
+    After each batch the confidence interval mean +- z * standard error is
+    checked; sampling stops once no decision threshold lies inside it, when
+    `deadline_ms` has passed, or after `max_simulations` deals. Without
+    thresholds it runs to the deadline or max_simulations. Clear spots stop
+    after a batch or two, spots near a threshold get the full budget.
+
+    Returns:
+        (equity, error): the estimate and its confidence half-width
+    """
+    rng = rng if rng is not None else _rng
+    deadline = time.perf_counter() + deadline_ms / 1000 if deadline_ms is not None else None
+    total = total_squares = 0.0
+    simulations = 0
+    while True:
+        shares = pot_shares(hole, board, batch, rng, opponents, weights)
+        total += shares.sum()
+        total_squares += shares @ shares
+        simulations += batch
+
+        mean = total / simulations
+        variance = max(total_squares / simulations - mean * mean, 0.0)
+        error = z * np.sqrt(variance / simulations)
+        if thresholds and not any(mean - error < threshold < mean + error for threshold in thresholds):
+            break
+        if simulations >= max_simulations or (deadline is not None and time.perf_counter() >= deadline):
+            break
+    return float(mean), float(error)
+
+# ============================================================================
+# AUTOMATIC MODE
+# ============================================================================
+
+# Running estimate of seconds per evaluated hand, refined after every call
+_seconds_per_hand = 2e-7
+
+def choose_method(board, budget=EQUITY_BUDGET, opponents=1, weights=None):
+    """
+    'exact' when enumerating every combination is expected to fit the
+    budget, else 'sampled'. Only heads-up spots are enumerated: each extra
+    opponent multiplies the combinations by ~C(43, 2). A range only
+    enumerates its own combos, so narrow ones fit on the flop too.
+    """
+    if opponents != 1:
+        return 'sampled'
+    hands = exact_combinations(board)
+    if weights is not None:
+        hands *= np.count_nonzero(weights) / len(weights)
+    return 'exact' if hands * _seconds_per_hand <= budget else 'sampled'
+
+def auto_equity(hole, board, budget=EQUITY_BUDGET, opponents=1, thresholds=(), weights=None, rng=None):
+    """
+    Equity of `hole` on `board` against `opponents` random hands, or one
+    hand from the range `weights`: exact enumeration when it fits the time
+    budget (heads-up on the turn and river), otherwise adaptive Monte Carlo
+    that stops once the estimate is clear of `thresholds` or the budget is
+    spent (a fixed SIMULATIONS deals without thresholds). The cost per hand
+    behind the choice is measured from the calls made so far. `rng` draws
+    the samples (the module generator by default).
+
+    Returns:
+        (equity, error, method): error is the confidence half-width, 0 when
+        exact; method is 'exact', 'sampled', or 'truncated' when the budget
+        ran out before the interval cleared every threshold
+    """
+    global _seconds_per_hand
+    method = choose_method(board, budget, opponents, weights)
+    start = time.perf_counter()
+    if method == 'exact':
+        equity, error = exact_equity(hole, board, weights), 0.0
+        if weights is None:
+            hands = exact_combinations(board)
+            _seconds_per_hand = 0.8 * _seconds_per_hand + 0.2 * (time.perf_counter() - start) / hands
+    else:
+        equity, error = adaptive_equity(hole, board, thresholds, budget * 1000, opponents, rng,
+                                        max_simulations=MAX_SIMULATIONS if thresholds else SIMULATIONS,
+                                        weights=weights)
+        cleared = thresholds and not any(equity - error < threshold < equity + error for threshold in thresholds)
+        if not cleared and time.perf_counter() - start >= budget:
+            method = 'truncated'
+    return equity, error, method
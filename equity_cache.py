@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+
+# ============================================================================
+# CANONICAL SPOTS
+# ============================================================================
+
+STREETS = {0: 'preflop', 3: 'flop', 4: 'turn', 5: 'river'}
+
+def canonical_key(hole, board, opponents=1):
+    """
+    Key of a (hole, board, opponents) spot that is equal for every spot
+    with the same equity by suit symmetry.
+
+    Each suit is reduced to the rank masks of our cards and the board cards
+    in it, and the four (hole mask, board mask) pairs are sorted, which
+    drops both the suit labels and the card order. AhKh on 2c7d9s and AsKs
+    on 2h7c9d give the same key.
+
+    hole, board: card indices (see cards)
+    """
+    suits = [[0, 0], [0, 0], [0, 0], [0, 0]]
+    for card in hole:
+        suits[card & 3][0] |= 1 << (card >> 2)
+    for card in board:
+        suits[card & 3][1] |= 1 << (card >> 2)
+    return (opponents, tuple(sorted(map(tuple, suits), reverse=True)))
+
+# ============================================================================
+# EQUITY CACHE
+# ============================================================================
+
+class EquityCache:
+    """
+    Bounded LRU of equity results keyed by canonical spot.
+
+    Repeated decisions on the same spot (every sample while our turn lasts)
+    and suit-isomorphic spots across hands skip the equity calculation;
+    hits and misses are counted per street. Results against an opponent
+    range are keyed by its notation as well (notation ranges are suit
+    symmetric, so the canonical spot still applies), and every result by
+    the decision thresholds it was sampled against. Estimates a deadline
+    cut short (auto_equity method 'truncated') are returned but not kept,
+    so a later call with more time computes the spot again. Safe to share
+    between threads; compute() runs outside the lock.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    def lookup(self, hole, board, opponents, compute, range_key=None, thresholds=()):
+        """Cached result for this spot or any suit-isomorphic one, calling compute() on a miss"""
+        key = (canonical_key(hole, board, opponents), range_key, tuple(thresholds))
+        street = STREETS.get(len(board), len(board))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits[street] = self.hits.get(street, 0) + 1
+                return self._entries[key]
+            self.misses[street] = self.misses.get(street, 0) + 1
+
+        result = compute()
+        if result[2] == 'truncated':
+            return result
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """Hit/miss totals and per-street counters"""
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            total = hits + misses
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / total if total else 0.0,
+                'size': len(self._entries),
+                'streets': {street: (self.hits.get(street, 0), self.misses.get(street, 0))
+                            for street in sorted(set(self.hits) | set(self.misses), key=str)},
+            }
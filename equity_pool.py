@@ -0,0 +1,60 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from equity import pot_shares
+from hand_table import load_table, map_default_table, TABLE_PATH
+
+SHARD = 10000  # Deals per task; results depend on the shard size, not the worker count
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def _warm_worker(table_path):
+    """Map the parent's rank table once per worker process (pages are shared through the page cache)"""
+    map_default_table(table_path)
+
+def shard_total(hole, board, opponents, seed, shard, size):
+    """
+    Sum of pot shares over one shard of deals, drawn from the shard's own
+    random stream: child number `shard` of SeedSequence(seed).
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard,)))
+    return float(pot_shares(hole, board, size, rng, opponents).sum())
+
+# ============================================================================
+# EQUITY POOL
+# ============================================================================
+
+class EquityPool:
+    """
+    Monte Carlo equity sharded across worker processes, for deep
+    simulations and offline analysis.
+
+    Deals are split into fixed SHARD-sized tasks, each with its own seeded
+    stream, and shard totals are summed in shard order, so a given seed
+    gives the same equity for any number of workers. A task carries only
+    the spot's few card indices: the deck is derived in the worker. The
+    rank table is loaded (or built) once here, before any worker starts;
+    workers only memory-map that file, so its pages are shared through the
+    page cache whether workers are forked or spawned (Windows).
+    """
+
+    def __init__(self, workers=None, shard=SHARD, table_path=TABLE_PATH, mp_context=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shard = shard
+        load_table(table_path)
+        self.pool = ProcessPoolExecutor(self.workers, mp_context, initializer=_warm_worker, initargs=(table_path,))
+
+    def close(self):
+        self.pool.shutdown()
+
+    def equity(self, hole, board, simulations, seed=0, opponents=1):
+        """Equity of `hole` on `board` against `opponents` random hands over `simulations` deals"""
+        hole, board = [int(card) for card in hole], [int(card) for card in board]
+        sizes = [min(self.shard, simulations - start) for start in range(0, simulations, self.shard)]
+        futures = [self.pool.submit(shard_total, hole, board, opponents, seed, shard, size)
+                   for shard, size in enumerate(sizes)]
+        return sum(future.result() for future in futures) / simulations
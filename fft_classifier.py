@@ -0,0 +1,174 @@
+import numpy as np
+import cv2
+
+from roi_cache import GeometryCache
+
+# TemplateStacks kept (~1 MB each); a frame needs at most 4 tilted + 20 straight
+BATCH_CACHE_SIZE = 48
+
+# ============================================================================
+# BATCHED FFT CROSS-CORRELATION
+# ============================================================================
+
+class TemplateStack:
+    """Every candidate template of one set stacked for one ROI geometry"""
+
+    def __init__(self, names, owners, templates, w, h):
+        self.names = names
+        self.owners = np.array(owners, dtype=np.intp)
+        k = len(templates)
+
+        sizes = [t.shape for t in templates]
+        self.n = np.zeros(k, dtype=np.float64)
+
+        # Zero-mean templates, zero padded to a fast FFT size covering the ROI.
+        # Valid placements never wrap around, so the circular product is exact.
+        self.shape = (cv2.getOptimalDFTSize(h), cv2.getOptimalDFTSize(w))
+        fh, fw = self.shape
+        padded = np.zeros((k, fh, fw), dtype=np.float64)
+        norms = np.zeros(k, dtype=np.float64)
+        for i, template in enumerate(templates):
+            t = template.astype(np.float64)
+            t -= t.mean()
+            padded[i, :t.shape[0], :t.shape[1]] = t
+            norms[i] = np.sqrt((t * t).sum())
+        self.templates_fft = np.conj(np.fft.rfft2(padded))
+
+        # Only placements where the template fits inside the ROI are scored.
+        # They are flattened across candidates into one ragged index list, with
+        # the integral image corners of every window precomputed.
+        cells, corners, starts = [], [], []
+        for i, (th, tw) in enumerate(sizes):
+            ys, xs = np.mgrid[0:h - th + 1, 0:w - tw + 1]
+            ys, xs = ys.ravel(), xs.ravel()
+            starts.append(sum(len(c) for c in cells))
+            cells.append(i * fh * fw + ys * fw + xs)
+            corners.append(np.stack([(ys + th) * (w + 1) + xs + tw,
+                                     ys * (w + 1) + xs + tw,
+                                     (ys + th) * (w + 1) + xs,
+                                     ys * (w + 1) + xs]))
+            self.n[i] = th * tw
+        self.cells = np.concatenate(cells)
+        self.corners = np.concatenate(corners, axis=1)
+        self.starts = np.array(starts, dtype=np.intp)
+        self.norms = np.repeat(norms, [len(c) for c in cells])
+        self.window_n = np.repeat(self.n, [len(c) for c in cells])
+
+    def scores(self, roi, roi_fft):
+        """TM_CCOEFF_NORMED maximum of every candidate against the ROI"""
+        num = np.fft.irfft2(roi_fft[None] * self.templates_fft, s=self.shape).ravel()[self.cells]
+
+        sums = window_sums(integral(roi), self.corners)
+        sq_sums = window_sums(integral(roi * roi), self.corners)
+        t = np.sqrt(np.maximum(sq_sums - sums * sums / self.window_n, 0)) * self.norms
+
+        # Same degenerate-window handling as OpenCV's matchTemplate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            res = np.where(np.abs(num) < t, num / t,
+                           np.where(np.abs(num) < t * 1.125, np.sign(num), 0.0))
+        return np.maximum.reduceat(res, self.starts)
+
+    def reduce(self, candidate_scores):
+        """Best candidate score per name, -1.0 for names without a fitting scale"""
+        per_name = np.full(len(self.names), -1.0)
+        np.maximum.at(per_name, self.owners, candidate_scores)
+        return per_name
+
+def integral(img):
+    """Flattened (h+1) x (w+1) integral image"""
+    ii = np.zeros((img.shape[0] + 1, img.shape[1] + 1), dtype=np.float64)
+    ii[1:, 1:] = img.cumsum(axis=0).cumsum(axis=1)
+    return ii.ravel()
+
+def window_sums(ii, corners):
+    """Sum of every window from its four integral image corners"""
+    c = ii[corners]
+    return c[0] - c[1] - c[2] + c[3]
+
+def stack(variants, pick=lambda v: v):
+    """Flatten {name: [variant]} into a name list, an owner index and a template list"""
+    names, owners, templates = list(variants), [], []
+    for i, name in enumerate(names):
+        for variant in variants[name]:
+            owners.append(i)
+            templates.append(pick(variant))
+    return names, owners, templates
+
+class FFTClassifier:
+    """
+    Recognizer that scores every candidate template of a set in one pass.
+
+    All (template, scale) variants from a TemplateBank are stacked into one
+    tensor per ROI geometry. Normalized cross-correlation against the ROI is
+    computed for the whole stack with one FFT product, and the window
+    normalization comes from integral images of the ROI. Drop-in replacement
+    for TemplateBank in detect_self_cards/detect_community_cards. Stacks of
+    the least recently used geometries are dropped past BATCH_CACHE_SIZE.
+    """
+
+    def __init__(self, bank, cache_size=BATCH_CACHE_SIZE):
+        self.bank = bank
+        self._batches = GeometryCache(cache_size)
+
+    def _batch(self, key, variants, w, h, pick=lambda v: v):
+        """Cached TemplateStack for a set and ROI geometry, None if no template fits"""
+        def build():
+            names, owners, templates = stack(variants, pick)
+            return TemplateStack(names, owners, templates, w, h) if templates else None
+        return self._batches.get(key, build)
+
+    def scores_tilted(self, img_gray, start_pos, end_pos, set_name):
+        """(names, score per name) of a template set in a tilted ROI"""
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        w, h = int(x2 - x1), int(y2 - y1)
+
+        if w <= 0 or h <= 0:
+            return [], np.empty(0)
+
+        variants = self.bank.tilted(set_name, w, h)
+        batch = self._batch(('tilted', set_name, w, h), variants, w, h)
+        if batch is None:
+            return list(variants), np.full(len(variants), -1.0)
+
+        roi_blur = cv2.GaussianBlur(img_gray[y1:y2, x1:x2], (3, 3), 0).astype(np.float64)
+        return batch.names, batch.reduce(batch.scores(roi_blur, np.fft.rfft2(roi_blur, s=batch.shape)))
+
+    def scores_straight(self, img_gray, start_pos, end_pos, set_name):
+        """(names, score per name) of a template set in a straight ROI, raw and thresholded"""
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        w, h = int(x2 - x1), int(y2 - y1)
+
+        if w <= 0 or h <= 0:
+            return [], np.empty(0)
+
+        variants = self.bank.straight(set_name, w, h)
+        raw = self._batch(('straight', set_name, w, h), variants, w, h, lambda v: v[0])
+        thresh = self._batch(('straight_thresh', set_name, w, h), variants, w, h, lambda v: v[1])
+        if raw is None:
+            return list(variants), np.full(len(variants), -1.0)
+
+        roi = img_gray[y1:y2, x1:x2]
+        _, roi_thresh = cv2.threshold(roi, 150, 255, cv2.THRESH_BINARY_INV)
+        roi = roi.astype(np.float64)
+        roi_thresh = roi_thresh.astype(np.float64)
+
+        candidate_scores = np.maximum(raw.scores(roi, np.fft.rfft2(roi, s=raw.shape)),
+                                      thresh.scores(roi_thresh, np.fft.rfft2(roi_thresh, s=thresh.shape)))
+        return raw.names, raw.reduce(candidate_scores)
+
+    def classify_tilted(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a tilted ROI"""
+        return best(*self.scores_tilted(img_gray, start_pos, end_pos, set_name))
+
+    def classify_straight(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a straight ROI"""
+        return best(*self.scores_straight(img_gray, start_pos, end_pos, set_name))
+
+def best(names, scores):
+    """First name with the highest score, like the sequential strict '>' loop"""
+    if len(scores) == 0 or scores.max() <= -1.0:
+        return None, -1.0
+    i = int(np.argmax(scores))
+    return names[i], float(scores[i])
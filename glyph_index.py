@@ -0,0 +1,115 @@
+import cv2
+import numpy as np
+
+# ============================================================================
+# GLYPH SIGNATURES
+# ============================================================================
+
+GLYPH_GRID = 16           # Glyphs are normalized to GLYPH_GRID x GLYPH_GRID bits
+GLYPH_THRESHOLD = 150     # Same ink threshold as the straight template matcher
+MIN_PART_AREA = 0.2       # Components smaller than this fraction of the largest are noise
+GLYPH_CROP = 3            # Pixels cut off each template edge for the clipped-glyph variants
+
+def glyph_box(ink):
+    """
+    Bounding box (x, y, w, h) of the glyph in a binary ink mask, or None.
+
+    The glyph is the largest connected component plus any other component at
+    least MIN_PART_AREA of its size, so both digits of "10" are kept while
+    card edges and specks cut off by the ROI are dropped.
+    """
+    n, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if n <= 1:
+        return None
+    areas = stats[1:, cv2.CC_STAT_AREA]
+    parts = stats[1:][areas >= areas.max() * MIN_PART_AREA]
+    x1 = parts[:, cv2.CC_STAT_LEFT].min()
+    y1 = parts[:, cv2.CC_STAT_TOP].min()
+    x2 = (parts[:, cv2.CC_STAT_LEFT] + parts[:, cv2.CC_STAT_WIDTH]).max()
+    y2 = (parts[:, cv2.CC_STAT_TOP] + parts[:, cv2.CC_STAT_HEIGHT]).max()
+    return x1, y1, x2 - x1, y2 - y1
+
+def glyph_signature(roi, grid=GLYPH_GRID):
+    """
+    Packed bit signature of the glyph in a grayscale ROI, or None if it has no ink.
+
+    Ink is thresholded, cropped to the glyph's bounding box and resized to a
+    grid x grid cell raster, so position and scale drop out. The raster is
+    packed into uint64 words for XOR/popcount comparison.
+    """
+    _, ink = cv2.threshold(roi, GLYPH_THRESHOLD, 255, cv2.THRESH_BINARY_INV)
+    box = glyph_box(ink)
+    if box is None:
+        return None
+    x, y, w, h = box
+    cells = cv2.resize(ink[y:y + h, x:x + w], (grid, grid), interpolation=cv2.INTER_AREA)
+    return np.packbits(cells >= 128).view(np.uint64)
+
+def crops(template, crop):
+    """The template, then with `crop` pixels cut off each edge in turn"""
+    h, w = template.shape
+    yield template
+    if crop:
+        yield template[crop:]
+        yield template[:h - crop]
+        yield template[:, crop:]
+        yield template[:, :w - crop]
+
+# ============================================================================
+# GLYPH INDEX
+# ============================================================================
+
+class GlyphIndex:
+    """
+    Recognizer that classifies glyphs by Hamming distance between bit signatures.
+
+    Every template of a TemplateBank is reduced to signatures up front: as
+    is, and with each edge cut by `crop` pixels like a slot window that clips
+    the glyph. A slot is classified by thresholding, cropping and downsampling
+    its ROI the same way and taking the nearest signature of its set, so no
+    scale search or correlation is needed. Scores are 1 - distance / bits in
+    [0, 1]. Drop-in replacement for TemplateBank in
+    detect_self_cards/detect_community_cards.
+    """
+
+    def __init__(self, bank, grid=GLYPH_GRID, crop=GLYPH_CROP):
+        self.grid = grid
+        self.index = {}
+        for set_name, templates in bank.templates.items():
+            names, signatures = [], []
+            for name, template in templates.items():
+                if template is None:
+                    continue
+                for variant in crops(template, crop):
+                    signature = glyph_signature(variant, grid)
+                    if signature is not None:
+                        names.append(name)
+                        signatures.append(signature)
+            if names:
+                self.index[set_name] = (names, np.stack(signatures))
+
+    def distances(self, roi, set_name):
+        """(names, Hamming distance per signature) of a ROI against one set, None without ink"""
+        signature = glyph_signature(roi, self.grid)
+        if signature is None or set_name not in self.index:
+            return None
+        names, signatures = self.index[set_name]
+        return names, np.bitwise_count(np.bitwise_xor(signatures, signature)).sum(axis=1)
+
+    def classify(self, img_gray, start_pos, end_pos, set_name):
+        """Nearest (name, score) of a template set for the glyph in a ROI"""
+        x1, y1 = start_pos
+        x2, y2 = end_pos
+        if x2 - x1 <= 0 or y2 - y1 <= 0:
+            return None, -1.0
+
+        result = self.distances(img_gray[y1:y2, x1:x2], set_name)
+        if result is None:
+            return None, -1.0
+        names, distances = result
+        i = int(np.argmin(distances))
+        return names[i], 1.0 - float(distances[i]) / (self.grid * self.grid)
+
+    # Tilted and straight slots are normalized the same way
+    classify_tilted = classify
+    classify_straight = classify
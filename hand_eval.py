@@ -0,0 +1,136 @@
+import numpy as np
+
+# Hands are rows of card indices, rank << 2 | suit (see cards)
+
+# ============================================================================
+# RANK MASK TABLES
+# ============================================================================
+
+# Hand categories, strongest first, numbered like treys' rank classes
+ROYAL_FLUSH, STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH, STRAIGHT, THREE_OF_A_KIND, TWO_PAIR, PAIR, HIGH_CARD = range(10)
+CLASS_NAMES = {
+    ROYAL_FLUSH: 'Royal Flush', STRAIGHT_FLUSH: 'Straight Flush', FOUR_OF_A_KIND: 'Four of a Kind', FULL_HOUSE: 'Full House',
+    FLUSH: 'Flush', STRAIGHT: 'Straight', THREE_OF_A_KIND: 'Three of a Kind',
+    TWO_PAIR: 'Two Pair', PAIR: 'Pair', HIGH_CARD: 'High Card',
+}
+
+RANK_BITS = 1 << np.arange(13)
+
+def build_mask_tables():
+    """(top five ranks packed 4 bits each, straight high rank + 1, bit count) per 13-bit rank mask"""
+    masks = np.arange(1 << 13)
+    bits = (masks[:, None] >> np.arange(13)) & 1
+
+    top5 = np.zeros(len(masks), dtype=np.int64)
+    taken = np.zeros(len(masks), dtype=np.int64)
+    for rank in range(12, -1, -1):
+        use = (bits[:, rank] == 1) & (taken < 5)
+        top5[use] |= rank << (4 * (4 - taken[use]))
+        taken += use
+
+    straight = np.zeros(len(masks), dtype=np.int64)
+    for high in range(3, 13):
+        run = sum(1 << r for r in ([12, 0, 1, 2, 3] if high == 3 else range(high - 4, high + 1)))
+        straight[(masks & run) == run] = high + 1
+    return top5, straight, bits.sum(axis=1)
+
+TOP5, STRAIGHT_HIGH, POPCOUNT = build_mask_tables()
+
+def top(mask, n):
+    """Highest `n` ranks of rank masks, packed 4 bits each"""
+    return TOP5[mask] >> (4 * (5 - n))
+
+# ============================================================================
+# BATCH EVALUATION
+# ============================================================================
+
+def hand_keys(cards):
+    """
+    Strength key of the best five-card hand in each row of `cards` (N x 5..7).
+
+    Keys are category << 20 | kickers packed 4 bits each, and compare like the
+    hands themselves (higher is stronger). Everything is computed on rank
+    count masks and suit masks for the whole batch at once.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    n = len(cards)
+    ranks = cards >> 2
+    rows = np.arange(n)[:, None]
+
+    counts = np.bincount((ranks + 13 * rows).ravel(), minlength=13 * n).reshape(n, 13)
+    suit_masks = np.bincount(((cards & 3) + 4 * rows).ravel(), weights=(1 << ranks).ravel(),
+                             minlength=4 * n).reshape(n, 4).astype(np.int64)
+
+    present = (counts > 0) @ RANK_BITS
+    pairs = (counts == 2) @ RANK_BITS
+    trips = (counts == 3) @ RANK_BITS
+    quads = (counts == 4) @ RANK_BITS
+    flush = np.where(POPCOUNT[suit_masks] >= 5, suit_masks, 0).max(axis=1)
+
+    high_quad = top(quads, 1)
+    high_trip = top(trips, 1)
+    full_pair = top((trips & ~(1 << high_trip)) | pairs, 1)
+    pair1, pair2 = top(pairs, 1), top(pairs, 2) & 0xF
+    two_pair_kicker = top(present & ~(1 << pair1) & ~(1 << pair2), 1)
+
+    # Candidate key of every category, then the strongest one each hand makes
+    conditions = [
+        STRAIGHT_HIGH[flush] > 0,
+        quads > 0,
+        (trips > 0) & (POPCOUNT[(trips & ~(1 << high_trip)) | pairs] > 0),
+        flush > 0,
+        STRAIGHT_HIGH[present] > 0,
+        trips > 0,
+        POPCOUNT[pairs] >= 2,
+        pairs > 0,
+    ]
+    keys = [
+        STRAIGHT_HIGH[flush] - 1,
+        high_quad << 4 | top(present & ~(1 << high_quad), 1),
+        high_trip << 4 | full_pair,
+        TOP5[flush],
+        STRAIGHT_HIGH[present] - 1,
+        high_trip << 8 | top(present & ~(1 << high_trip), 2),
+        top(pairs, 2) << 4 | two_pair_kicker,
+        pair1 << 12 | top(present & ~(1 << pair1), 3),
+    ]
+    categories = [(HIGH_CARD - category) << 20 for category in range(STRAIGHT_FLUSH, HIGH_CARD)]
+    return np.select(conditions, [c | k for c, k in zip(categories, keys)], default=TOP5[present])
+
+def build_rank_table():
+    """
+    Sorted strength keys of all 7462 distinct five-card hands.
+
+    Every rank multiset is dealt once off-suit and every set of five distinct
+    ranks once suited; their keys, strongest first, are treys' rank order.
+    """
+    multisets = []
+    def extend(prefix, lowest):
+        if len(prefix) == 5:
+            multisets.append(prefix)
+            return
+        for rank in range(lowest, 13):
+            if prefix.count(rank) < 4:
+                extend(prefix + [rank], rank)
+    extend([], 0)
+
+    offsuit = np.array(multisets) * 4 + np.arange(5) % 4
+    suited = np.array([m for m in multisets if len(set(m)) == 5]) * 4
+    keys = np.unique(hand_keys(np.concatenate([offsuit, suited])))
+    return keys[::-1]
+
+RANK_KEYS = build_rank_table()
+_ASCENDING_KEYS = RANK_KEYS[::-1].copy()
+
+def evaluate(cards):
+    """
+    Rank of the best five-card hand in each row of `cards` (N x 5..7 card
+    indices), on treys' scale: 1 = royal flush .. 7462 = 7-high
+    """
+    keys = hand_keys(cards)
+    return len(RANK_KEYS) - np.searchsorted(_ASCENDING_KEYS, keys)
+
+def rank_class(rank):
+    """Hand category (ROYAL_FLUSH .. HIGH_CARD) of a treys-scale rank, like Evaluator.get_rank_class"""
+    classes = np.where(np.asarray(rank) == 1, ROYAL_FLUSH, HIGH_CARD - (RANK_KEYS[np.asarray(rank) - 1] >> 20))
+    return int(classes) if classes.ndim == 0 else classes
@@ -0,0 +1,172 @@
+import os
+
+import numpy as np
+
+from hand_eval import evaluate as evaluate_arithmetic, POPCOUNT
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_ranks.npy')
+
+# ============================================================================
+# ADDITIVE CARD KEYS
+# ============================================================================
+
+# Any seven ranks (at most four of each) have a distinct sum of these keys,
+# and any seven suits a distinct sum of SUIT_KEYS, so one gather-and-sum over
+# a hand's cards identifies both its rank multiset and its suit counts.
+RANK_KEYS = np.array([0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181], dtype=np.int64)
+SUIT_KEYS = np.array([0, 1, 8, 57], dtype=np.int64)
+SUIT_BITS = 9  # 7 * 57 < 1 << 9
+
+CARD_KEYS = (RANK_KEYS[np.arange(52) >> 2] << SUIT_BITS) | SUIT_KEYS[np.arange(52) & 3]
+FLUSH_SIZE = 1 << 13
+TABLE_SIZE = FLUSH_SIZE + 4 * RANK_KEYS[12] + 3 * RANK_KEYS[11] + 1  # Largest key sum: four aces, three kings
+
+def suit_counts_of(suit_sum):
+    """Suit counts behind every 7-card suit key sum, -1 rows for unused sums"""
+    counts = np.full((1 << SUIT_BITS, 4), -1, dtype=np.int64)
+    for c in range(8):
+        for d in range(8 - c):
+            for h in range(8 - c - d):
+                s = 7 - c - d - h
+                counts[SUIT_KEYS @ [c, d, h, s]] = [c, d, h, s]
+    return counts[suit_sum]
+
+# Suit holding five or more of the seven cards, -1 for none
+FLUSH_SUIT = np.where(suit_counts_of(np.arange(1 << SUIT_BITS)) >= 5, np.arange(4), -1).max(axis=1)
+
+# ============================================================================
+# TABLE GENERATION
+# ============================================================================
+
+def all_count_vectors(total):
+    """Every 13-rank count vector (at most four per rank) with `total` cards"""
+    vectors = []
+    def extend(prefix, left):
+        if len(prefix) == 12:
+            if left <= 4:
+                vectors.append(prefix + [left])
+            return
+        for d in range(min(4, left) + 1):
+            extend(prefix + [d], left - d)
+    extend([], total)
+    return np.array(vectors)
+
+def build_table():
+    """
+    Treys-scale rank of every 7-card hand, by flush mask or rank key sum.
+
+    Entries 0..8191 hold the best hand of each 13-bit mask of suited ranks
+    (0 where fewer than five); entry FLUSH_SIZE + sum holds the best
+    non-flush hand of the rank multiset with that RANK_KEYS sum. In seven
+    cards a flush rules out quads and full houses, so a flush hand never
+    needs the multiset entry.
+    """
+    vectors = all_count_vectors(7)
+    sums = vectors @ RANK_KEYS
+    table = np.zeros(FLUSH_SIZE + sums.max() + 1, dtype=np.int16)
+
+    masks = np.arange(FLUSH_SIZE)
+    for size in range(5, 8):
+        suited = masks[POPCOUNT[masks] == size]
+        cards = np.array([[rank * 4 for rank in range(13) if mask >> rank & 1] for mask in suited])
+        table[suited] = evaluate_arithmetic(cards)
+
+    # Off-suit deal: suits cycle over the hand, so no suit holds five cards
+    cards = np.array([np.repeat(np.arange(13), v) * 4 + np.arange(7) % 4 for v in vectors])
+    table[FLUSH_SIZE + sums] = evaluate_arithmetic(cards)
+    return table
+
+def save_table(table, path=TABLE_PATH):
+    """
+    Write atomically through a per-process temp file, so processes building
+    the table at once never read or leave behind a truncated file
+    """
+    temp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(temp, table)
+    try:
+        os.replace(temp, path)
+    except PermissionError:
+        # Windows: another process already has its finished table mapped
+        os.remove(temp)
+
+def open_table(path):
+    """Memory-mapped table at `path`, None when missing or not a complete table"""
+    try:
+        table = np.load(path, mmap_mode='r')
+    except (OSError, ValueError, EOFError):
+        return None
+    return table if table.shape == (TABLE_SIZE,) and table.dtype == np.int16 else None
+
+def load_table(path=TABLE_PATH):
+    """Memory-mapped rank table, generated and saved on first use or when the file is broken"""
+    table = open_table(path)
+    if table is None:
+        save_table(build_table(), path)
+        table = open_table(path)
+        if table is None:
+            raise ValueError(f"{path} is not a valid rank table")
+    return table
+
+# ============================================================================
+# EVALUATION
+# ============================================================================
+
+class HandRankTable:
+    """
+    7-card evaluator backed by the precomputed, memory-mapped rank table.
+
+    A batch of 7-card hands costs one key gather-and-sum plus one table
+    lookup; only the few flush hands also build their suited rank mask.
+    Ranks are on treys' 1..7462 scale (1 = royal flush). Hands of five or six
+    cards go to the arithmetic evaluator in hand_eval.
+    """
+
+    def __init__(self, table=None):
+        self.table = table if table is not None else load_table()
+
+    def evaluate(self, cards):
+        """Rank of the best five-card hand in each row of `cards` (N x 5..7 card indices)"""
+        cards = np.asarray(cards)
+        if cards.shape[1] != 7:
+            return evaluate_arithmetic(cards)
+
+        keys = CARD_KEYS[cards].sum(axis=1)
+        ranks = self.table[FLUSH_SIZE + (keys >> SUIT_BITS)].astype(np.int64)
+
+        suit = FLUSH_SUIT[keys & ((1 << SUIT_BITS) - 1)]
+        flushes = np.flatnonzero(suit >= 0)
+        if len(flushes):
+            hands = cards[flushes].astype(np.int64)
+            masks = (((hands & 3) == suit[flushes, None]) << (hands >> 2)).sum(axis=1)
+            ranks[flushes] = self.table[masks]
+        return ranks
+
+    def evaluate_hand(self, cards):
+        """Rank of a single hand of 5..7 card indices"""
+        return int(self.evaluate([cards])[0])
+
+_default = None
+
+def default_table():
+    """Process-wide HandRankTable, loaded on first use"""
+    global _default
+    if _default is None:
+        _default = HandRankTable()
+    return _default
+
+def map_default_table(path=TABLE_PATH):
+    """
+    Make the process-wide table the already built file at `path`, for pool
+    workers whose parent built it; raises instead of building
+    """
+    global _default
+    table = open_table(path)
+    if table is None:
+        raise ValueError(f"{path} is not a valid rank table")
+    _default = HandRankTable(table)
+    return _default
+
+if __name__ == "__main__":
+    # Regenerate the table: python hand_table.py
+    save_table(build_table())
+    print(f"Wrote {TABLE_PATH}")
@@ -0,0 +1,302 @@
+"""
+One process driving several tables.
+
+Every table has its own capture, turn watcher and click executor (from a
+TableConfig), while the template bank, recognizer, recognition cache and
+engine are shared through one Pipeline. A TableScheduler probes every
+table's turn indicator, decides the most urgent table first and clicks the
+moves one at a time, since there is only one mouse.
+
+Run from the repository root (tables come from config.TABLES):
+    python multitable.py
+"""
+import queue
+import threading
+import time
+
+import numpy as np
+
+from actions import ClickExecutor
+from capture import RegionCapture, CAPTURE_REGIONS
+from config import (
+    SAMPLE_INTERVAL, PROBE_INTERVAL,
+    CAPTURE_MONITOR, CAPTURE_MARGIN, CLICK_MONITOR, TABLES,
+    TIMING_ENABLED, TIMING_LOG, TIMING_FLUSH_INTERVAL,
+)
+from pipeline import Pipeline
+from timing import StageTimer
+from turn_watcher import TurnWatcher, TURN_REGIONS
+
+# ============================================================================
+# TABLE CONFIG
+# ============================================================================
+
+class TableConfig:
+    """
+    Where one table sits on screen.
+
+    Tables share the region and button layout in config: `offset` is the
+    layout's shift on capture monitor `monitor`, `click_offset` (default
+    `offset`) its shift on `click_monitor`. Detection always sees layout
+    coordinates, so one Pipeline serves every table.
+    """
+
+    def __init__(self, name, monitor=CAPTURE_MONITOR, offset=(0, 0), click_monitor=CLICK_MONITOR, click_offset=None):
+        self.name = name
+        self.monitor = monitor
+        self.offset = np.asarray(offset)
+        self.click_monitor = click_monitor
+        self.click_offset = np.asarray(click_offset if click_offset is not None else offset)
+
+    def capture(self, regions=CAPTURE_REGIONS, margin=CAPTURE_MARGIN, timer=None):
+        """RegionCapture of this table's detection regions"""
+        return RegionCapture(self.monitor, regions, margin, timer, offset=self.offset)
+
+    def watcher(self, palo_gray):
+        """TurnWatcher probing this table's turn indicator"""
+        return TurnWatcher(self.capture(TURN_REGIONS, 0), palo_gray)
+
+    def executor(self):
+        """ClickExecutor for this table's buttons"""
+        return ClickExecutor(self.click_monitor, self.click_offset)
+
+def load_tables(tables=TABLES):
+    """TableConfigs of config-style dicts"""
+    return [TableConfig(**table) for table in tables]
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class Table:
+    """
+    One table under a TableScheduler: its frame source, turn watcher (None
+    to poll full frames every `action_interval`), executor and scheduling
+    state. `latencies` holds the seconds from each turn being seen to its
+    move starting.
+    """
+
+    def __init__(self, name, source, executor, watcher=None):
+        self.name = name
+        self.source = source
+        self.executor = executor
+        self.watcher = watcher
+        self.latest_frame = None
+        self.last_state = {
+            'card1': None,
+            'card2': None,
+            'community_cards': [],
+            'recommendation': 'Waiting...',
+            'card_boxes': []
+        }
+
+        self.ready_at = None     # When its turn was seen, while waiting for a decision
+        self.confirmed = False   # The watcher's full indicator match confirmed the turn at ready_at
+        self.pending = False     # A move is queued or being clicked
+        self.next_poll = 0.0
+        self.decisions = 0
+        self.latencies = []
+
+    def close(self):
+        self.source.close()
+        if self.watcher is not None:
+            self.watcher.close()
+
+class TableScheduler:
+    """
+    Turn-priority scheduling of several tables on one Pipeline.
+
+    probe thread   polls every table's TurnWatcher once per `interval` and
+                   marks the tables whose turn was confirmed as ready
+    decide thread  grabs and decides one ready table at a time: confirmed
+                   turns before unconfirmed polls, then the longest waiting
+    click thread   runs the moves one after another, so clicks on different
+                   tables never interleave
+
+    A table is neither probed nor decided again while its move is queued or
+    being clicked. Detection skips the turn match only when the watcher's
+    full indicator match is at most one probe `interval` older than the
+    grabbed frame; a table that waited behind others is matched again.
+    Tables without a watcher are polled every `action_interval` and
+    turn-matched on the full frame, like integrated.main.
+    """
+
+    def __init__(self, tables, pipeline, action_interval=SAMPLE_INTERVAL, interval=PROBE_INTERVAL, on_decision=None):
+        self.tables = tables
+        self.pipeline = pipeline
+        self.action_interval = action_interval
+        self.interval = interval
+        self.on_decision = on_decision
+
+        self.moves = queue.Queue()
+        self.error = None
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for target in (self._probe_loop, self._decide_loop, self._click_loop):
+            thread = threading.Thread(target=self._guard, args=(target,), name=target.__name__, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.moves.put(None)
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def running(self):
+        return not self._stop.is_set()
+
+    def _guard(self, target):
+        try:
+            target()
+        except StopIteration:
+            pass  # Replay source ran out of frames
+        except Exception as e:
+            self.error = e
+        finally:
+            self._stop.set()
+            self.moves.put(None)
+            with self._cond:
+                self._cond.notify_all()
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            for table in self.tables:
+                with self._cond:
+                    if table.pending or table.ready_at is not None:
+                        continue
+                now = time.perf_counter()
+                if table.watcher is not None:
+                    ready, confirmed = table.watcher.poll(now), True
+                else:
+                    ready, confirmed = now >= table.next_poll, False
+                    if ready:
+                        table.next_poll = now + self.action_interval
+                if ready:
+                    with self._cond:
+                        table.ready_at = now
+                        table.confirmed = confirmed
+                        self._cond.notify_all()
+            time.sleep(self.interval)
+
+    def next_table(self):
+        """The ready table to decide first, None when none is"""
+        ready = [table for table in self.tables if table.ready_at is not None]
+        return min(ready, key=lambda table: (not table.confirmed, table.ready_at)) if ready else None
+
+    def _decide_loop(self):
+        timer = self.pipeline.timer
+        while not self._stop.is_set():
+            with self._cond:
+                self._cond.wait_for(lambda: self.next_table() is not None or self._stop.is_set(), 0.1)
+                table = self.next_table()
+            if table is None:
+                continue
+
+            img_bgr, img_gray = table.source.grab()
+            table.latest_frame = img_bgr
+            confirmed = table.confirmed and time.perf_counter() - table.ready_at <= self.interval
+            state = self.pipeline.detect(img_gray, table.source.origin, turn_confirmed=confirmed)
+            if state is not None:
+                state = self.pipeline.decide(state)
+                timer.record('turn_to_decision', time.perf_counter() - table.ready_at)
+                table.decisions += 1
+                for key in table.last_state:
+                    table.last_state[key] = state[key]
+                if self.on_decision is not None:
+                    self.on_decision(table, state)
+
+            with self._cond:
+                if state is not None:
+                    table.pending = True
+                    self.moves.put((table, state['recommendation'], table.ready_at))
+                table.ready_at = None
+
+    def _click_loop(self):
+        timer = self.pipeline.timer
+        while True:
+            move = self.moves.get()
+            if move is None or self._stop.is_set():
+                return
+            table, recommendation, ready_at = move
+            table.latencies.append(time.perf_counter() - ready_at)
+            with timer.stage('make_move'):
+                table.executor.make_move(recommendation)
+            with self._cond:
+                table.pending = False
+
+    def stats(self):
+        """Decisions and turn -> move latency percentiles (ms) per table"""
+        stats = {}
+        for table in self.tables:
+            latencies = np.array(table.latencies) * 1000
+            stats[table.name] = {
+                'decisions': table.decisions,
+                'moves': len(latencies),
+                **(dict(zip(['p50', 'p95', 'max'], [*np.percentile(latencies, [50, 95]), latencies.max()]))
+                   if len(latencies) else {}),
+            }
+        return stats
+
+# ============================================================================
+# MAIN LOOP
+# ============================================================================
+
+def main(configs=None):
+    """Drive every table in config.TABLES; one overlay window per table shows its last decided frame"""
+    import cv2
+    from integrated import draw_overlay, print_state
+
+    timer = StageTimer(enabled=TIMING_ENABLED, path=TIMING_LOG, flush_interval=TIMING_FLUSH_INTERVAL)
+    configs = configs if configs is not None else load_tables()
+
+    print("Loading templates...")
+    pipeline = Pipeline(timer=timer)
+    print("Templates loaded!\n")
+
+    tables = [Table(config.name, config.capture(timer=timer), config.executor(), config.watcher(pipeline.palo_gray))
+              for config in configs]
+
+    print("="*70)
+    print(f"Multi-table: {len(tables)} tables ({', '.join(table.name for table in tables)}), "
+          f"turn probes every {PROBE_INTERVAL}s")
+    print("Engine: OwnEngine.analyze_game_state(), clicks one table at a time")
+    print("Controls: 'q' = quit")
+    print("="*70 + "\n")
+
+    def on_decision(table, state):
+        print(f"\n[{table.name}]")
+        print_state(state, table.source, pipeline)
+
+    scheduler = TableScheduler(tables, pipeline, on_decision=on_decision).start()
+
+    while scheduler.running():
+        for table in tables:
+            if table.latest_frame is not None:
+                display = table.latest_frame.copy()
+                draw_overlay(display, table.last_state, table.source.origin)
+                cv2.imshow(f"Poker Bot - {table.name}", display)
+        if cv2.waitKey(30) == ord('q'):
+            break
+
+    scheduler.stop()
+    if scheduler.error is not None:
+        print(f"\nScheduler error: {scheduler.error}")
+    for name, stats in scheduler.stats().items():
+        latency = f", turn -> move p50 {stats['p50']:.0f} ms, p95 {stats['p95']:.0f} ms" if stats['moves'] else ''
+        print(f"{name}: {stats['decisions']} decisions{latency}")
+
+    for table in tables:
+        table.close()
+    pipeline.close()
+    cv2.destroyAllWindows()
+    print("\nPoker Bot stopped.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from OwnEngine import default_engine
+from assets import default_assets
+from config import (
+    COMM_CARD_START_POSITION, COMM_CARD_END_POSITION,
+    PALO_POS_START, PALO_POS_END,
+    TURN_THRESHOLD, DETECTION_WORKERS, RECOGNIZER, OPPONENTS,
+)
+from card_detection import TEMPLATE_ROOT, TemplateBank, detect_self_cards, detect_community_cards, detect_card_rectangles
+from fft_classifier import FFTClassifier
+from glyph_index import GlyphIndex
+from roi_cache import RecognitionCache, CachedRecognizer
+from timing import StageTimer
+
+# ============================================================================
+# TURN DETECTION
+# ============================================================================
+
+def load_turn_template(bundle=True, root=TEMPLATE_ROOT):
+    """Grayscale turn indicator template, loaded once at startup from the asset bundle or `root`/palo.png"""
+    if bundle:
+        return default_assets().turn_template
+
+    path = os.path.join(root, "palo.png")
+    palo = cv2.imread(path)
+
+    if palo is None:
+        raise Exception(f"{path} not found")
+
+    return cv2.cvtColor(palo, cv2.COLOR_BGR2GRAY)
+
+def match_turn_indicator(src_gray, template, origin=(0, 0)):
+    """Match template for tilted cards - single scale"""
+    x1, y1 = PALO_POS_START - origin
+    x2, y2 = PALO_POS_END - origin
+
+    roi = src_gray[y1:y2, x1:x2]
+    w, h = x2 - x1, y2 - y1   # ROI width, height
+    
+    if w <= 0 or h <= 0:
+        return -1.0
+
+    tpl_h, tpl_w = template.shape
+
+    scale_w = (w - 1) / tpl_w
+    scale_h = (h - 1) / tpl_h
+    scale = min(scale_w, scale_h)
+
+    if scale <= 0:
+        return -1.0
+
+    new_w = max(5, int(tpl_w * scale))
+    new_h = max(5, int(tpl_h * scale))
+
+    resized_template = cv2.resize(template, (new_w, new_h))
+
+    tpl_blur = cv2.GaussianBlur(resized_template, (3, 3), 0)
+    roi_blur = cv2.GaussianBlur(roi, (3, 3), 0)
+
+    res = cv2.matchTemplate(roi_blur, tpl_blur, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, _ = cv2.minMaxLoc(res)
+
+    return max_val
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+# Slot recognizers by config name, each built from the template bank
+RECOGNIZERS = {
+    'template': lambda bank: bank,
+    'fft': FFTClassifier,
+    'glyph': GlyphIndex,
+}
+
+class Pipeline:
+    """
+    Turn -> cards -> engine on one captured frame.
+
+    Owns everything that is built once at startup (template bank, recognizer,
+    recognition cache, turn template), so it can be driven by the live loop,
+    a replay benchmark or several tables alike. The bank and turn template
+    come from the compiled asset bundle unless given. Clicking is left to the
+    caller's executor. Every stage is reported to `timer`. With more than one
+    detection worker, card slots are classified on a persistent thread pool.
+    `recognizer` names the slot classifier in RECOGNIZERS. `opponents` is
+    passed to the engine in every game_state. `engine` maps a game_state to
+    a recommendation; by default the shared PokerEngine, warmed here.
+    """
+
+    def __init__(self, bank=None, engine=None, recognition_cache=None, timer=None,
+                 detection_workers=DETECTION_WORKERS, recognizer=RECOGNIZER, opponents=OPPONENTS, turn_template=None):
+        self.bank = bank if bank is not None else TemplateBank.load()
+        self.recognition_cache = recognition_cache if recognition_cache is not None else RecognitionCache()
+        self.recognizer = CachedRecognizer(RECOGNIZERS[recognizer](self.bank), self.recognition_cache)
+        self.palo_gray = turn_template if turn_template is not None else load_turn_template()
+        self.engine = engine if engine is not None else default_engine().analyze
+        self.opponents = opponents
+        self.timer = timer if timer is not None else StageTimer(enabled=False)
+        self.pool = ThreadPoolExecutor(detection_workers, thread_name_prefix='slot') if detection_workers > 1 else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def determine_turn(self, img_gray, origin):
+        """Turn indicator score on the cycle's capture, only re-matched when the indicator region changed"""
+        x1, y1 = PALO_POS_START - origin
+        x2, y2 = PALO_POS_END - origin
+        with self.timer.stage('determine_turn'):
+            return self.recognition_cache.lookup('PALO_POS', img_gray[y1:y2, x1:x2],
+                                                 lambda: match_turn_indicator(img_gray, self.palo_gray, origin))
+
+    def detect_cards(self, img_gray, origin):
+        """(card1, card2, community_cards, card_boxes) of the captured frame"""
+        with self.timer.stage('detect_self_cards'):
+            card1, card2 = detect_self_cards(img_gray, self.recognizer, origin, self.pool)
+
+        x1, y1 = COMM_CARD_START_POSITION - origin
+        x2, y2 = COMM_CARD_END_POSITION - origin
+        with self.timer.stage('detect_community_cards'):
+            community_cards, card_boxes = self.recognition_cache.lookup(
+                'COMM_CARD', img_gray[y1:y2, x1:x2], lambda: self._detect_community(img_gray, origin))
+        return card1, card2, community_cards, card_boxes
+
+    def _detect_community(self, img_gray, origin):
+        community_cards = detect_community_cards(img_gray, self.recognizer, origin, self.pool)
+        with self.timer.stage('detect_card_rectangles'):
+            card_boxes = detect_card_rectangles(img_gray, COMM_CARD_START_POSITION - origin, COMM_CARD_END_POSITION - origin)
+        return community_cards, card_boxes
+
+    def detect(self, img_gray, origin, turn_confirmed=False):
+        """
+        Turn and card detection on a frame, skipping the turn match when a
+        TurnWatcher already confirmed it
+
+        Returns:
+            dict with card1, card2, community_cards, card_boxes and
+            game_state, or None when it is not our turn
+        """
+        if not turn_confirmed and self.determine_turn(img_gray, origin) < TURN_THRESHOLD:
+            return None
+
+        card1, card2, community_cards, card_boxes = self.detect_cards(img_gray, origin)
+
+        # Prepare game state
+        game_state = {
+            'hole_cards': [card1, card2] if card1 is not None and card2 is not None else [],
+            'community_cards': community_cards,
+            'opponents': self.opponents,
+            'timestamp': time.strftime('%H:%M:%S')
+        }
+
+        return {
+            'card1': card1,
+            'card2': card2,
+            'community_cards': community_cards,
+            'card_boxes': card_boxes,
+            'game_state': game_state,
+        }
+
+    def decide(self, state):
+        """Add the engine's recommendation to a detected state"""
+        # Call your custom engine
+        try:
+            with self.timer.stage('analyze_game_state'):
+                recommendation = self.engine(state['game_state'])
+        except Exception as e:
+            recommendation = f"Engine Error: {str(e)}"
+
+        return dict(state, recommendation=recommendation)
+
+    def analyze(self, img_gray, origin):
+        """
+        Run the full pipeline on a frame
+
+        Returns:
+            dict with card1, card2, community_cards, card_boxes, game_state
+            and recommendation, or None when it is not our turn
+        """
+        state = self.detect(img_gray, origin)
+        return self.decide(state) if state is not None else None
@@ -0,0 +1,145 @@
+"""
+Preflop equity of the 169 starting-hand classes against 1..9 random opponents.
+
+Generate (parallel, resumable; rerun to continue after an interruption):
+    python preflop_table.py [--simulations N] [--workers N] [--seed S]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from equity import monte_carlo_equity
+from cards import RANKS
+
+PREFLOP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.npy')
+MAX_OPPONENTS = 9
+PREFLOP_SIMULATIONS = 100000  # Deals per (hand class, opponent count) cell
+CHUNK = 25000                 # Deals evaluated per batch while generating
+EQUITY_SCALE = 65534          # Equities are stored as uint16 fractions of this
+MISSING = 65535               # Cell not generated yet
+
+# ============================================================================
+# HAND CLASSES
+# ============================================================================
+
+# Classes index a 13 x 13 grid: row = higher rank, column = lower rank for
+# suited hands, the two swapped for offsuit hands, pairs on the diagonal.
+
+def hand_class(card1, card2):
+    """Class index 0..168 of two card indices"""
+    high, low = max(card1 >> 2, card2 >> 2), min(card1 >> 2, card2 >> 2)
+    return high * 13 + low if (card1 & 3) == (card2 & 3) else low * 13 + high
+
+def class_cards(index):
+    """Representative card indices of a class"""
+    row, column = divmod(index, 13)
+    if row >= column:
+        # Suited (row > column) or pair: pairs need two suits, suited ones share one
+        return [row * 4, column * 4 + (row == column)]
+    return [column * 4, row * 4 + 1]
+
+def class_name(index):
+    """'AKs', 'T9o', '77' style name of a class"""
+    row, column = divmod(index, 13)
+    if row == column:
+        return RANKS[row] * 2
+    return RANKS[max(row, column)] + RANKS[min(row, column)] + ('s' if row > column else 'o')
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def class_equities(index, simulations=PREFLOP_SIMULATIONS, seed=0):
+    """Equity of one class against 1..MAX_OPPONENTS opponents, seeded per class"""
+    rng = np.random.default_rng([seed, index])
+    hole = class_cards(index)
+    row = []
+    for opponents in range(1, MAX_OPPONENTS + 1):
+        chunks = [min(CHUNK, simulations - done) for done in range(0, simulations, CHUNK)]
+        total = sum(monte_carlo_equity(hole, [], n, rng, opponents) * n for n in chunks)
+        row.append(total / simulations)
+    return index, row
+
+def save_table(table, path):
+    """
+    Write atomically through a per-process temp file, like
+    hand_table.save_table, so an interrupted or concurrent run never leaves
+    a truncated file
+    """
+    temp = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(temp, table)
+    try:
+        os.replace(temp, path)
+    except PermissionError:
+        # Windows: a reader has the table open; the next finished class saves again
+        os.remove(temp)
+
+def generate(path=PREFLOP_PATH, simulations=PREFLOP_SIMULATIONS, workers=None, seed=0):
+    """
+    Fill every missing row of the table at `path` across a process pool,
+    saving after each finished class so a rerun resumes where it stopped.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if os.path.exists(path):
+        table = np.load(path)
+    else:
+        table = np.full((169, MAX_OPPONENTS), MISSING, dtype=np.uint16)
+    todo = [index for index in range(169) if (table[index] == MISSING).any()]
+    print(f"{169 - len(todo)}/169 classes done, generating {len(todo)} "
+          f"({simulations} deals per opponent count)")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(class_equities, index, simulations, seed) for index in todo]
+        for done, future in enumerate(as_completed(futures), 1):
+            index, row = future.result()
+            table[index] = np.round(np.array(row) * EQUITY_SCALE).astype(np.uint16)
+            save_table(table, path)
+            print(f"  {done}/{len(todo)} {class_name(index):<4} "
+                  f"heads-up {row[0]:.2%}  ({time.perf_counter() - start:.0f}s)")
+    return table
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class PreflopTable:
+    """Equity of every starting-hand class by opponent count, from the generated file"""
+
+    def __init__(self, path=PREFLOP_PATH):
+        table = np.load(path)
+        if (table == MISSING).any():
+            raise ValueError(f"{path} is incomplete, rerun: python preflop_table.py")
+        self.equities = table.astype(np.float64) / EQUITY_SCALE
+
+    def equity(self, card1, card2, opponents=1):
+        """Equity of two card indices against `opponents` random hands (clamped to 1..MAX_OPPONENTS)"""
+        opponents = min(max(opponents, 1), MAX_OPPONENTS)
+        return float(self.equities[hand_class(card1, card2), opponents - 1])
+
+_default = None
+
+def default_preflop_table():
+    """Process-wide PreflopTable, loaded on first use"""
+    global _default
+    if _default is None:
+        _default = PreflopTable()
+    return _default
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--simulations', type=int, default=PREFLOP_SIMULATIONS)
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: one per CPU)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--path', default=PREFLOP_PATH)
+    args = parser.parse_args(argv)
+    generate(args.path, args.simulations, args.workers, args.seed)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from cards import RANKS
+
+# ============================================================================
+# COMBOS
+# ============================================================================
+
+# All 1326 two-card holdings as card index pairs (lower index first)
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int8)
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.intp)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(len(COMBOS))
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(len(COMBOS))
+
+def class_combos(high, low, suited):
+    """Combo indices of a starting hand: suited True/False, or None for both"""
+    suit_pairs = [(a, b) for a in range(4) for b in range(4) if (high != low or a < b)]
+    if suited is not None:
+        suit_pairs = [(a, b) for a, b in suit_pairs if (a == b) == suited]
+    return [COMBO_INDEX[high * 4 + a, low * 4 + b] for a, b in suit_pairs]
+
+# ============================================================================
+# RANGE NOTATION
+# ============================================================================
+
+def parse_hand(text):
+    """(high rank, low rank, suited) of 'AKs', 'KTo', 'QQ' or 'AK' (suited None = both)"""
+    if len(text) not in (2, 3) or text[0] not in RANKS or text[1] not in RANKS:
+        raise ValueError(f"Bad hand in range: {text!r}")
+    first, second = RANKS.index(text[0]), RANKS.index(text[1])
+    suffix = text[2:]
+    if suffix not in ('', 's', 'o') or (first == second and suffix):
+        raise ValueError(f"Bad hand in range: {text!r}")
+    return max(first, second), min(first, second), {'s': True, 'o': False}.get(suffix)
+
+def expand_token(token):
+    """Starting hands (high, low, suited) of one range token: 'QQ', '22+', 'A2s+', 'KTo+', '55-88', 'A2s-A5s'"""
+    if '-' in token:
+        start, end = (parse_hand(part) for part in token.split('-'))
+        if start[2] != end[2] or (start[0] == start[1]) != (end[0] == end[1]) \
+                or (start[0] != start[1] and start[0] != end[0]):
+            raise ValueError(f"Bad range span: {token!r}")
+        if start[0] == start[1]:
+            low, high = sorted((start[0], end[0]))
+            return [(rank, rank, None) for rank in range(low, high + 1)]
+        low, high = sorted((start[1], end[1]))
+        return [(start[0], kicker, start[2]) for kicker in range(low, high + 1)]
+
+    if token.endswith('+'):
+        high, low, suited = parse_hand(token[:-1])
+        if high == low:
+            return [(rank, rank, None) for rank in range(high, 13)]
+        return [(high, kicker, suited) for kicker in range(low, high)]
+    return [parse_hand(token)]
+
+def parse_range(notation):
+    """
+    1326-combo weight vector of a range in standard notation.
+
+    Tokens are comma-separated: pairs ('QQ', '22+', '55-88'), suited or
+    offsuit hands ('AKs', 'KTo', 'A2s+', 'A2s-A5s') or both ('AK', 'KT+').
+    A token may end in ':weight' (default 1) to include it partially.
+    """
+    weights = np.zeros(len(COMBOS))
+    for token in notation.replace(' ', '').split(','):
+        if not token:
+            continue
+        token, _, weight = token.partition(':')
+        for high, low, suited in expand_token(token):
+            weights[class_combos(high, low, suited)] = float(weight) if weight else 1.0
+    return weights
+
+@lru_cache(maxsize=64)
+def range_weights(notation):
+    """Cached, read-only parse_range of a notation string"""
+    weights = parse_range(notation)
+    weights.flags.writeable = False
+    return weights
+
+def as_weights(hand_range):
+    """1326 weights of a range given as notation or a weight vector"""
+    if isinstance(hand_range, str):
+        return range_weights(hand_range)
+    weights = np.asarray(hand_range, dtype=np.float64)
+    if weights.shape != (len(COMBOS),):
+        raise ValueError(f"Range weights need {len(COMBOS)} entries, got {weights.shape}")
+    return weights
+
+def live_weights(weights, known):
+    """Weights with every combo holding one of the `known` cards removed"""
+    dead = np.zeros(52, dtype=bool)
+    dead[list(known)] = True
+    return np.where(dead[COMBOS].any(axis=1), 0.0, weights)
@@ -0,0 +1,138 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import cv2
+
+# ============================================================================
+# ROI FINGERPRINTS
+# ============================================================================
+
+FINGERPRINT_SIZE = 32   # ROIs are downsampled to at most this many pixels per side
+FINGERPRINT_SHIFT = 3   # and quantized to 256 >> 3 = 32 grey levels
+
+def fingerprint(roi):
+    """
+    Cheap content hash of an ROI.
+
+    The ROI is area-downsampled and quantized before hashing, so sub-level
+    noise does not count as a change. Nothing guarantees a different card
+    changes the hash: the cache assumes two different glyphs in the same
+    region never average to the same 32-level thumbnail. Glyphs differing
+    only in detail finer than the downsampling, or by less than one
+    quantization step, would collide and share a cached result.
+    """
+    h, w = roi.shape[:2]
+    if h > FINGERPRINT_SIZE or w > FINGERPRINT_SIZE:
+        roi = cv2.resize(roi, (min(w, FINGERPRINT_SIZE), min(h, FINGERPRINT_SIZE)),
+                         interpolation=cv2.INTER_AREA)
+    quantized = roi >> FINGERPRINT_SHIFT
+    return (h, w, hashlib.blake2b(quantized.tobytes(), digest_size=16).digest())
+
+# ============================================================================
+# RECOGNITION CACHE
+# ============================================================================
+
+class RecognitionCache:
+    """
+    Bounded LRU of recognition results keyed by (region, ROI fingerprint).
+
+    A region is only re-classified when its pixels change; hits and misses
+    are counted per region so skipped detection work can be reported.
+    Safe to share between detection threads; compute() runs outside the lock.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+
+    def lookup(self, region, roi, compute):
+        """Cached result for this region's ROI contents, calling compute() on a miss"""
+        key = (region, fingerprint(roi))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits[region] = self.hits.get(region, 0) + 1
+                return self._entries[key]
+            self.misses[region] = self.misses.get(region, 0) + 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """Hit/miss totals and per-region counters"""
+        with self._lock:
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            total = hits + misses
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / total if total else 0.0,
+                'size': len(self._entries),
+                'regions': {region: (self.hits.get(region, 0), self.misses.get(region, 0))
+                            for region in sorted(set(self.hits) | set(self.misses))},
+            }
+
+class CachedRecognizer:
+    """Recognizer wrapper that only classifies a slot when its ROI changed"""
+
+    def __init__(self, recognizer, cache):
+        self.recognizer = recognizer
+        self.cache = cache
+
+    def classify_tilted(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a tilted ROI"""
+        (x1, y1), (x2, y2) = start_pos, end_pos
+        return self.cache.lookup(set_name, img_gray[y1:y2, x1:x2],
+                                 lambda: self.recognizer.classify_tilted(img_gray, start_pos, end_pos, set_name))
+
+    def classify_straight(self, img_gray, start_pos, end_pos, set_name):
+        """Best (name, score) of a template set in a straight ROI"""
+        (x1, y1), (x2, y2) = start_pos, end_pos
+        return self.cache.lookup(set_name, img_gray[y1:y2, x1:x2],
+                                 lambda: self.recognizer.classify_straight(img_gray, start_pos, end_pos, set_name))
+
+# ============================================================================
+# GEOMETRY CACHE
+# ============================================================================
+
+class GeometryCache:
+    """
+    Bounded LRU of objects built per ROI geometry (template variants, FFT
+    stacks).
+
+    Community card ROIs come from contours, so their sizes drift from card to
+    card and frame to frame; without a bound one entry per size ever seen
+    would be kept for the whole session. Safe to share between detection
+    threads; build() runs outside the lock.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Cached object for `key`, calling build() on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,269 @@
+"""
+Headless self-play of the engine against baseline policies.
+
+Deals no-limit hands between the PokerEngine and a baseline policy in
+every other seat, across worker processes. Reports hands and engine
+decisions per second, engine time per street, and the engine's win rate
+against each baseline, to catch speed and strategy regressions offline.
+
+Deals are played in duplicate: each deck once with the engine in every
+seat, so the cards even out and the win rate's spread is mostly decisions
+rather than luck.
+
+Run from the repository root:
+    python selfplay.py [--hands N] [--seats N] [--baselines NAME ...] [--workers N] [--seed S]
+"""
+import contextlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from hand_eval import rank_class, PAIR, TWO_PAIR
+from hand_table import default_table
+from preflop_table import default_preflop_table
+from equity_cache import EquityCache, STREETS
+
+STACK = 200          # Chips every seat starts each hand with (100 big blinds)
+SMALL_BLIND, BIG_BLIND = 1, 2
+MAX_RAISES = 3       # Raises per street; further raises are calls
+SHARD = 100          # Deals per task; results depend on the shard size, not the worker count
+
+# ============================================================================
+# BASELINE POLICIES
+# ============================================================================
+
+# A policy maps a seat's game_state (the engine's keys plus pot, to_call and
+# stack in chips) and the hand's random generator to (action, bet_percentage),
+# like analyze_game_state
+
+def station_policy(state, rng):
+    """Calls everything, never raises"""
+    return ("CALL", 0.0)
+
+def random_policy(state, rng):
+    """Folds, calls or raises 10-50% of its stack uniformly at random"""
+    action = ("FOLD", "CALL", "RAISE")[rng.integers(3)]
+    return (action, float(rng.uniform(0.1, 0.5)) if action == "RAISE" else 0.0)
+
+def tight_policy(state, rng):
+    """
+    Fixed rules: preflop raises premium hands, calls good ones and folds the
+    rest (by table equity); postflop raises two pair or better, calls a pair
+    """
+    hole, board = state['hole_cards'], state['community_cards']
+    if not board:
+        strength = default_preflop_table().equity(*hole, state['opponents']) * (state['opponents'] + 1)
+        if strength >= 1.45:
+            return ("RAISE", 0.15)
+        return ("CALL", 0.0) if strength >= 1.2 else ("FOLD", 0.0)
+
+    hand_class = rank_class(default_table().evaluate_hand(list(hole) + list(board)))
+    if hand_class <= TWO_PAIR:
+        return ("RAISE", 0.3)
+    return ("CALL", 0.0) if hand_class == PAIR else ("FOLD", 0.0)
+
+def engine_policy(state, rng):
+    """The worker's PokerEngine (analyze_game_state)"""
+    return _engine.analyze(state)
+
+BASELINES = {
+    'station': station_policy,
+    'random': random_policy,
+    'tight': tight_policy,
+}
+
+# ============================================================================
+# TABLE
+# ============================================================================
+
+def play_hand(policies, button, deck, rng, timed=()):
+    """
+    Play one hand dealt from `deck` (a permutation of the 52 cards) and
+    return (chips won or lost per seat, [(board size, seconds)] of every
+    decision by the seats in `timed`).
+
+    Every seat starts with STACK behind; the two seats after the button post
+    the blinds (the button posts the small blind heads-up). Each street is
+    one betting round. A RAISE puts in its fraction of the seat's remaining
+    stack, at least a minimum raise; FOLD with nothing to call checks. Stacks
+    are equal, so there are never side pots.
+    """
+    seats = len(policies)
+    holes = [[int(card) for card in deck[2 * seat:2 * seat + 2]] for seat in range(seats)]
+    board = [int(card) for card in deck[2 * seats:2 * seats + 5]]
+
+    stacks = [STACK] * seats
+    committed = [0] * seats
+    active = [True] * seats
+    times = []
+
+    def put(seat, amount):
+        amount = min(amount, stacks[seat])
+        stacks[seat] -= amount
+        committed[seat] += amount
+        street_bets[seat] += amount
+
+    small = button if seats == 2 else (button + 1) % seats
+    big = (small + 1) % seats
+    for board_size in (0, 3, 4, 5):
+        street_bets = [0] * seats
+        if board_size == 0:
+            put(small, SMALL_BLIND)
+            put(big, BIG_BLIND)
+            first = (big + 1) % seats
+        else:
+            first = (button + 1) % seats
+
+        current, min_raise, raises = max(street_bets), BIG_BLIND, 0
+        order = [(first + i) % seats for i in range(seats)]
+        to_act = [seat for seat in order if active[seat] and stacks[seat] > 0]
+        while to_act and sum(active) > 1:
+            seat = to_act.pop(0)
+            to_call = current - street_bets[seat]
+            state = {
+                'hole_cards': holes[seat],
+                'community_cards': board[:board_size],
+                'opponents': sum(active) - 1,
+                'pot': sum(committed),
+                'to_call': to_call,
+                'stack': stacks[seat],
+            }
+            start = time.perf_counter()
+            action, size = policies[seat](state, rng)
+            if seat in timed:
+                times.append((board_size, time.perf_counter() - start))
+
+            if action == "FOLD" and to_call > 0:
+                active[seat] = False
+            elif action == "RAISE" and raises < MAX_RAISES and stacks[seat] > to_call:
+                put(seat, max(to_call + min_raise, round(size * stacks[seat])))
+                min_raise = max(min_raise, street_bets[seat] - current)
+                current = street_bets[seat]
+                raises += 1
+                following = order[order.index(seat) + 1:] + order[:order.index(seat)]
+                to_act = [other for other in following if active[other] and stacks[other] > 0]
+            else:
+                put(seat, to_call)
+        if sum(active) == 1:
+            break
+
+    winners = [seat for seat in range(seats) if active[seat]]
+    if len(winners) > 1:
+        ranks = default_table().evaluate([holes[seat] + board for seat in winners])
+        winners = [seat for seat, rank in zip(winners, ranks) if rank == ranks.min()]
+    pot = sum(committed)
+    return [pot / len(winners) * (seat in winners) - committed[seat] for seat in range(seats)], times
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+_engine = None
+
+def _warm_worker():
+    """Create and warm one PokerEngine per worker process"""
+    global _engine
+    from OwnEngine import PokerEngine
+    _engine = PokerEngine()
+
+def play_shard(baseline, seats, seed, shard, size):
+    """
+    Play one shard of `size` deals, each once with the engine in every seat
+    and the others on `baseline`, from the shard's own random streams
+    (children of SeedSequence(seed, spawn_key=(shard,)) for the deals and
+    the engine's sampling). The equity cache is fresh per
+    shard, so results do not depend on which worker ran which shards; only
+    equity sampling that hits its time budget can vary between runs.
+
+    Returns:
+        (engine result per deal in big blinds per hand, [(board size,
+        seconds)] of the engine's decisions)
+    """
+    deal_seed, engine_seed = np.random.SeedSequence(seed, spawn_key=(shard,)).spawn(2)
+    rng = np.random.default_rng(deal_seed)
+    _engine.rng = np.random.default_rng(engine_seed)
+    _engine.cache = EquityCache()
+
+    results, times = np.zeros(size), []
+    # The engine prints its reasoning for every decision; keep it off the console
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for deal in range(size):
+            deck = rng.permutation(52)
+            button = (shard * SHARD + deal) % seats
+            for engine_seat in range(seats):
+                policies = [BASELINES[baseline]] * seats
+                policies[engine_seat] = engine_policy
+                chips, hand_times = play_hand(policies, button, deck, rng, [engine_seat])
+                results[deal] += chips[engine_seat] / BIG_BLIND / seats
+                times += hand_times
+    return results, times
+
+def simulate(baseline, deals, seats, seed, pool):
+    """
+    (engine result per deal in big blinds per hand, decision times by board
+    size) of `deals` duplicate deals against `baseline`, in SHARD-sized
+    tasks on `pool` (a ProcessPoolExecutor with the _warm_worker initializer)
+    """
+    sizes = [min(SHARD, deals - start) for start in range(0, deals, SHARD)]
+    futures = [pool.submit(play_shard, baseline, seats, seed, shard, size) for shard, size in enumerate(sizes)]
+    results, times = [], {}
+    for future in futures:
+        shard_results, shard_times = future.result()
+        results.append(shard_results)
+        for board_size, seconds in shard_times:
+            times.setdefault(board_size, []).append(seconds)
+    return np.concatenate(results), times
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def main(argv=None):
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hands', type=int, default=2000, help='hands per baseline (deals x seats)')
+    parser.add_argument('--seats', type=int, default=2, help='players at the table, engine included')
+    parser.add_argument('--baselines', nargs='+', choices=sorted(BASELINES), default=list(BASELINES))
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: one per CPU)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_warm_worker) as pool:
+        rows, all_times = [], {}
+        for baseline in args.baselines:
+            start = time.perf_counter()
+            results, times = simulate(baseline, max(args.hands // args.seats, 1), args.seats, args.seed, pool)
+            elapsed = time.perf_counter() - start
+            hands = len(results) * args.seats
+            decisions = sum(len(seconds) for seconds in times.values())
+            engine_time = sum(sum(seconds) for seconds in times.values())
+            rows.append((baseline, hands, hands / elapsed, decisions / engine_time,
+                         results.mean() * 100, 1.96 * results.std() / np.sqrt(len(results)) * 100,
+                         np.mean(results > 0)))
+            for board_size, seconds in times.items():
+                all_times.setdefault(board_size, []).extend(seconds)
+
+    print("="*78)
+    print(f"Engine vs baselines: {args.seats} seats, {STACK // BIG_BLIND} bb stacks, {workers} workers, seed {args.seed}")
+    print(f"{'baseline':<10} {'hands':>7} {'hands/s':>9} {'decisions/s':>12} {'bb/100':>9} {'+-95%':>8} {'deals won':>10}")
+    print("-"*78)
+    for baseline, hands, hands_per_second, decisions_per_second, win_rate, error, won in rows:
+        print(f"{baseline:<10} {hands:>7} {hands_per_second:>9.1f} {decisions_per_second:>12.1f} "
+              f"{win_rate:>9.1f} {error:>8.1f} {won:>10.1%}")
+    print("-"*78)
+    print("Engine time per decision (decisions/s is per engine-second, per worker)")
+    print(f"{'street':<10} {'decisions':>10} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for board_size in sorted(all_times):
+        seconds = np.array(all_times[board_size]) * 1000
+        print(f"{STREETS[board_size]:<10} {len(seconds):>10} {seconds.mean():>9.2f} "
+              f"{np.percentile(seconds, 50):>9.2f} {np.percentile(seconds, 99):>9.2f}")
+    print("="*78)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
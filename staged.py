@@ -0,0 +1,201 @@
+import threading
+import time
+from collections import deque
+
+from config import SAMPLE_INTERVAL
+
+# ============================================================================
+# LATEST-FRAME RING BUFFER
+# ============================================================================
+
+class FrameRing:
+    """
+    Bounded ring buffer between two pipeline stages.
+
+    The producer never blocks: when the ring is full the oldest item is
+    overwritten. The consumer always takes the newest item and discards
+    everything older, so a slow stage works on fresh data instead of
+    falling behind a queue. Overwritten and skipped items count as dropped.
+    """
+
+    def __init__(self, capacity=2):
+        self._items = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self.latest = None
+        self.produced = 0
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self.latest = item
+            self.produced += 1
+            self._cond.notify_all()
+
+    def take(self, timeout=None):
+        """Newest unread item, or None on timeout or once closed"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self.closed, timeout)
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+# ============================================================================
+# STAGED LOOP
+# ============================================================================
+
+class StagedLoop:
+    """
+    Capture, detection and engine stages running on their own threads.
+
+    capture  -> FrameRing -> detection -> FrameRing(1) -> engine + executor
+
+    Each stage only ever looks at the newest output of the stage before it,
+    so blocking clicks or a slow engine call never stall capture or
+    detection. The display reads `frames.latest` and `last_state` from the
+    caller's thread (OpenCV windows must stay on the main thread). At most
+    one action is taken per `action_interval`, like the serial loop's
+    SAMPLE_INTERVAL, but the first decision of a turn is made as soon as the
+    turn indicator is detected.
+
+    With a `watcher` (turn_watcher.TurnWatcher) the capture stage only
+    probes the turn indicator, and full frames go to detection only when the
+    watcher triggers; between turns a frame is grabbed once per
+    `frame_interval` for the display alone. `latest_frame` is the newest
+    frame either way.
+    """
+
+    def __init__(self, source, pipeline, executor, action_interval=SAMPLE_INTERVAL,
+                 frame_interval=0.0, capacity=2, on_decision=None, watcher=None):
+        self.source = source
+        self.watcher = watcher
+        self.pipeline = pipeline
+        self.executor = executor
+        self.action_interval = action_interval
+        self.frame_interval = frame_interval
+        self.on_decision = on_decision
+
+        self.frames = FrameRing(capacity)
+        self.detections = FrameRing(1)
+        self.latest_frame = None
+        self.last_state = {
+            'card1': None,
+            'card2': None,
+            'community_cards': [],
+            'recommendation': 'Waiting...',
+            'card_boxes': []
+        }
+
+        self.analysed = 0
+        self.decisions = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for target in (self._capture_loop, self._detect_loop, self._engine_loop):
+            thread = threading.Thread(target=self._guard, args=(target,), name=target.__name__, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        self.detections.close()
+        for thread in self._threads:
+            thread.join()
+
+    def running(self):
+        return not self._stop.is_set()
+
+    def _guard(self, target):
+        try:
+            target()
+        except StopIteration:
+            pass  # Replay source ran out of frames
+        except Exception as e:
+            self.error = e
+        finally:
+            self._stop.set()
+            self.frames.close()
+            self.detections.close()
+
+    def _capture_loop(self):
+        if self.watcher is not None:
+            return self._watch_loop()
+        while not self._stop.is_set():
+            img_bgr, img_gray = self.source.grab()
+            self.latest_frame = (time.perf_counter(), img_bgr, img_gray)
+            self.frames.put(self.latest_frame)
+            if self.frame_interval:
+                time.sleep(self.frame_interval)
+
+    def _watch_loop(self):
+        next_display = 0.0
+        while not self._stop.is_set():
+            triggered_at = time.perf_counter()
+            if self.watcher.poll(triggered_at):
+                img_bgr, img_gray = self.source.grab()
+                self.latest_frame = (triggered_at, img_bgr, img_gray)
+                self.frames.put(self.latest_frame)
+            elif self.frame_interval and triggered_at >= next_display:
+                img_bgr, img_gray = self.source.grab()
+                self.latest_frame = (triggered_at, img_bgr, img_gray)
+                next_display = triggered_at + self.frame_interval
+            time.sleep(self.watcher.interval)
+
+    def _detect_loop(self):
+        origin = self.source.origin
+        while not self._stop.is_set():
+            frame = self.frames.take(timeout=0.1)
+            if frame is None:
+                continue
+            captured_at, _, img_gray = frame
+            state = self.pipeline.detect(img_gray, origin, turn_confirmed=self.watcher is not None)
+            self.analysed += 1
+            if state is not None:
+                self.detections.put((captured_at, state))
+
+    def _engine_loop(self):
+        last_action = -float('inf')
+        timer = self.pipeline.timer
+        while not self._stop.is_set():
+            detection = self.detections.take(timeout=0.1)
+            if detection is None:
+                continue
+            if time.perf_counter() - last_action < self.action_interval:
+                continue
+            captured_at, state = detection
+
+            state = self.pipeline.decide(state)
+            timer.record('frame_to_decision', time.perf_counter() - captured_at)
+            self.decisions += 1
+            for key in self.last_state:
+                self.last_state[key] = state[key]
+            if self.on_decision is not None:
+                self.on_decision(state)
+
+            with timer.stage('make_move'):
+                self.executor.make_move(state['recommendation'])
+            last_action = time.perf_counter()
+
+    def stats(self):
+        return {
+            'captured': self.frames.produced,
+            'analysed': self.analysed,
+            'dropped': self.frames.dropped,
+            'decisions': self.decisions,
+            **(self.watcher.stats() if self.watcher is not None else {}),
+        }
@@ -0,0 +1,54 @@
+"""Compiling the asset bundle"""
+import os
+import shutil
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+import assets
+from assets import AssetBundle, ASSET_DIR, source_hash
+
+def test_compile_from_another_directory(tmp_path):
+    """The bundle holds the repository's PNGs and their hash, whatever the working directory"""
+    # A decoy indicator in the working directory must not be picked up
+    cv2.imwrite(str(tmp_path / 'palo.png'), np.zeros((10, 10, 3), dtype=np.uint8))
+    path = str(tmp_path / 'assets.bin')
+    env = dict(os.environ, PYTHONPATH=ASSET_DIR)
+    subprocess.run([sys.executable, '-c', f"import assets; assets.load_assets({path!r})"],
+                   cwd=tmp_path, env=env, check=True)
+
+    bundle = AssetBundle(path)
+    assert bundle.hash == source_hash()
+    palo = cv2.cvtColor(cv2.imread(os.path.join(ASSET_DIR, 'palo.png')), cv2.COLOR_BGR2GRAY)
+    assert np.array_equal(bundle.turn_template, palo)
+    for set_name in ('ranks_left', 'ranks_right', 'suits_left', 'suits_right', 'comm_ranks', 'comm_suits'):
+        assert bundle.templates[set_name], set_name
+
+def test_stale_bundle_replaced_without_a_mapping(tmp_path, monkeypatch):
+    """A changed PNG rebuilds the bundle while nothing maps the old file (Windows refuses to replace it)"""
+    if not os.path.exists('/proc/self/maps'):
+        pytest.skip("needs /proc to see the process's mappings")
+    root = tmp_path / 'root'
+    for folder in assets.TEMPLATE_DIRS:
+        shutil.copytree(os.path.join(ASSET_DIR, folder), root / folder)
+    shutil.copy(os.path.join(ASSET_DIR, assets.TURN_TEMPLATE), root)
+    path = str(tmp_path / 'assets.bin')
+    assets.load_assets(path, str(root))
+
+    palo = cv2.imread(str(root / 'palo.png'))
+    cv2.imwrite(str(root / 'palo.png'), 255 - palo)
+
+    save_bundle = assets.save_bundle
+    def checked_save(*args):
+        with open('/proc/self/maps') as f:
+            assert path not in f.read()
+        save_bundle(*args)
+    monkeypatch.setattr(assets, 'save_bundle', checked_save)
+
+    bundle = assets.load_assets(path, str(root))
+    assert bundle.hash == source_hash(str(root))
+    assert np.array_equal(bundle.turn_template, cv2.cvtColor(cv2.imread(str(root / 'palo.png')), cv2.COLOR_BGR2GRAY))
+    assert sorted(os.listdir(tmp_path)) == ['assets.bin', 'root']  # No temp file left behind
@@ -0,0 +1,26 @@
+"""PokerEngine.analyze on game states the detectors can hand it"""
+import pytest
+
+from OwnEngine import PokerEngine
+from cards import card_from_string
+from equity_cache import EquityCache
+
+def cards(text):
+    return [card_from_string(card) for card in text.split()]
+
+@pytest.fixture(scope='module')
+def engine():
+    return PokerEngine(cache=EquityCache(maxsize=0), seed=0, warm=False)
+
+@pytest.mark.parametrize('opponents, clamped', [(0, 1), (-2, 1), (30, 9)])
+@pytest.mark.parametrize('board', ['', '2c 7d 9s', '2c 7d 9s Kh'])
+def test_opponents_clamped(engine, board, opponents, clamped):
+    state = {'hole_cards': cards('As Kd'), 'community_cards': cards(board)}
+    assert engine.analyze({**state, 'opponents': opponents}) == engine.analyze({**state, 'opponents': clamped})
+
+@pytest.mark.parametrize('board', ['Ac Ad Ah', 'Ac Ad Ah 7c'])
+def test_dead_range_falls_back_to_a_random_hand(board):
+    # Our ace and the board's three leave the opponent no AA
+    state = {'hole_cards': cards('As Kd'), 'community_cards': cards(board)}
+    ranged = PokerEngine(cache=EquityCache(maxsize=0), seed=0, warm=False).analyze({**state, 'range': 'AA'})
+    assert ranged == PokerEngine(cache=EquityCache(maxsize=0), seed=0, warm=False).analyze(state)
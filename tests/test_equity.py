@@ -0,0 +1,54 @@
+"""Equity calculations against brute force on small spots"""
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from cards import card_from_string
+from equity import exact_equity, monte_carlo_equity, remaining_deck
+from hand_eval import evaluate
+from ranges import COMBO_INDEX, parse_range
+
+def cards(text):
+    return [card_from_string(card) for card in text.split()]
+
+def brute_force(hole, board, weights=None):
+    """Pot share over every runout and opponent holding, one hand at a time"""
+    deck = remaining_deck(hole + board).tolist()
+    total = weight_sum = 0.0
+    for runout in combinations(deck, 5 - len(board)):
+        full = board + list(runout)
+        ours = int(evaluate([hole + full])[0])
+        for holding in combinations([c for c in deck if c not in runout], 2):
+            weight = 1.0 if weights is None else weights[COMBO_INDEX[holding]]
+            if weight:
+                theirs = int(evaluate([list(holding) + full])[0])
+                total += weight * ((ours < theirs) + 0.5 * (ours == theirs))
+                weight_sum += weight
+    return total / weight_sum
+
+SPOTS = [
+    ('Ah Kh', 'Qh Jh 2c 7d 9s'),   # River, nut flush draw missed
+    ('7c 7d', '7h 2s Kd Kc 3h'),   # River full house
+    ('Qs Js', 'Ts 9d 2c 2h'),      # Turn, open-ended
+]
+
+@pytest.mark.parametrize('hole, board', SPOTS)
+def test_exact_equity_matches_brute_force(hole, board):
+    hole, board = cards(hole), cards(board)
+    assert exact_equity(hole, board) == pytest.approx(brute_force(hole, board), abs=1e-12)
+
+@pytest.mark.parametrize('hole, board', SPOTS)
+def test_exact_equity_against_a_range(hole, board):
+    hole, board = cards(hole), cards(board)
+    weights = parse_range('TT+,AQs+,KQo:0.5')
+    assert exact_equity(hole, board, weights) == pytest.approx(brute_force(hole, board, weights), abs=1e-12)
+
+def test_monte_carlo_converges_to_exact():
+    hole, board = cards('Qs Js'), cards('Ts 9d 2c 2h')
+    sampled = monte_carlo_equity(hole, board, 100000, np.random.default_rng(0))
+    assert sampled == pytest.approx(exact_equity(hole, board), abs=0.01)
+
+def test_empty_range_raises():
+    with pytest.raises(ValueError):
+        exact_equity(cards('Ks Kd'), cards('Ac Ad Ah 7c 2d'), parse_range('AA'))
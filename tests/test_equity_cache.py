@@ -0,0 +1,61 @@
+"""What the equity cache keeps and how it keys spots"""
+from itertools import permutations
+
+import numpy as np
+
+from cards import card_from_string
+from equity import auto_equity
+from equity_cache import EquityCache, canonical_key
+
+HOLE, FLOP = [48, 49], [0, 17, 34]  # AcAd on 2c6d Th
+
+def counting(result):
+    calls = []
+    def compute():
+        calls.append(1)
+        return result
+    return compute, calls
+
+def test_truncated_results_not_kept():
+    cache = EquityCache()
+    compute, calls = counting((0.5, 0.1, 'truncated'))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.4, 0.6))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.4, 0.6))
+    assert len(calls) == 2
+
+    compute, calls = counting((0.8, 0.01, 'sampled'))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.4, 0.6))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.4, 0.6))
+    assert len(calls) == 1
+
+def test_thresholds_are_part_of_the_key():
+    cache = EquityCache()
+    compute, calls = counting((0.8, 0.01, 'sampled'))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.4, 0.6))
+    cache.lookup(HOLE, FLOP, 1, compute, thresholds=(0.79, 0.81))
+    assert len(calls) == 2
+
+def test_auto_equity_marks_deadline_cut_estimates():
+    rng = np.random.default_rng(0)
+    dense = tuple(np.linspace(0.01, 0.99, 99))  # One batch can never clear these
+    assert auto_equity(HOLE, FLOP, 1e-6, 2, dense, rng=rng)[2] == 'truncated'
+    assert auto_equity(HOLE, FLOP, 0.05, 2, (0.05,), rng=rng)[2] == 'sampled'
+
+def relabel(cards, suits):
+    return [card & ~3 | suits[card & 3] for card in cards]
+
+def test_canonical_key_ignores_suit_labels_and_order():
+    rng = np.random.default_rng(0)
+    for board_size in (0, 3, 4, 5):
+        dealt = rng.permutation(52)[:2 + board_size].tolist()
+        hole, board = dealt[:2], dealt[2:]
+        key = canonical_key(hole, board, 2)
+        for suits in permutations(range(4)):
+            assert canonical_key(relabel(hole[::-1], suits), relabel(board[::-1], suits), 2) == key
+
+def test_canonical_key_keeps_what_changes_equity():
+    ah, kh, kd = (card_from_string(card) for card in ('Ah', 'Kh', 'Kd'))
+    board = [card_from_string(card) for card in ('2h', '7c', '9s')]
+    assert canonical_key([ah, kh], board) != canonical_key([ah, kd], board)       # Suited vs offsuit
+    assert canonical_key([ah, kh], board) != canonical_key([ah, kh], board, 2)    # Opponents
+    assert canonical_key([ah, kh], []) != canonical_key([ah, kh], board)          # Street
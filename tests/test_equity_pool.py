@@ -0,0 +1,25 @@
+"""EquityPool workers map the parent's rank table"""
+import multiprocessing
+import os
+
+import pytest
+
+import hand_table
+from equity_pool import EquityPool, shard_total
+
+def test_spawned_workers_use_the_parents_table(tmp_path):
+    path = str(tmp_path / 'hand_ranks.npy')
+    pool = EquityPool(2, shard=1000, table_path=path, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        assert os.listdir(tmp_path) == ['hand_ranks.npy']  # Built once, before the workers started
+        equity = pool.equity([48, 49], [0, 17, 34], 4000, seed=3)
+    finally:
+        pool.close()
+    expected = sum(shard_total([48, 49], [0, 17, 34], 1, 3, shard, 1000) for shard in range(4)) / 4000
+    assert equity == pytest.approx(expected)
+
+def test_workers_never_build_the_table(tmp_path):
+    path = str(tmp_path / 'hand_ranks.npy')
+    with pytest.raises(ValueError):
+        hand_table.map_default_table(path)
+    assert not os.listdir(tmp_path)
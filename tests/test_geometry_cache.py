@@ -0,0 +1,43 @@
+"""Per-geometry template caches stay bounded as community ROI sizes drift"""
+import numpy as np
+import pytest
+
+from card_detection import TemplateBank, VARIANT_CACHE_SIZE
+from fft_classifier import FFTClassifier, BATCH_CACHE_SIZE
+
+@pytest.fixture(scope='module')
+def bank():
+    return TemplateBank.load()
+
+def drifting_rois(count, seed=0):
+    """Grey frame and `count` straight ROIs of distinct sizes, like contour-derived community cards"""
+    rng = np.random.default_rng(seed)
+    img = rng.integers(0, 256, (200, 200), dtype=np.uint8)
+    sizes = {(int(w), int(h)) for w, h in zip(rng.integers(30, 90, 4 * count), rng.integers(30, 90, 4 * count))}
+    return img, [(np.array([5, 5]), np.array([5 + w, 5 + h])) for w, h in sorted(sizes)[:count]]
+
+def test_template_bank_bounded(bank):
+    img, rois = drifting_rois(3 * VARIANT_CACHE_SIZE)
+    first = bank.classify_straight(img, *rois[0], 'comm_ranks')
+    for start, end in rois:
+        bank.classify_straight(img, start, end, 'comm_ranks')
+        assert len(bank._variants) <= VARIANT_CACHE_SIZE
+    # An evicted geometry is rebuilt to the same result
+    assert bank.classify_straight(img, *rois[0], 'comm_ranks') == first
+
+def test_fft_classifier_bounded(bank):
+    classifier = FFTClassifier(bank)
+    img, rois = drifting_rois(3 * BATCH_CACHE_SIZE)
+    first = classifier.classify_straight(img, *rois[0], 'comm_ranks')
+    for start, end in rois:
+        classifier.classify_straight(img, start, end, 'comm_ranks')
+        assert len(classifier._batches) <= BATCH_CACHE_SIZE
+    assert classifier.classify_straight(img, *rois[0], 'comm_ranks') == first
+
+def test_fft_classifier_matches_bank_after_eviction(bank):
+    classifier = FFTClassifier(bank, cache_size=4)
+    img, rois = drifting_rois(12, seed=1)
+    for start, end in rois + rois:
+        name, score = classifier.classify_straight(img, start, end, 'comm_suits')
+        expected_name, expected_score = bank.classify_straight(img, start, end, 'comm_suits')
+        assert name == expected_name and score == pytest.approx(expected_score, abs=1e-6)
@@ -0,0 +1,56 @@
+"""Both evaluators against fixed hands and, where installed, treys"""
+import numpy as np
+import pytest
+
+from cards import card_from_string, card_to_string
+from hand_eval import evaluate, rank_class, ROYAL_FLUSH, STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH, \
+    STRAIGHT, THREE_OF_A_KIND, TWO_PAIR, PAIR, HIGH_CARD
+from hand_table import default_table
+
+def hand(text):
+    return [card_from_string(card) for card in text.split()]
+
+# (cards, treys-scale rank or None, category), 5, 6 and 7 cards
+HANDS = [
+    ('As Ks Qs Js Ts', 1, ROYAL_FLUSH),
+    ('7d 5c 4h 3s 2d', 7462, HIGH_CARD),
+    ('5h 4h 3h 2h Ah', 10, STRAIGHT_FLUSH),   # Steel wheel, the lowest straight flush
+    ('Ac Ad Ah As Kd', 11, FOUR_OF_A_KIND),
+    ('5c 4d 3h 2s Ad', 1609, STRAIGHT),       # Wheel, the lowest straight
+    ('Ac Kd Qh Js Td', 1600, STRAIGHT),
+    ('2c 2d 2h 3s 3d', 322, FULL_HOUSE),
+    ('Kh Kd 9c 9s 2h 3d', None, TWO_PAIR),
+    ('Kh Kd 9c 9s 4h 4d', None, TWO_PAIR),    # Third pair only as kicker
+    ('Ah 9h 7h 4h 2h Ad', None, FLUSH),
+    ('Qc Qd Qh 8s 5d 3c 2h', None, THREE_OF_A_KIND),
+    ('Qc Qd Qh 8s 8d 3c 3h', None, FULL_HOUSE),   # Best of two pairs under the trips
+    ('Jc Jd 9h 8s 6d 4c 2h', None, PAIR),
+    ('Ks Ts 9s 8s 7s 6s 2d', None, STRAIGHT_FLUSH),
+    ('Ah Kd 9c 8s 7d 6c 2h', None, HIGH_CARD),
+]
+
+@pytest.mark.parametrize('cards, rank, category', HANDS)
+def test_fixed_hands(cards, rank, category):
+    ours = int(evaluate([hand(cards)])[0])
+    assert int(default_table().evaluate([hand(cards)])[0]) == ours
+    assert rank_class(ours) == category
+    if rank is not None:
+        assert ours == rank
+
+@pytest.mark.parametrize('cards, rank, category', HANDS)
+def test_matches_treys(cards, rank, category):
+    treys = pytest.importorskip('treys')
+    board, hole = cards.split()[:-2], cards.split()[-2:]
+    reference = treys.Evaluator().evaluate([treys.Card.new(c) for c in board], [treys.Card.new(c) for c in hole])
+    assert int(evaluate([hand(cards)])[0]) == reference
+
+def test_random_seven_card_hands_match_treys():
+    treys = pytest.importorskip('treys')
+
+    rng = np.random.default_rng(0)
+    hands = np.array([rng.permutation(52)[:7] for _ in range(2000)])
+    evaluator = treys.Evaluator()
+    reference = [evaluator.evaluate([treys.Card.new(card_to_string(c)) for c in row[:5]],
+                                    [treys.Card.new(card_to_string(c)) for c in row[5:]]) for row in hands]
+    assert evaluate(hands).tolist() == reference
+    assert default_table().evaluate(hands).tolist() == reference
@@ -0,0 +1,36 @@
+"""Generating and reopening the memory-mapped rank table"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from hand_table import load_table, build_table, TABLE_SIZE
+
+def test_truncated_table_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'hand_ranks.npy')
+    np.save(path, build_table())
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+    with open(path, 'wb') as f:
+        f.write(head)
+
+    table = load_table(path)
+    assert table.shape == (TABLE_SIZE,)
+    assert np.array_equal(table, build_table())
+
+def test_wrong_dtype_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'hand_ranks.npy')
+    np.save(path, np.zeros(TABLE_SIZE, dtype=np.int32))
+    assert load_table(path).dtype == np.int16
+
+def _load_shape(path):
+    return load_table(path).shape
+
+def test_concurrent_first_builds(tmp_path):
+    """Spawned workers building the same missing table all get a complete one"""
+    path = str(tmp_path / 'hand_ranks.npy')
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context('spawn')) as pool:
+        shapes = list(pool.map(_load_shape, [path] * 8))
+    assert shapes == [(TABLE_SIZE,)] * 8
+    assert os.listdir(tmp_path) == ['hand_ranks.npy']
@@ -0,0 +1,66 @@
+"""When the TableScheduler lets detection skip the turn match"""
+import time
+
+import numpy as np
+
+from actions import NullExecutor
+from multitable import Table, TableScheduler
+from timing import StageTimer
+
+class Source:
+    """Blank frames, each grab taking `delay` seconds"""
+    origin = np.array([0, 0])
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def grab(self):
+        time.sleep(self.delay)
+        return np.zeros((4, 4, 3), np.uint8), np.zeros((4, 4), np.uint8)
+
+    def close(self):
+        pass
+
+class Watcher:
+    """Confirms one turn, then never again"""
+
+    def __init__(self):
+        self.fired = False
+
+    def poll(self, now):
+        fired, self.fired = self.fired, True
+        return not fired
+
+    def close(self):
+        pass
+
+class Pipeline:
+    """Records turn_confirmed of every detection"""
+
+    def __init__(self):
+        self.timer = StageTimer(enabled=False)
+        self.confirmed = []
+
+    def detect(self, img_gray, origin, turn_confirmed=False):
+        self.confirmed.append(turn_confirmed)
+        return {'card1': None, 'card2': None, 'community_cards': [], 'recommendation': ('CHECK', 0.0),
+                'card_boxes': []}
+
+    def decide(self, state):
+        return state
+
+def detections(delay):
+    pipeline = Pipeline()
+    table = Table('table1', Source(delay), NullExecutor(), Watcher())
+    scheduler = TableScheduler([table], pipeline, interval=0.02).start()
+    time.sleep(0.3)
+    scheduler.stop()
+    assert scheduler.error is None
+    return pipeline.confirmed
+
+def test_fresh_watcher_match_skips_the_turn_match():
+    assert detections(0.0) == [True]
+
+def test_stale_watcher_match_is_matched_again():
+    # The frame arrives long after the watcher's match, e.g. behind other tables
+    assert detections(0.1) == [False]
@@ -0,0 +1,64 @@
+"""Preflop decisions: heads-up rules, and tiers against the committed preflop_equity.npy"""
+from itertools import combinations
+
+import pytest
+
+from OwnEngine import PokerEngine, PREFLOP_TIERS
+from cards import card_to_string
+from equity_cache import EquityCache
+from preflop_table import default_preflop_table, class_cards, class_name
+
+# Heads-up strength every class must keep from every cut-off, so that
+# regenerating the table (sampling noise ~0.003 at PREFLOP_SIMULATIONS)
+# does not move hands between tiers
+MARGIN = 0.005
+
+def heads_up_strengths():
+    table = default_preflop_table()
+    return {class_name(index): table.equity(*class_cards(index), 1) * 2 for index in range(169)}
+
+def test_cut_offs_clear_of_every_class():
+    for name, strength in heads_up_strengths().items():
+        for threshold, _, _ in PREFLOP_TIERS:
+            assert abs(strength - threshold) >= MARGIN, f"{name} {strength:.4f} is within {MARGIN} of {threshold}"
+
+@pytest.mark.parametrize('index, opponents', [
+    (168, 0),    # AA: strength equity x 1 would call
+    (168, -3),
+    (12, 25),    # A2o: equity vs 9 x 26 players would raise 75%
+])
+def test_opponents_clamped_to_table(index, opponents):
+    engine = PokerEngine(cache=EquityCache(maxsize=0), warm=False)
+    hole = class_cards(index)
+    clamped = min(max(opponents, 1), 9)
+    assert engine.preflop_strategy(hole, opponents) == engine.preflop_strategy(hole, clamped)
+
+def original_preflop_strategy(hole_cards):
+    """The hand-written rules preflop_strategy replaced, on 'As'-style strings"""
+    rank_values = {rank: value for value, rank in enumerate('23456789TJQKA', 2)}
+    val1, val2 = rank_values[hole_cards[0][0]], rank_values[hole_cards[1][0]]
+    is_pair = val1 == val2
+    is_suited = hole_cards[0][1] == hole_cards[1][1]
+    high_card, low_card = max(val1, val2), min(val1, val2)
+
+    if is_pair and high_card >= 13:
+        return ("RAISE", 0.75)
+    if is_pair and high_card >= 10:
+        return ("RAISE", 0.5)
+    if high_card == 14 and low_card >= 13:
+        return ("RAISE", 0.5)
+    if high_card >= 13 and low_card >= 12:
+        return ("RAISE", 0.3)
+    if is_pair and high_card >= 7:
+        return ("RAISE", 0.25)
+    if high_card == 14 and low_card >= 10:
+        return ("RAISE", 0.2)
+    if is_suited and high_card >= 12 and low_card >= 10:
+        return ("RAISE", 0.15)
+    return ("CALL", 0)
+
+def test_heads_up_decisions_unchanged():
+    engine = PokerEngine(cache=EquityCache(maxsize=0), warm=False)
+    for card1, card2 in combinations(range(52), 2):
+        hole = [card_to_string(card1), card_to_string(card2)]
+        assert engine.preflop_strategy([card1, card2]) == original_preflop_strategy(hole), hole
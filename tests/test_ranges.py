@@ -0,0 +1,55 @@
+"""Range notation parsing"""
+import pytest
+
+from cards import card_from_string, card_to_string
+from ranges import COMBOS, parse_range, live_weights
+
+def names(weights):
+    """Set of hands ('AhKh' style, higher card first) with weight"""
+    return {''.join(card_to_string(card) for card in sorted(COMBOS[i], reverse=True))
+            for i in weights.nonzero()[0]}
+
+@pytest.mark.parametrize('notation, count', [
+    ('QQ', 6),
+    ('AKs', 4),
+    ('AKo', 12),
+    ('AK', 16),
+    ('22+', 13 * 6),
+    ('TT+', 5 * 6),
+    ('A2s+', 12 * 4),     # A2s..AKs
+    ('KTo+', 3 * 12),     # KTo, KJo, KQo
+    ('KT+', 3 * 16),
+    ('55-88', 4 * 6),
+    ('A2s-A5s', 4 * 4),
+    ('QQ+,AKs,AKo', 18 + 4 + 12),
+    ('', 0),
+])
+def test_combo_counts(notation, count):
+    assert parse_range(notation).sum() == count
+
+def test_suited_and_offsuit_combos():
+    suited = names(parse_range('AKs'))
+    assert suited == {'AcKc', 'AdKd', 'AhKh', 'AsKs'}
+    offsuit = names(parse_range('AKo'))
+    assert len(offsuit) == 12 and not offsuit & suited
+    assert all(hand[1] != hand[3] for hand in offsuit)
+    assert names(parse_range('QQ')) == {'QdQc', 'QhQc', 'QsQc', 'QhQd', 'QsQd', 'QsQh'}
+
+def test_plus_ranges_stop_below_the_top_card():
+    assert names(parse_range('KTo+')) == names(parse_range('KTo,KJo,KQo'))
+    assert names(parse_range('A2s+')) == names(parse_range('A2s-AKs'))
+    assert names(parse_range('JJ+')) == names(parse_range('JJ,QQ,KK,AA'))
+
+def test_partial_weights():
+    weights = parse_range('AA,KK:0.25')
+    assert weights.sum() == pytest.approx(6 + 6 * 0.25)
+    assert sorted(set(weights[weights > 0])) == [0.25, 1.0]
+
+@pytest.mark.parametrize('notation', ['AKx', 'A1s', 'AAs', 'QQ-AKs', 'A2s-K5s', 'A2s-A5o'])
+def test_bad_notation_raises(notation):
+    with pytest.raises(ValueError):
+        parse_range(notation)
+
+def test_live_weights_drop_blocked_combos():
+    weights = live_weights(parse_range('AA,AKs'), [card_from_string('As'), card_from_string('Kh')])
+    assert names(weights) == {'AdAc', 'AhAc', 'AhAd', 'AcKc', 'AdKd'}
@@ -0,0 +1,57 @@
+"""Which probe triggers the TurnWatcher passes on"""
+import numpy as np
+
+from turn_watcher import TurnWatcher
+
+class FrameSource:
+    """Probe source replaying grey levels; every frame is one flat region"""
+    origin = np.array([0, 0])
+
+    def __init__(self):
+        self.level = 0
+
+    def read(self):
+        return np.full((4, 4, 3), self.level, dtype=np.uint8)
+
+    def close(self):
+        pass
+
+class Probe:
+    """Fires on every frame, like the sparse probe on a lookalike of the indicator"""
+    threshold = 0.3
+
+    def pixels(self, img, origin):
+        return img[..., 0].ravel().astype(np.float32)
+
+    def correlate(self, pixels):
+        return 1.0
+
+class Watcher(TurnWatcher):
+    """Template match answered from `turn`"""
+
+    def __init__(self, source):
+        super().__init__(source, None, rearm=2.0, probe=Probe())
+        self.turn = True
+
+    def confirm(self, img):
+        self.confirms += 1
+        return self.turn
+
+def test_rearm_triggers_are_confirmed():
+    source = FrameSource()
+    watcher = Watcher(source)
+    assert watcher.poll(0.0)
+    assert not watcher.poll(1.0)       # Within rearm: no trigger, no match
+    assert watcher.confirms == 1
+
+    watcher.turn = False               # Our move went through, the probe still fires
+    source.level = 50
+    assert not watcher.poll(2.5)
+    assert watcher.confirms == 2
+    assert not watcher.poll(5.0)       # Same rejected frame: not matched again
+    assert watcher.confirms == 2
+
+    watcher.turn = True                # Our next turn
+    source.level = 200
+    assert watcher.poll(5.1)
+    assert watcher.triggers == 2
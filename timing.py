@@ -0,0 +1,97 @@
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Returned by disabled timers, so an instrumented stage costs one call
+NULL_STAGE = contextlib.nullcontext()
+
+class _Stage:
+    """Context manager that records the elapsed time of one stage"""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class StageTimer:
+    """
+    Lightweight per-stage latency instrumentation.
+
+    Each stage keeps a rolling window of its latest `window` samples, from
+    which p50/p95/p99 are computed. When `path` is set, maybe_flush() appends
+    one JSONL record with every stage's summary at most once per
+    `flush_interval` seconds. A disabled timer hands out a shared no-op
+    context manager, so instrumentation can stay in the hot path.
+    """
+
+    def __init__(self, enabled=True, window=512, path=None, flush_interval=10.0):
+        self.enabled = enabled
+        self.window = window
+        self.path = path
+        self.flush_interval = flush_interval
+        self.samples = {}
+        self.counts = {}
+        self.last_flush = time.time()
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager timing one run of a stage"""
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+                self.counts[name] = 0
+            self.samples[name].append(seconds)
+            self.counts[name] += 1
+
+    def summary(self):
+        """{stage: {count, mean, p50, p95, p99}} over the rolling window, in milliseconds"""
+        with self._lock:
+            windows = {name: list(samples) for name, samples in self.samples.items()}
+            counts = dict(self.counts)
+
+        result = {}
+        for name, samples in windows.items():
+            ms = np.array(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            result[name] = {
+                'count': counts[name],
+                'mean': float(ms.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+            }
+        return result
+
+    def maybe_flush(self, now=None):
+        """Append a summary record to the JSONL file if the flush interval has passed"""
+        if not self.enabled or self.path is None:
+            return
+        now = time.time() if now is None else now
+        if now - self.last_flush < self.flush_interval:
+            return
+        self.last_flush = now
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'time': now, 'stages': self.summary()}) + '\n')
+
+    def lines(self):
+        """One 'stage p50/p95/p99' line per stage, for printing or the overlay"""
+        return [f"{name}: {s['p50']:.1f}/{s['p95']:.1f}/{s['p99']:.1f} ms"
+                for name, s in self.summary().items()]
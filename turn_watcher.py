@@ -0,0 +1,141 @@
+import time
+
+import cv2
+import numpy as np
+
+from config import (
+    SAMPLE_INTERVAL,
+    PALO_POS_START, PALO_POS_END,
+    TURN_THRESHOLD, PROBE_INTERVAL, PROBE_STEP, PROBE_THRESHOLD,
+)
+from pipeline import match_turn_indicator
+
+# The probe source only needs the indicator region
+TURN_REGIONS = [(PALO_POS_START, PALO_POS_END)]
+
+# Grey levels sampled pixels may drift by and still count as the same rejected frame
+REJECT_TOLERANCE = 8
+
+# ============================================================================
+# TURN PROBE
+# ============================================================================
+
+class TurnProbe:
+    """
+    Cheap turn indicator check on a sparse pixel grid.
+
+    Samples every `step` (rows, cols) pixel of the indicator region and
+    correlates them with the same grid of palo.png stretched over the region.
+    A few hundred pixels instead of a full template match: a pre-filter that
+    is allowed false positives, never the final word on whose turn it is.
+    Kept to a handful of array operations, since at probe rates the per-call
+    overhead outweighs the arithmetic.
+    """
+
+    def __init__(self, palo_gray, step=PROBE_STEP, threshold=PROBE_THRESHOLD):
+        self.step = step
+        self.threshold = threshold
+        w, h = PALO_POS_END - PALO_POS_START
+        reference = self.sample(cv2.resize(palo_gray, (int(w), int(h)), interpolation=cv2.INTER_AREA))
+        reference = reference.ravel().astype(np.float32)
+        reference -= reference.mean()
+        self.reference = reference / np.linalg.norm(reference)
+
+    def sample(self, roi):
+        sy, sx = self.step
+        return roi[sy // 2::sy, sx // 2::sx]
+
+    def pixels(self, img, origin):
+        """Sampled grey levels of the indicator region of a capture-local BGRA/BGR or gray frame"""
+        x1, y1 = PALO_POS_START - origin
+        x2, y2 = PALO_POS_END - origin
+        pixels = self.sample(img[y1:y2, x1:x2])
+        if pixels.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if pixels.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            pixels = cv2.cvtColor(np.ascontiguousarray(pixels), code)
+        return pixels.ravel().astype(np.float32)
+
+    def correlate(self, pixels):
+        """Normalized correlation of sampled pixels with the indicator, in [-1, 1]"""
+        total = pixels.sum()
+        energy = float(pixels @ pixels) - total * total / pixels.size
+        return float(pixels @ self.reference) / np.sqrt(energy) if energy > 0 else 0.0
+
+    def score(self, img, origin):
+        return self.correlate(self.pixels(img, origin))
+
+# ============================================================================
+# TURN WATCHER
+# ============================================================================
+
+class TurnWatcher:
+    """
+    Event-driven replacement for polling the full turn match.
+
+    poll() reads the (small) probe source and runs the TurnProbe on it. Only
+    when the probe fires is the template match run to confirm: on the first
+    frame and again every `rearm` seconds while it stays up, since after
+    our move the probe alone may keep firing on a frame that is no longer
+    our turn. poll() returns True exactly on the confirmed frames, so the
+    caller captures and detects cards then and may skip its own turn match.
+    """
+
+    def __init__(self, source, palo_gray, interval=PROBE_INTERVAL, rearm=SAMPLE_INTERVAL,
+                 probe=None, threshold=TURN_THRESHOLD):
+        self.source = source
+        self.palo_gray = palo_gray
+        self.interval = interval
+        self.rearm = rearm
+        self.probe = probe if probe is not None else TurnProbe(palo_gray)
+        self.threshold = threshold
+
+        self.active = False
+        self.last_trigger = -float('inf')
+        self._rejected = None  # Probe pixels the template match last turned down
+        self.probes = 0
+        self.confirms = 0
+        self.triggers = 0
+
+    def confirm(self, img):
+        """Full template match of the indicator on a raw probe frame"""
+        self.confirms += 1
+        img_gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY) if img.shape[2] == 4 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return match_turn_indicator(img_gray, self.palo_gray, self.source.origin) >= self.threshold
+
+    def poll(self, now=None):
+        """Probe once; True when card detection should run now"""
+        now = time.perf_counter() if now is None else now
+        img = self.source.read()
+        self.probes += 1
+
+        pixels = self.probe.pixels(img, self.source.origin)
+        if self.probe.correlate(pixels) < self.probe.threshold:
+            self.active = False
+            self._rejected = None
+            return False
+
+        if self.active and now - self.last_trigger < self.rearm:
+            return False
+        # Don't re-run the match on every probe of the same false positive
+        if self._rejected is not None and np.abs(pixels - self._rejected).max() <= REJECT_TOLERANCE:
+            return False
+        if not self.confirm(img):
+            self.active = False
+            self._rejected = pixels
+            return False
+        self.active = True
+        self._rejected = None
+
+        self.last_trigger = now
+        self.triggers += 1
+        return True
+
+    def stats(self):
+        return {
+            'probes': self.probes,
+            'confirms': self.confirms,
+            'triggers': self.triggers,
+        }
+
+    def close(self):
+        self.source.close()